@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of the date parsers in code_df.utils.
+
+The dates of every commit in git-commits.json (AuthorDate and
+CommitDate, as parsed by CommitGit._flatten) are converted with:
+
+* the former str_to_date, three strptime calls per value
+* commit_str_to_date, with an empty and with a warm cache
+
+Run it from the root of the repository:
+    $ python3 -m implementations.benchmarks.bench_dates
+"""
+
+import datetime
+import os
+import timeit
+
+from implementations.code_df.utils import (commit_str_to_date,
+                                           read_json_file)
+
+COMMITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', 'git-commits.json')
+REPEAT = 5
+
+
+def legacy_str_to_date(date):
+    """
+    The strptime round-trip str_to_date used to perform.
+
+    :param date: a date, of type string
+    :returns datetimeobj: the datetime object obtained from date string
+    """
+
+    try:
+        datetimestr = datetime.datetime.strptime(
+            date, "%a %b %d %H:%M:%S %Y %z").strftime("%Y-%m-%d")
+    except ValueError:
+        datetimestr = datetime.datetime.strptime(
+            date, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
+
+    return datetime.datetime.strptime(datetimestr, "%Y-%m-%d")
+
+
+def best_of(func):
+    """
+    Return the best wall time, in seconds, of REPEAT calls to func.
+    """
+
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    items = read_json_file(COMMITS_FILE)
+    dates = [date for item in items
+             for date in (item['data']['AuthorDate'], item['data']['CommitDate'])]
+
+    def cold():
+        commit_str_to_date.cache_clear()
+        return [commit_str_to_date(date) for date in dates]
+
+    def warm():
+        return [commit_str_to_date(date) for date in dates]
+
+    assert [legacy_str_to_date(date) for date in dates] == cold()
+
+    timings = [
+        ('strptime round-trip', best_of(lambda: [legacy_str_to_date(date) for date in dates])),
+        ('commit_str_to_date, cold cache', best_of(cold)),
+        ('commit_str_to_date, warm cache', best_of(warm)),
+    ]
+
+    print("Parsing {} dates from {}".format(len(dates), os.path.normpath(COMMITS_FILE)))
+    baseline = timings[0][1]
+    for name, seconds in timings:
+        print("{:<32} {:>9.2f} ms {:>8.1f}x".format(name, seconds * 1000, baseline / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of every metric, in both the code_df and scripts flavors.
+
+Metrics are computed on synthetic Perceval items written by
+generate_data, with a fixed seed, so that every run reads the same
+files. Every case builds a metric from the items of a file, as read
+from disk, and computes its value (and its monthly time series, for
+code_df metrics). Cases include the MasterInclude condition, and
+issues counted with reopen_as_new.
+
+For every case, the best wall time of a few runs is reported, and the
+peak memory traced by tracemalloc during another run. Caches of
+parsed dates are emptied before every run.
+
+Results are compared with the baselines stored in baselines.json,
+for the same number of items: cases which are slower, or need more
+memory, than their baseline by more than the tolerance are reported
+as regressions, and the exit status is then 1. Timings depend on the
+machine, which is recorded with the baselines: save baselines again
+(--save) before comparing runs on another machine.
+
+Run it from the root of the repository:
+    $ python3 -m implementations.benchmarks.bench_metrics --items 10000
+    $ python3 -m implementations.benchmarks.bench_metrics --items 100000 --filter scripts.
+    $ python3 -m implementations.benchmarks.bench_metrics --items 10000 --save
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from implementations.benchmarks.generate_data import write_items
+from implementations.code_df import utils as df_utils
+from implementations.code_df.code_changes_git import CodeChangesGit
+from implementations.code_df.code_changes_lines_git import CodeChangesLinesGit
+from implementations.code_df.conditions import DirExclude, MasterInclude, PostfixExclude
+from implementations.code_df.issue_backlog_github import IssueBacklogGitHub
+from implementations.code_df.issues_closed_github import IssuesClosedGitHub
+from implementations.code_df.issues_new_github import IssuesNewGitHub
+from implementations.code_df.new_contributors_of_commits_git import NewContributorsOfCommitsGit
+from implementations.code_df.open_issue_age_github import OpenIssueAgeGitHub
+from implementations.code_df.reviews_accepted_github import ReviewsAcceptedGitHub
+from implementations.code_df.reviews_declined_github import ReviewsDeclinedGitHub
+from implementations.code_df.reviews_duration_github import ReviewsDurationGitHub
+from implementations.code_df.reviews_github import ReviewsGitHub
+from implementations.scripts import utils as scripts_utils
+from implementations.scripts.code_changes_git import CodeChangesGit as ScriptsCodeChangesGit
+from implementations.scripts.code_changes_lines_git import CodeChangesLinesGit as ScriptsCodeChangesLinesGit
+from implementations.scripts.conditions import MasterInclude as ScriptsMasterInclude
+from implementations.scripts.reviews_accepted_github import ReviewsAcceptedGitHub as ScriptsReviewsAcceptedGitHub
+from implementations.scripts.reviews_declined_github import ReviewsDeclinedGitHub as ScriptsReviewsDeclinedGitHub
+from implementations.scripts.reviews_github import ReviewsGitHub as ScriptsReviewsGitHub
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DATA_DIR = os.path.join(tempfile.gettempdir(), 'wg-evolution-benchmarks')
+REPEAT = 3
+TOLERANCE = 0.25
+# Date of the computation of the age of open issues, after all of them
+AS_OF = datetime.datetime(2021, 1, 1)
+
+
+def df_case(metric_class, **kwargs):
+    """
+    Return a function computing a code_df metric from a file of items.
+
+    :param metric_class: a descendant of code_df.metric.Metric
+    :param kwargs: the arguments of the metric, besides items
+
+    :returns: a function of the path of the file
+    """
+
+    def run(path):
+        metric = metric_class(df_utils.iter_items(path), **kwargs)
+        metric.compute()
+        metric.time_series('M')
+
+    return run
+
+
+def accumulate_case(metric_class, **kwargs):
+    """
+    Return a function accumulating a code_df metric from a file of items,
+    without a DataFrame.
+
+    :param metric_class: a descendant of code_df.metric.Metric
+    :param kwargs: the arguments of the metric, besides items
+
+    :returns: a function of the path of the file
+    """
+
+    def run(path):
+        metric_class([], **kwargs).accumulate(df_utils.iter_items(path), 'M')
+
+    return run
+
+
+def scripts_case(metric_class, **kwargs):
+    """
+    Return a function computing a scripts metric from a file of items.
+
+    :param metric_class: a descendant of scripts.metric.Metric
+    :param kwargs: the arguments of the metric, besides items
+
+    :returns: a function of the path of the file
+    """
+
+    def run(path):
+        metric_class(scripts_utils.iter_items(path), **kwargs).compute()
+
+    return run
+
+
+def cases():
+    """
+    Return the benchmark cases.
+
+    Conditions are created again for every case, as they keep the
+    commits they select.
+
+    :returns: a list of tuples with the name of the case, the category
+        of the items it reads, and the function running it
+    """
+
+    is_code = [DirExclude(), PostfixExclude()]
+
+    return [
+        ('code_df.CodeChangesGit', 'commit', df_case(CodeChangesGit, is_code=is_code)),
+        ('code_df.CodeChangesGit[MasterInclude]', 'commit', df_case(CodeChangesGit, conds=[MasterInclude()])),
+        ('code_df.CodeChangesGit[accumulate]', 'commit', accumulate_case(CodeChangesGit, is_code=is_code)),
+        ('code_df.CodeChangesLinesGit', 'commit', df_case(CodeChangesLinesGit, is_code=is_code)),
+        ('code_df.NewContributorsOfCommitsGit', 'commit', df_case(NewContributorsOfCommitsGit)),
+        ('code_df.IssuesNewGitHub', 'issue', df_case(IssuesNewGitHub)),
+        ('code_df.IssuesNewGitHub[reopen_as_new]', 'issue', df_case(IssuesNewGitHub, reopen_as_new=True)),
+        ('code_df.IssuesClosedGitHub', 'issue', df_case(IssuesClosedGitHub)),
+        ('code_df.IssuesClosedGitHub[reopen_as_new]', 'issue', df_case(IssuesClosedGitHub, reopen_as_new=True)),
+        ('code_df.OpenIssueAgeGitHub', 'issue', df_case(OpenIssueAgeGitHub, as_of=AS_OF)),
+        ('code_df.IssueBacklogGitHub', 'issue', df_case(IssueBacklogGitHub, as_of=AS_OF)),
+        ('code_df.ReviewsGitHub', 'pull_request', df_case(ReviewsGitHub)),
+        ('code_df.ReviewsAcceptedGitHub', 'pull_request', df_case(ReviewsAcceptedGitHub)),
+        ('code_df.ReviewsDeclinedGitHub', 'pull_request', df_case(ReviewsDeclinedGitHub)),
+        ('code_df.ReviewsDurationGitHub', 'pull_request', df_case(ReviewsDurationGitHub)),
+        ('code_df.ReviewsDurationGitHub[sketch]', 'pull_request', df_case(ReviewsDurationGitHub, sketch=True)),
+        ('scripts.CodeChangesGit', 'commit', scripts_case(ScriptsCodeChangesGit)),
+        ('scripts.CodeChangesGit[MasterInclude]', 'commit',
+         scripts_case(ScriptsCodeChangesGit, conds=[ScriptsMasterInclude()])),
+        ('scripts.CodeChangesLinesGit', 'commit', scripts_case(ScriptsCodeChangesLinesGit)),
+        ('scripts.ReviewsGitHub', 'pull_request', scripts_case(ScriptsReviewsGitHub)),
+        ('scripts.ReviewsAcceptedGitHub', 'pull_request', scripts_case(ScriptsReviewsAcceptedGitHub)),
+        ('scripts.ReviewsDeclinedGitHub', 'pull_request', scripts_case(ScriptsReviewsDeclinedGitHub)),
+    ]
+
+
+def data_file(category, items, seed, data_dir=DATA_DIR):
+    """
+    Return the path of a file of generated items, writing it if needed.
+
+    :param category: 'commit', 'issue' or 'pull_request'
+    :param items: the number of items
+    :param seed: the seed of the random generator
+    :param data_dir: the directory of the generated files
+
+    :returns: the path of the file
+    """
+
+    path = os.path.join(data_dir, '{}-{}-{}.json'.format(category, items, seed))
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print("Generating {} {} items in {}".format(items, category, path), file=sys.stderr)
+        tmp_path = path + '.tmp'
+        write_items(tmp_path, category, items, seed)
+        os.replace(tmp_path, path)
+
+    return path
+
+
+def clear_caches():
+    """
+    Empty the caches of parsed dates, so that every run starts cold.
+    """
+
+    for utils in (df_utils, scripts_utils):
+        utils.commit_str_to_date.cache_clear()
+        utils.github_str_to_date.cache_clear()
+    gc.collect()
+
+
+def measure(run, path, repeat=REPEAT, memory=True):
+    """
+    Measure a benchmark case.
+
+    :param run: the function running the case
+    :param path: the path of the file of items
+    :param repeat: the number of timed runs
+    :param memory: whether to trace memory during another run
+
+    :returns: a dictionary with the best 'seconds', and the 'peak_mib'
+        traced by tracemalloc, or None if memory is not traced
+    """
+
+    timings = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        run(path)
+        timings.append(time.perf_counter() - start)
+
+    peak_mib = None
+    if memory:
+        clear_caches()
+        tracemalloc.start()
+        try:
+            run(path)
+            peak_mib = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': round(min(timings), 4), 'peak_mib': peak_mib}
+
+
+def machine():
+    """
+    Describe the machine and the versions running the benchmarks.
+
+    :returns: a dictionary
+    """
+
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__
+    }
+
+
+def read_baselines(path=BASELINES_FILE):
+    """
+    Read the stored baselines.
+
+    :param path: the path of the JSON file of baselines
+
+    :returns: a dictionary with the 'machine' which measured them, and
+        the 'results' by number of items (as a string) and by case
+    """
+
+    if not os.path.exists(path):
+        return {'machine': None, 'results': {}}
+
+    with open(path, 'r') as baselines_file:
+        return json.load(baselines_file)
+
+
+def write_baselines(baselines, path=BASELINES_FILE):
+    """
+    Write the baselines to their JSON file.
+
+    :param baselines: a dictionary, as returned by read_baselines
+    :param path: the path of the JSON file of baselines
+    """
+
+    with open(path, 'w') as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write('\n')
+
+
+def regressions(result, baseline, tolerance=TOLERANCE):
+    """
+    Compare the result of a case with its baseline.
+
+    :param result: a dictionary, as returned by measure
+    :param baseline: a dictionary, as returned by measure, or None
+    :param tolerance: the relative increase accepted, e.g. 0.25
+
+    :returns: a list with the measures ('seconds', 'peak_mib') which
+        exceed their baseline by more than the tolerance
+    """
+
+    if not baseline:
+        return []
+
+    return [measure_name for measure_name in ('seconds', 'peak_mib')
+            if result.get(measure_name) is not None and baseline.get(measure_name)
+            and result[measure_name] > baseline[measure_name] * (1 + tolerance)]
+
+
+def ratio(value, baseline):
+    """
+    Format a measure relative to its baseline, e.g. '1.05x'.
+    """
+
+    if value is None or not baseline:
+        return '-'
+
+    return '{:.2f}x'.format(value / baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the metrics on synthetic Perceval items")
+    parser.add_argument('--items', type=int, action='append',
+                        help="number of items of every file (repeat it for several sizes, default 10000)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated items")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="directory of the generated items")
+    parser.add_argument('--filter', default='', help="only run the cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="number of timed runs of every case")
+    parser.add_argument('--no-memory', action='store_true', help="do not trace memory")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="relative increase over the baseline reported as a regression")
+    parser.add_argument('--baselines', default=BASELINES_FILE, help="JSON file of baselines")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baselines")
+    args = parser.parse_args()
+
+    baselines = read_baselines(args.baselines)
+    if baselines['machine'] and baselines['machine'] != machine() and not args.save:
+        print("Baselines were measured on {}".format(baselines['machine']), file=sys.stderr)
+
+    selected = [case for case in cases() if args.filter in case[0]]
+    failed = []
+
+    for items in args.items or [10000]:
+        stored = baselines['results'].setdefault(str(items), {})
+        print("{} items, seed {}".format(items, args.seed))
+        print("{:<44} {:>10} {:>8} {:>10}".format('case', 'seconds', '', 'peak MiB'))
+
+        for name, category, run in selected:
+            path = data_file(category, items, args.seed, args.data_dir)
+            result = measure(run, path, args.repeat, not args.no_memory)
+            baseline = stored.get(name)
+            slower = regressions(result, baseline, args.tolerance)
+
+            print("{:<44} {:>10.3f} {:>8} {:>10} {:>8} {}".format(
+                name, result['seconds'], ratio(result['seconds'], (baseline or {}).get('seconds')),
+                '-' if result['peak_mib'] is None else '{:.1f}'.format(result['peak_mib']),
+                ratio(result['peak_mib'], (baseline or {}).get('peak_mib')),
+                'REGRESSION' if slower else '').rstrip())
+
+            if slower:
+                failed.append((items, name, slower))
+            if args.save:
+                stored[name] = result
+
+    if args.save:
+        baselines['machine'] = machine()
+        write_baselines(baselines, args.baselines)
+        print("Baselines saved to {}".format(args.baselines))
+    elif failed:
+        for items, name, slower in failed:
+            print("Regression: {} on {} items ({})".format(name, items, ', '.join(slower)), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Seeded generator of synthetic Perceval items, for benchmarks.
+
+It writes line-by-line JSON files shaped like the ones produced by
+Perceval for Git commits and for GitHub issues and pull requests,
+with the fields read by the metrics, at any number of items:
+
+* commits follow a master branch with topic branches merged back,
+  and a few branches never merged; authors contribute following a
+  power law, and files are spread over source, test, documentation
+  and binary paths, so that conditions have something to filter
+* issues are closed, some of them several times, with reopened
+  events, and the events of GitHub (labeled, referenced...)
+* pull requests are open, merged, or closed without being merged
+
+The same seed and number of items always give the same file.
+
+Run it from the root of the repository:
+    $ python3 -m implementations.benchmarks.generate_data commit 100000 commits.json
+"""
+
+import argparse
+import datetime
+import json
+import random
+
+
+START_DATE = datetime.datetime(2010, 1, 1, tzinfo=datetime.timezone.utc)
+# Items are spread over about ten years, whatever their number
+SPAN_SECONDS = 10 * 365 * 24 * 3600
+ORIGIN = 'https://github.com/chaoss/synthetic'
+
+DIRECTORIES = ['src', 'src/core', 'src/utils', 'src/plugins', 'lib', 'tests', 'tests/unit', 'bin', 'docs']
+EXTENSIONS = ['.py', '.py', '.py', '.c', '.h', '.js', '.md', '.txt', '.png']
+OTHER_EVENTS = ['labeled', 'referenced', 'mentioned', 'subscribed', 'assigned', 'renamed']
+TIMEZONES = [-8, -5, 0, 1, 2, 5, 8]
+
+GIT_DATE_FORMAT = "%a %b %d %H:%M:%S %Y %z"
+GITHUB_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class Population:
+    """
+    Names chosen at random, some of them far more often than others.
+
+    :param rng: a random.Random object
+    :param size: the number of names
+    :param prefix: the prefix of the names
+    """
+
+    def __init__(self, rng, size, prefix):
+
+        self.rng = rng
+        self.names = ['{}{}'.format(prefix, index) for index in range(size)]
+        weights = [1 / (rank + 1) for rank in range(size)]
+        total = sum(weights)
+        self.cumulative = []
+        cumulative = 0
+        for weight in weights:
+            cumulative += weight / total
+            self.cumulative.append(cumulative)
+
+    def choice(self):
+        """
+        Return a name, the first ones being the most frequent.
+        """
+
+        value = self.rng.random()
+        low, high = 0, len(self.cumulative) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.cumulative[middle] < value:
+                low = middle + 1
+            else:
+                high = middle
+
+        return self.names[low]
+
+
+def git_date(date, rng):
+    """
+    Format a date as Git does, in a random timezone.
+
+    :param date: an aware datetime object
+    :param rng: a random.Random object
+
+    :returns: a string of GIT_DATE_FORMAT
+    """
+
+    timezone = datetime.timezone(datetime.timedelta(hours=rng.choice(TIMEZONES)))
+    return date.astimezone(timezone).strftime(GIT_DATE_FORMAT)
+
+
+def github_date(date):
+    """
+    Format a date as GitHub does.
+
+    :param date: an aware datetime object
+
+    :returns: a string of GITHUB_DATE_FORMAT
+    """
+
+    return date.strftime(GITHUB_DATE_FORMAT)
+
+
+def perceval_item(category, data, uuid, date):
+    """
+    Wrap data in the fields Perceval adds to every item.
+
+    :param category: 'commit', 'issue' or 'pull_request'
+    :param data: the data of the item (dictionary)
+    :param uuid: the unique id of the item (string)
+    :param date: the last update of the item (aware datetime object)
+
+    :returns: a Perceval item (dictionary)
+    """
+
+    return {
+        'backend_name': 'Git' if category == 'commit' else 'GitHub',
+        'backend_version': '0.0.0',
+        'category': category,
+        'data': data,
+        'origin': ORIGIN,
+        'perceval_version': '0.0.0',
+        'tag': ORIGIN,
+        'timestamp': date.timestamp(),
+        'updated_on': date.timestamp(),
+        'uuid': uuid
+    }
+
+
+def generate_commits(n, seed=0):
+    """
+    Generate Perceval Git commits, oldest first.
+
+    :param n: the number of commits
+    :param seed: the seed of the random generator
+
+    :returns: a generator of Perceval items (dictionaries)
+    """
+
+    rng = random.Random(seed)
+    authors = Population(rng, max(10, n // 50), 'Developer ')
+    paths = Population(rng, max(50, n // 10), '')
+    path_names = {}
+
+    def path(name):
+        if name not in path_names:
+            path_names[name] = '{}/file{}{}'.format(rng.choice(DIRECTORIES), name,
+                                                    rng.choice(EXTENSIONS))
+        return path_names[name]
+
+    def commit_hash():
+        return '{:040x}'.format(rng.getrandbits(160))
+
+    date = START_DATE
+    master = []
+    branch = None
+
+    for index in range(n):
+        date += datetime.timedelta(seconds=rng.expovariate(n / SPAN_SECONDS))
+        author = authors.choice()
+        author = '{} <{}@example.com>'.format(author, author.lower().replace(' ', '.'))
+        # the last commit is on master, where HEAD points
+        is_last = index == n - 1
+        is_merge = branch is not None and len(branch) > 1 and (is_last or rng.random() < 0.3)
+
+        if is_merge:
+            parents = [master[-1], branch[-1]]
+            files = [{'file': path(paths.choice()), 'indexes': [], 'modes': []}
+                     for _ in range(rng.randint(1, 3))]
+        else:
+            if branch is None and master and not is_last and rng.random() < 0.1:
+                branch = [master[-1]]
+            if is_last:
+                branch = None
+            parents = (branch if branch is not None else master)[-1:]
+            files = []
+            for _ in range(min(1 + int(rng.expovariate(0.4)), 50)):
+                binary = rng.random() < 0.02
+                files.append({
+                    'action': rng.choice('MMMMAD'),
+                    'added': '-' if binary else str(int(rng.expovariate(0.05))),
+                    'file': path(paths.choice()),
+                    'indexes': [commit_hash()[:7], commit_hash()[:7]],
+                    'modes': ['100644', '100644'],
+                    'removed': '-' if binary else str(int(rng.expovariate(0.1)))
+                })
+
+        commit = commit_hash()
+        data = {
+            'Author': author,
+            'AuthorDate': git_date(date, rng),
+            'Commit': author,
+            'CommitDate': git_date(date, rng),
+            'commit': commit,
+            'files': files,
+            'message': 'Commit {}'.format(index),
+            'parents': parents,
+            'refs': []
+        }
+
+        if is_merge:
+            data['Merge'] = ' '.join(parent[:7] for parent in parents)
+            master.append(commit)
+            branch = None
+        elif branch is not None:
+            branch.append(commit)
+            if rng.random() < 0.02:
+                # an abandoned branch, never merged into master
+                data['refs'] = ['refs/remotes/origin/topic-{}'.format(index)]
+                branch = None
+        else:
+            master.append(commit)
+
+        if is_last:
+            data['refs'] = ['HEAD -> refs/heads/master', 'refs/remotes/origin/master']
+
+        # only the tips are needed to choose parents
+        del master[:-1]
+
+        yield perceval_item('commit', data, commit, date)
+
+
+def github_user(login):
+    """
+    Return the user of a GitHub item or event.
+
+    :param login: the login of the user
+
+    :returns: a dictionary
+    """
+
+    return {'login': login, 'type': 'User', 'site_admin': False}
+
+
+def generate_issues(n, seed=0):
+    """
+    Generate Perceval GitHub issues, with their events, oldest first.
+
+    :param n: the number of issues
+    :param seed: the seed of the random generator
+
+    :returns: a generator of Perceval items (dictionaries)
+    """
+
+    rng = random.Random(seed)
+    users = Population(rng, max(10, n // 20), 'user')
+    date = START_DATE
+
+    for index in range(n):
+        date += datetime.timedelta(seconds=rng.expovariate(n / SPAN_SECONDS))
+        events = []
+        event_date = date
+        state = 'open'
+        closed_at = None
+
+        # closing cycles: closed, then reopened and closed again
+        cycles = 0 if rng.random() < 0.2 else 1 + int(rng.expovariate(2))
+        for cycle in range(cycles):
+            for _ in range(int(rng.expovariate(1))):
+                event_date += datetime.timedelta(seconds=rng.expovariate(1 / 100000))
+                events.append((rng.choice(OTHER_EVENTS), event_date))
+
+            event_date += datetime.timedelta(seconds=rng.expovariate(1 / 1000000))
+            events.append(('closed', event_date))
+            state, closed_at = 'closed', event_date
+
+            if cycle < cycles - 1 or rng.random() < 0.05:
+                event_date += datetime.timedelta(seconds=rng.expovariate(1 / 500000))
+                events.append(('reopened', event_date))
+                state, closed_at = 'open', None
+
+        data = {
+            'closed_at': github_date(closed_at) if closed_at else None,
+            'created_at': github_date(date),
+            'events_data': [{
+                'actor': github_user(users.choice()),
+                'created_at': github_date(created_at),
+                'event': event,
+                'id': index * 100 + position
+            } for position, (event, created_at) in enumerate(events)],
+            'id': 100000000 + index,
+            'number': index + 1,
+            'state': state,
+            'title': 'Issue {}'.format(index + 1),
+            'updated_at': github_date(event_date),
+            'user': github_user(users.choice())
+        }
+
+        yield perceval_item('issue', data, 'issue-{}'.format(index), event_date)
+
+
+def generate_pull_requests(n, seed=0):
+    """
+    Generate Perceval GitHub pull requests, oldest first.
+
+    :param n: the number of pull requests
+    :param seed: the seed of the random generator
+
+    :returns: a generator of Perceval items (dictionaries)
+    """
+
+    rng = random.Random(seed)
+    users = Population(rng, max(10, n // 20), 'user')
+    date = START_DATE
+
+    for index in range(n):
+        date += datetime.timedelta(seconds=rng.expovariate(n / SPAN_SECONDS))
+        closed_at = merged_at = None
+        outcome = rng.random()
+        if outcome < 0.9:
+            closed_at = date + datetime.timedelta(seconds=rng.expovariate(1 / 300000))
+            if outcome < 0.7:
+                merged_at = closed_at
+
+        data = {
+            'closed_at': github_date(closed_at) if closed_at else None,
+            'created_at': github_date(date),
+            'id': 200000000 + index,
+            'merged': merged_at is not None,
+            'merged_at': github_date(merged_at) if merged_at else None,
+            'number': index + 1,
+            'state': 'closed' if closed_at else 'open',
+            'title': 'Pull request {}'.format(index + 1),
+            'updated_at': github_date(closed_at or date),
+            'user': github_user(users.choice())
+        }
+
+        yield perceval_item('pull_request', data, 'pull-{}'.format(index), closed_at or date)
+
+
+GENERATORS = {
+    'commit': generate_commits,
+    'issue': generate_issues,
+    'pull_request': generate_pull_requests
+}
+
+
+def write_items(path, category, n, seed=0):
+    """
+    Write generated items to a line-by-line JSON file.
+
+    :param path: the path of the file
+    :param category: 'commit', 'issue' or 'pull_request'
+    :param n: the number of items
+    :param seed: the seed of the random generator
+    """
+
+    with open(path, 'w') as items_file:
+        for item in GENERATORS[category](n, seed):
+            items_file.write(json.dumps(item, sort_keys=True))
+            items_file.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Perceval items")
+    parser.add_argument('category', choices=sorted(GENERATORS))
+    parser.add_argument('items', type=int, help="number of items")
+    parser.add_argument('path', help="line-by-line JSON file to write")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    write_items(args.path, args.category, args.items, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Accumulators computing metrics in a single pass over flat items.
+
+Instead of building a DataFrame, a metric can declare accumulators
+(see Metric._accumulators), which are updated with every flat item
+as items are read, once for the whole period of the analysis and once
+for the interval of the time series the item falls in. Memory is thus
+proportional to the number of intervals, not to the number of items
+(except for Distinct, which remembers the distinct values, and Median,
+which remembers all the values).
+"""
+
+import copy
+
+import pandas as pd
+
+from implementations.code_df.quantile_sketch import QuantileSketch, DEFAULT_RELATIVE_ACCURACY
+
+
+class Accumulator:
+    """
+    Root of all accumulators.
+
+    :param value: the key of the flat dictionaries holding the value
+        to accumulate, or a function computing it from a flat
+        dictionary, or None if values are not needed
+    :param where: a function telling whether a flat dictionary is
+        accumulated, or None to accumulate all of them
+    """
+
+    def __init__(self, value=None, where=None):
+
+        self.value = value
+        self.where = where
+
+    def accepts(self, flat):
+        """
+        Check whether a flat dictionary fulfills `where`.
+
+        :param flat: a flat dictionary, as produced by Metric._flatten
+
+        :returns: a Boolean
+        """
+
+        return self.where is None or self.where(flat)
+
+    def add(self, flat):
+        """
+        Accumulate a flat dictionary, which fulfills `where`.
+
+        :param flat: a flat dictionary, as produced by Metric._flatten
+        """
+
+        if self.value is None:
+            self._add(None)
+        elif callable(self.value):
+            self._add(self.value(flat))
+        else:
+            self._add(flat[self.value])
+
+    def _add(self, value):
+        """
+        Accumulate a value.
+
+        :param value: the value of a flat dictionary
+        """
+
+        raise NotImplementedError
+
+    def merge(self, other):
+        """
+        Add what another accumulator of the same kind accumulated,
+        e.g. from the items of another repository.
+
+        :param other: an accumulator of the same class
+
+        :returns: the accumulator itself
+        """
+
+        raise NotImplementedError
+
+    def result(self):
+        """
+        Return the value of the accumulator.
+        """
+
+        raise NotImplementedError
+
+
+class Count(Accumulator):
+    """
+    Number of flat dictionaries.
+    """
+
+    def __init__(self, where=None):
+
+        super().__init__(None, where)
+        self.count = 0
+
+    def _add(self, value):
+
+        self.count += 1
+
+    def merge(self, other):
+
+        self.count += other.count
+        return self
+
+    def result(self):
+
+        return self.count
+
+
+class Sum(Accumulator):
+    """
+    Sum of the values of flat dictionaries.
+    """
+
+    def __init__(self, value, where=None):
+
+        super().__init__(value, where)
+        self.total = 0
+
+    def _add(self, value):
+
+        self.total += value
+
+    def merge(self, other):
+
+        self.total += other.total
+        return self
+
+    def result(self):
+
+        return self.total
+
+
+class Mean(Accumulator):
+    """
+    Mean of the values of flat dictionaries, NaN if there is none.
+    """
+
+    def __init__(self, value, where=None):
+
+        super().__init__(value, where)
+        self.count = 0
+        self.total = 0
+
+    def _add(self, value):
+
+        self.count += 1
+        self.total += value
+
+    def merge(self, other):
+
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def result(self):
+
+        return self.total / self.count if self.count else float('nan')
+
+
+class Distinct(Accumulator):
+    """
+    Number of distinct values of flat dictionaries.
+    """
+
+    def __init__(self, value, where=None):
+
+        super().__init__(value, where)
+        self.values = set()
+
+    def _add(self, value):
+
+        self.values.add(value)
+
+    def merge(self, other):
+
+        self.values |= other.values
+        return self
+
+    def result(self):
+
+        return len(self.values)
+
+
+class Median(Accumulator):
+    """
+    Median of the values of flat dictionaries, as computed by pandas,
+    NaN if there is none.
+
+    Unlike Quantile, the median is exact, but all the values are kept.
+    """
+
+    def __init__(self, value, where=None):
+
+        super().__init__(value, where)
+        self.values = []
+
+    def _add(self, value):
+
+        self.values.append(value)
+
+    def merge(self, other):
+
+        self.values.extend(other.values)
+        return self
+
+    def result(self):
+
+        return pd.Series(self.values, dtype='float64').median()
+
+
+class Quantile(Accumulator):
+    """
+    Quantile of the values of flat dictionaries, estimated with a
+    QuantileSketch (see its quantile method), NaN if there is none.
+
+    Values are buffered, and added to the sketch by batches.
+
+    :param q: the quantile, between 0 and 1, e.g. 0.5 for the median
+    :param relative_accuracy: the relative error of the estimate
+    """
+
+    buffer_size = 1024
+
+    def __init__(self, value, q, where=None, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+
+        super().__init__(value, where)
+        self.q = q
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.buffer = []
+
+    def _add(self, value):
+
+        self.buffer.append(value)
+        if len(self.buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        """
+        Add the buffered values to the sketch.
+        """
+
+        if self.buffer:
+            self.sketch.update(self.buffer)
+            self.buffer = []
+
+    def merge(self, other):
+
+        self._flush()
+        other._flush()
+        self.sketch.merge(other.sketch)
+        return self
+
+    def result(self):
+
+        self._flush()
+        return self.sketch.quantile(self.q)
+
+
+def period_end(date, period):
+    """
+    Return the label of the interval of a period a date falls in,
+    as given by DataFrame.resample: the last day of the interval.
+
+    :param date: a datetime object
+    :param period: a pandas time series rule, e.g. 'M', 'W' or 'D'
+
+    :returns: a pandas Timestamp
+    """
+
+    return pd.Timestamp(date).to_period(period).end_time.normalize()
+
+
+def accumulate(accumulators, flats, period='M', total=None):
+    """
+    Update accumulators with flat dictionaries, in a single pass.
+
+    :param accumulators: a dictionary of accumulators, by name,
+        which are copied for every interval of the time series
+    :param flats: an iterable of flat dictionaries, with their
+        'created_date'
+    :param period: A string which can be any one of the pandas time
+        series rules:
+            'W': week
+            'M': month
+            'D': day
+    :param total: the accumulator of all the flat dictionaries, or
+        None to use a copy of the first of accumulators
+
+    :returns: a tuple with the result of total, and a DataFrame with
+        a column per accumulator and a row per interval of the time
+        series, from the first to the last interval with a flat
+        dictionary accepted by some accumulator, as built by
+        DataFrame.resample; rows where all the results are NaN, e.g.
+        quantiles of intervals without values, are left out
+    """
+
+    if total is None:
+        total = copy.deepcopy(next(iter(accumulators.values())))
+
+    intervals = {}
+    labels = {}
+
+    for flat in flats:
+        if total.accepts(flat):
+            total.add(flat)
+
+        accepted = [name for name, accumulator in accumulators.items()
+                    if accumulator.accepts(flat)]
+        if not accepted:
+            continue
+
+        date = flat['created_date']
+        label = labels.get(date)
+        if label is None:
+            label = labels[date] = period_end(date, period)
+
+        interval = intervals.get(label)
+        if interval is None:
+            interval = intervals[label] = copy.deepcopy(accumulators)
+
+        for name in accepted:
+            interval[name].add(flat)
+
+    if not intervals:
+        index = pd.DatetimeIndex([], name='created_date')
+    else:
+        index = pd.date_range(min(intervals), max(intervals), freq=period, name='created_date')
+
+    rows = [intervals.get(label) or accumulators for label in index]
+    columns = {name: [row[name].result() for row in rows] for name in accumulators}
+    series = pd.DataFrame(columns, index=index, columns=list(accumulators))
+
+    return total.result(), series.dropna(how='all')
@@ -21,6 +21,7 @@
 
 from datetime import datetime
 
+from implementations.code_df.accumulators import Count, Distinct
 from implementations.code_df.commit_git import CommitGit
 from implementations.code_df.conditions import (DirExclude,
                                                 MasterInclude,
@@ -45,6 +46,25 @@ class CodeChangesGit(CommitGit):
 
         return len(self.df['hash'].unique())
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'count': Count()}
+
+    def _total_accumulator(self):
+        """
+        Declare how the value returned by compute is accumulated:
+        commits are counted once, even if found in several repositories.
+
+        :returns: an Accumulator object
+        """
+
+        return Distinct('hash')
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame or Series
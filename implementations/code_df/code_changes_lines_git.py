@@ -21,89 +21,21 @@
 
 from datetime import datetime
 
+from implementations.code_df.accumulators import Sum
 from implementations.code_df.commit_git import CommitGit
 from implementations.code_df.conditions import (DirExclude,
                                                 MasterInclude,
                                                 PostfixExclude)
-from implementations.code_df.utils import (str_to_date,
-                                           read_json_file)
+from implementations.code_df.utils import read_json_file
 
 
 class CodeChangesLinesGit(CommitGit):
     """
     Class for the Code Changes Lines metric
-    """
-
-    def _flatten(self, item):
-        """
-        Flatten a raw commit fetched by Perceval into a flat dictionary.
-
-        A list with a single flat directory will be returned.
-        That dictionary will have the elements we need for computing metrics.
-        The list may be empty, if for some reason the commit should not
-        be considered.
-
-        :param item: raw item fetched by Perceval (dictionary)
-        :returns:    list of a single flat dictionary
-        """
 
-        creation_date = str_to_date(item['data']['AuthorDate'])
-        if self.since and (self.since > creation_date):
-            return []
-
-        if self.until and (self.until < creation_date):
-            return []
-
-        code_files = [file['file'] for file in item['data']['files'] if
-                      all(condition.check(file['file'])
-                          for condition in self.is_code)]
-
-        if len(code_files) > 0:
-            flat = {
-                'repo': item['origin'],
-                'hash': item['data']['commit'],
-                'author': item['data']['Author'],
-                'category': "commit",
-                'created_date': creation_date,
-                'committer': item['data']['Commit'],
-                'commit_date': str_to_date(item['data']['CommitDate']),
-                'files_no': len(item['data']['files']),
-                'refs': item['data']['refs'],
-                'parents': item['data']['parents'],
-                'files': item['data']['files']
-            }
-
-            # actions
-            actions = 0
-            for file in item['data']['files']:
-                if 'action' in file:
-                    actions += 1
-            flat['files_action'] = actions
-
-            # Merge commit check
-            if 'Merge' in item['data']:
-                flat['merge'] = True
-            else:
-                flat['merge'] = False
-
-            # modifications
-            modified_lines = 0
-            for file in item['data']['files']:
-                if 'added' and 'removed' in file:
-                    try:
-                        modified_lines += int(file['added']) \
-                                        + int(file['removed'])
-
-                    except ValueError:
-                        # in case of compressed files,
-                        # additions and deletions are "-"
-                        pass
-
-            flat['modifications'] = modified_lines
-
-            return [flat]
-        else:
-            return []
+    The number of lines modified by each commit is computed by
+    CommitGit._flatten, in the 'modifications' column.
+    """
 
     def compute(self):
         """
@@ -122,6 +54,15 @@ class CodeChangesLinesGit(CommitGit):
 
         return modifications_count
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'sum': Sum('modifications')}
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame or Series
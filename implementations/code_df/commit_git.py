@@ -19,16 +19,22 @@
 #     Aniruddha Karajgi <akarajgi0@gmail.com>
 #
 
+import pandas as pd
+
+from implementations import profiling
 from implementations.code_df.metric import Metric
 from implementations.code_df.conditions import Naive, Commit
-from implementations.code_df.utils import str_to_date
+from implementations.code_df.utils import commit_str_to_date
 
 
 class CommitGit(Metric):
     """
-    Initializes self.df, the dataframe with one commit per row.
+    Initializes self.df, the dataframe with one commit per row,
+    and self.files, the dataframe with one row per file of each commit,
+    linked to self.df by the integer 'commit_id' column.
 
-    :param items: A list of dictionaries.
+    :param items: An iterable of dictionaries, such as a list or
+        the generator returned by utils.iter_items.
         Each item is a Perceval dictionary, obtained from a JSON
         file or from Perceval directly.
 
@@ -46,6 +52,10 @@ class CommitGit(Metric):
         included in the analysis.
         """
 
+    tables = ('files',)
+    id_column = 'commit_id'
+    categorical_columns = ('file', 'action')
+
     def __init__(self, items, date_range=(None, None),
                  is_code=[Naive()], conds=[]):
 
@@ -55,22 +65,171 @@ class CommitGit(Metric):
 
         super().__init__(items)
 
-        # Initialize conditions
-        for condition in self.conds:
-            if isinstance(condition, Commit):
-                condition.set_commits(self.df)
-        # Filter out rows not fulfilling conditions
-        for condition in self.conds:
-            self._filterout(condition)
+    def _table(self, name, ids, lists):
+        """
+        Build the DataFrame of the files of some commits
+
+        Compressed files have "-" added and removed lines in Perceval,
+        which are counted as 0 lines.
 
-    def _filterout(self, condition):
+        :param name: 'files'
+        :param ids: the ids of the commits
+        :param lists: the 'files' lists of the commits
+
+        :returns: a DataFrame with the 'commit_id', 'file', 'action',
+            'added' and 'removed' columns
+        """
+
+        rows = [(commit_id, file['file'], file.get('action'),
+                 file.get('added'), file.get('removed'))
+                for commit_id, files in zip(ids, lists) for file in files]
+        files = pd.DataFrame(rows, columns=[self.id_column, 'file', 'action',
+                                            'added', 'removed'])
+
+        files[self.id_column] = files[self.id_column].astype('int64')
+        for column in ('added', 'removed'):
+            files[column] = pd.to_numeric(files[column], errors='coerce') \
+                              .fillna(0).astype('int64')
+
+        return files
+
+    def _flat_frame(self, items):
+        """
+        Build the DataFrames of commits and of their files, keeping
+        only the commits touching at least one source code file.
+
+        The is_code conditions are checked once per unique path, over
+        the categories of the file column, and joined back to the files
+        through the category codes.
+
+        :param items: iterable of commits fetched by Perceval
+        :returns: a dictionary with the DataFrame of commits, 'df',
+            and the one of their files, 'files'
+        """
+
+        frames = super()._flat_frame(items)
+        df, files = frames['df'], frames['files']
+        if df.empty:
+            return frames
+
+        with profiling.stage('is_code', metric=type(self).__name__) as record:
+            record['items_in'] = record['items_out'] = len(df)
+
+            paths = pd.Series(files['file'].cat.categories)
+            is_code = pd.Series(True, index=paths.index)
+            for condition in self.is_code:
+                is_code &= condition.check_paths(paths)
+
+            code_ids = files[self.id_column][is_code.values[files['file'].cat.codes]]
+            if len(code_ids) == len(files):
+                return frames
+
+            df = df[df[self.id_column].isin(code_ids)].reset_index(drop=True)
+            files = files[files[self.id_column].isin(df[self.id_column])].reset_index(drop=True)
+            record['items_out'] = len(df)
+
+        return {'df': df, 'files': files}
+
+    def _finish(self, frames):
+        """
+        Filter the DataFrame of commits, and their files, with conditions
+
+        :param frames: a dictionary with the DataFrame of commits, 'df',
+            and the one of their files, 'files'
+        :returns: a dictionary with the rows of both DataFrames
+            belonging to the commits fulfilling all conditions
+        """
+
+        df = frames['df']
+        if df.empty or not self.conds:
+            return frames
+
+        with profiling.stage('conditions', metric=type(self).__name__) as record:
+            record['items_in'] = len(df)
+
+            # Initialize conditions
+            for condition in self.conds:
+                if isinstance(condition, Commit):
+                    condition.set_commits(df)
+            # Filter out rows not fulfilling conditions
+            df = self._filterout(df, self.conds)
+            files = frames['files']
+            if len(df) < len(frames['df']):
+                files = files[files[self.id_column].isin(df[self.id_column])]
+
+            record['items_out'] = len(df)
+
+        return {'df': df, 'files': files}
+
+    def _stream(self, items):
+        """
+        Flatten commits one at a time, keeping the ones touching at
+        least one source code file. Paths are checked once each.
+
+        :param items: iterable of commits fetched by Perceval
+        :returns: a generator of flat dictionaries
+
+        :raises ValueError: if there are conditions on commits, which
+            need all the commits at once
+        """
+
+        if self.conds:
+            raise ValueError("Conditions on commits need all the commits, "
+                             "and cannot be accumulated")
+
+        is_code = {}
+        for flat in self._flat_items(items):
+            for file in flat['files']:
+                path = file['file']
+                if path not in is_code:
+                    is_code[path] = all(condition.check(path) for condition in self.is_code)
+                if is_code[path]:
+                    yield flat
+                    break
+
+    def _flat_key(self):
+        """
+        Describe how _flat_frame builds the DataFrame of commits
+
+        :returns: a hashable tuple
+        """
+
+        return super()._flat_key() + (self.since, self.until, tuple(self.is_code))
+
+    def _frame_key(self):
+        """
+        Describe how _frame builds the DataFrame of commits
+
+        :returns: a hashable tuple
+        """
+
+        return super()._frame_key() + (tuple(self.conds),)
+
+    def _filterout(self, df, conditions):
         """
         Filter out rows according to conditions on commits
+
+        The masks of all the conditions are AND-ed together,
+        so that the DataFrame is filtered only once.
+
+        :param df: DataFrame of commits
+        :param conditions: list of Commit sub-class objects
+
+        :returns: the rows of df fulfilling all conditions
         """
 
-        for index, row in self.df.iterrows():
-            if not condition.check(row['hash']):
-                self.df.drop(index, inplace=True)
+        if not conditions:
+            return df
+
+        kept = len(df)
+        mask = pd.Series(True, index=df.index)
+        for condition in conditions:
+            mask &= condition.mask(df)
+            if profiling.active():
+                kept, before = int(mask.sum()), kept
+                profiling.count(repr(condition), before, kept)
+
+        return df[mask]
 
     def _flatten(self, item):
         """
@@ -79,24 +238,21 @@ class CommitGit(Metric):
         A list with a single flat directory will be returned.
         That dictionary will have the elements we need for computing metrics.
         The list may be empty, if for some reason the commit should not
-        be considered.
+        be considered. Commits touching no source code file, according
+        to is_code, are left out later on, by _flat_frame.
 
         :param item: raw item fetched by Perceval (dictionary)
         :returns:    list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['AuthorDate'])
+        creation_date = commit_str_to_date(item['data']['AuthorDate'])
         if self.since and (self.since > creation_date):
             return []
 
         if self.until and (self.until < creation_date):
             return []
 
-        code_files = [file['file'] for file in item['data']['files'] if
-                      all(condition.check(file['file'])
-                          for condition in self.is_code)]
-
-        if len(code_files) > 0:
+        if len(item['data']['files']) > 0:
             flat = {
                 'repo': item['origin'],
                 'hash': item['data']['commit'],
@@ -104,7 +260,7 @@ class CommitGit(Metric):
                 'category': "commit",
                 'created_date': creation_date,
                 'committer': item['data']['Commit'],
-                'commit_date': str_to_date(item['data']['CommitDate']),
+                'commit_date': commit_str_to_date(item['data']['CommitDate']),
                 'files_no': len(item['data']['files']),
                 'refs': item['data']['refs'],
                 'parents': item['data']['parents'],
@@ -122,6 +278,20 @@ class CommitGit(Metric):
             else:
                 flat['merge'] = False
 
+            modified_lines = 0
+            for file in item['data']['files']:
+                if 'added' and 'removed' in file:
+                    try:
+                        modified_lines += int(file['added']) \
+                                        + int(file['removed'])
+
+                    except ValueError:
+                        # in case of compressed files,
+                        # additions and deletions are "-"
+                        pass
+
+            flat['modifications'] = modified_lines
+
             return [flat]
         else:
             return []
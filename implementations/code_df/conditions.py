@@ -27,17 +27,39 @@ We have two kinds of conditions:
 * Those rooted at Code, which are for defining which files
   are source code, and which ones are not. They provide a
   check() method which checks if a filename corresponds to
-  source code.
+  source code, and a check_paths() method doing the same for
+  a whole Series of file names at once.
 
 * Those rooted at Commit, which are for conditionally filtering
   the DataFrame of items. They provide a set_commits() method,
   which selects those commits satisfying a given condition,
   as well as a check() method which checks whether a commit in
-  the DataFrame has been selected by set_commits() or not.
+  the DataFrame has been selected by set_commits() or not, and
+  a mask() method doing the same for a whole DataFrame at once.
 """
 
+import pandas as pd
 
-class Code:
+from implementations.path_matcher import PrefixMatcher, PostfixMatcher
+
+
+class Condition:
+    """
+    Root of all conditions.
+
+    Conditions are described by the names of the attributes
+    set from their parameters, listed in `params`.
+    """
+
+    params = ()
+
+    def __repr__(self):
+        params = ', '.join('%s=%r' % (name, getattr(self, name))
+                           for name in self.params)
+        return '%s(%s)' % (type(self).__name__, params)
+
+
+class Code(Condition):
     """
     Root of the hierarchy for deciding if a commit touches source code.
     """
@@ -58,6 +80,23 @@ class Code:
 
         raise NotImplementedError
 
+    def check_paths(self, paths):
+        """
+        Check which file names of a Series are source code.
+
+        The Series is meant to hold unique file names, e.g. the
+        categories of the file column of CommitGit.files, so that
+        each path is checked once whatever the number of commits
+        touching it. Descendant classes may override it with vectorized
+        implementations; this one calls check for every path.
+
+        :param paths: file names to check (Series of strings)
+
+        :returns: a boolean Series, True for source code files
+        """
+
+        return paths.map(self.check).astype(bool)
+
 
 class Naive(Code):
     """
@@ -76,29 +115,43 @@ class Naive(Code):
 
         return True
 
+    def check_paths(self, paths):
+        """
+        Check which file names of a Series are source code.
+
+        :param paths: file names to check (Series of strings)
+        :returns: a boolean Series, always True in this case
+        """
+
+        return pd.Series(True, index=paths.index)
+
 
 class DirExclude(Code):
     """
     Consider files in certain directories are not source code.
     """
 
+    params = ('dirs',)
+
     def __init__(self, dirs=['tests', 'bin']):
 
         self.dirs = dirs
+        self.matcher = PrefixMatcher(dirs)
 
     def check(self, file):
         """
         Check if a file path is source code or not.
 
         If the path is in the list of directories,
-        return False. True otherwise.
+        return False. True otherwise. Directories can
+        have glob wildcards, like 'src/*/generated'.
 
         :param file: file name to check (full path)
 
         :returns:    False if in the list of directories (Boolean)
         """
 
-        if any(file.startswith(path) for path in self.dirs):
+        if self.matcher.match(file):
             return False
         else:
             return True
@@ -109,29 +162,33 @@ class PostfixExclude(Code):
     Consider files with certain postfixes as not source code.
     """
 
+    params = ('postfixes',)
+
     def __init__(self, postfixes=['.md', 'README']):
 
         self.postfixes = postfixes
+        self.matcher = PostfixMatcher(postfixes)
 
     def check(self, file):
         """
         Check if a file path is source code or not.
 
         If the path last characters match some element in the list
-        of postfixes, consider it is not source code.
+        of postfixes, consider it is not source code. Postfixes can
+        have glob wildcards, like '.min.*'.
 
         :param file: file name to check (full path)
 
         :returns:    False if in the list of postfixes (Boolean)
         """
 
-        if any(file.endswith(postfix) for postfix in self.postfixes):
+        if self.matcher.match(file):
             return False
         else:
             return True
 
 
-class Commit:
+class Commit(Condition):
 
     def __init__(self):
 
@@ -163,43 +220,120 @@ class Commit:
         else:
             return False
 
+    def mask(self, commits):
+        """
+        Check all the commits of a DataFrame at once.
+
+        This is the vectorized counterpart of check: it tells, for
+        every row, whether its commit is in the set of included commits.
+
+        :param commits: commits (DataFrame)
+
+        :returns: a boolean Series, aligned with commits, True for
+            included commits
+        """
 
-class MasterInclude(Commit):
+        return commits['hash'].isin(self.included)
+
+
+class BranchInclude(Commit):
     """
-    Consider as included only commits in master
+    Consider as included only commits reachable from a branch (or tag)
+
+    :param ref: name of the branch, e.g. 'master', or full name
+        of a ref, e.g. 'refs/heads/master', 'refs/tags/0.1.0'
+
+    :param first_parent: if True, only the first parent of every
+        commit is followed, as in `git log --first-parent`
     """
 
+    params = ('ref', 'first_parent')
+
+    def __init__(self, ref='master', first_parent=False):
+
+        if not ref.startswith('refs/'):
+            ref = 'refs/heads/' + ref
+
+        self.ref = ref
+        self.first_parent = first_parent
+
+    def _is_head(self, refs):
+        """
+        Check if a commit is annotated with the ref of the branch.
+
+        Perceval reports refs as 'refs/heads/<branch>', prefixed with
+        'HEAD -> ' for the checked out branch and with 'tag: ' for tags.
+
+        :param refs: the refs of a commit (list of strings)
+
+        :returns: True if the ref of the branch points to the commit
+        """
+
+        for ref in refs:
+            if ref.startswith('HEAD -> '):
+                ref = ref[len('HEAD -> '):]
+            elif ref.startswith('tag: '):
+                ref = ref[len('tag: '):]
+
+            if ref == self.ref:
+                return True
+
+        return False
+
     def set_commits(self, commits):
         """
         Set the DataFrame with commits to be analyzed for condition
 
         This method also prepares the set of included commits
-        (those in master), so that the check can be done quickly later.
+        (those in the branch), so that the check can be done quickly later.
 
-        To find commits in the master branch, this method finds
-        the commit annotated with the ref 'HEAD -> refs/heads/master',
-        and then goes back, following parents for each commit,
-        until the first one present in the data frame.
+        To find commits in the branch, this method finds the commit
+        annotated with the ref of the branch, and then goes back,
+        following parents for each commit, until the first one present
+        in the data frame. Parents are looked up in an index built once
+        from the 'hash' and 'parents' columns, so that the walk is
+        linear in the number of commits.
 
         :param commits: commits (DataFrame)
         """
 
         self.commits = commits
         df = self.commits
-        todo = set()
-        for _, commit in df.iterrows():
-            if 'HEAD -> refs/heads/master' in commit['refs']:
-                todo.add(commit['hash'])
+
+        graph = {}
+        todo = []
+        for commit, parents, refs in zip(df['hash'], df['parents'], df['refs']):
+            graph.setdefault(commit, parents)
+            if self._is_head(refs):
+                todo.append(commit)
 
         self.included = set()
-        while len(todo) > 0:
+        while todo:
             current = todo.pop()
+            if current in self.included:
+                continue
             self.included.add(current)
 
-            if len(df[df['hash'] == current]['parents']) > 0:
-                for parent in df[df['hash'] == current]['parents'].iloc[0]:
-                    if parent not in self.included:
-                        todo.add(parent)
+            parents = graph.get(current, [])
+            if self.first_parent:
+                parents = parents[:1]
+
+            for parent in parents:
+                if parent not in self.included:
+                    todo.append(parent)
+
+
+class MasterInclude(BranchInclude):
+    """
+    Consider as included only commits in master
+
+    :param first_parent: if True, only the first parent of every
+        commit is followed, as in `git log --first-parent`
+    """
+
+    def __init__(self, first_parent=False):
+
+        super().__init__('master', first_parent)
 
 
 class EmptyExclude(Commit):
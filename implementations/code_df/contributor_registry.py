@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Registry of the first contribution of every contributor.
+
+New contributors in a period are the ones whose first contribution
+falls in it, which depends on the whole history. The registry keeps
+the first contribution of every contributor seen so far, so that it
+only needs to be updated with the contributions made since.
+"""
+
+import json
+import logging
+import os
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContributorRegistry:
+    """
+    First contribution of every contributor, kept in a JSON file.
+
+    The file holds the key describing how contributions were selected,
+    e.g. the conditions on commits, and a list with the 'author',
+    'created_date', 'hash' and 'repo' of the first contribution of
+    every author, and its 'author_id' if authors are identified by
+    the ids of an IdentityIndex.
+
+    :param path: the path to the JSON file, read if it exists
+    """
+
+    columns = ['author', 'created_date', 'hash', 'repo']
+
+    def __init__(self, path):
+
+        self.path = path
+        self.key = None
+        self.df = pd.DataFrame({column: [] for column in self.columns})
+        self.df['created_date'] = pd.to_datetime(self.df['created_date'])
+
+        if os.path.exists(path):
+            with open(path, 'r') as registry_file:
+                registry = json.load(registry_file)
+
+            self.key = registry['key']
+            if registry['contributors']:
+                df = pd.DataFrame(registry['contributors'])
+                df['created_date'] = pd.to_datetime(df['created_date'])
+                self.df = df
+
+    def check_key(self, key):
+        """
+        Check that contributions are selected as they were when the
+        registry was built, and remember how if it is new.
+
+        :param key: a string describing how contributions are selected
+
+        :raises ValueError: if the registry was built with another key
+        """
+
+        if self.key is None:
+            self.key = key
+        elif self.key != key:
+            raise ValueError("Contributor registry %s was built with %s, not %s"
+                             % (self.path, self.key, key))
+
+    def update(self, df, by='author'):
+        """
+        Add the first contributions of a DataFrame of contributions.
+
+        Contributors already in the registry keep their first
+        contribution, unless df has an earlier one.
+
+        :param df: a DataFrame with the columns of the registry,
+            and a row per contribution
+        :param by: the column identifying contributors, 'author' or
+            'author_id'; it must be the same for all the updates
+        """
+
+        if df.empty:
+            return
+
+        columns = self.columns + ([by] if by not in self.columns else [])
+        first = df.loc[df.groupby(by)['created_date'].idxmin(), columns]
+        merged = pd.concat([self.df, first], ignore_index=True)
+        merged = merged.sort_values('created_date', kind='mergesort') \
+                       .drop_duplicates(by, keep='first')
+
+        self.df = merged.reset_index(drop=True)
+
+    def first_contributions(self, since=None, until=None):
+        """
+        Return the first contributions made in a period.
+
+        :param since: a datetime object, or None
+        :param until: a datetime object, or None
+
+        :returns: a DataFrame with a row per contributor whose first
+            contribution is in the period, sorted by date
+        """
+
+        df = self.df
+        if since:
+            df = df[df['created_date'] >= since]
+        if until:
+            df = df[df['created_date'] <= until]
+
+        return df.reset_index(drop=True)
+
+    def save(self):
+        """
+        Write the registry to its JSON file.
+        """
+
+        contributors = self.df.assign(created_date=self.df['created_date'].dt.strftime('%Y-%m-%dT%H:%M:%S'))
+        registry = {
+            'key': self.key,
+            'contributors': contributors.to_dict('records')
+        }
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as registry_file:
+            json.dump(registry, registry_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+        logger.debug("Contributor registry saved to %s" % self.path)
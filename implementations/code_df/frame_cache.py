@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+On-disk cache of the DataFrames built by metrics.
+
+DataFrames are stored as Parquet files, named after a digest of
+the data they were built from and of the options used to build
+them, so that a cached DataFrame is never returned for other data
+or other options. Writing Parquet files requires pyarrow.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached DataFrames changes,
+# to invalidate all the files written before.
+CACHE_VERSION = 3
+
+CACHE_SUFFIX = '.parquet'
+METADATA_KEY = b'wg-evolution'
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+
+def file_digest(path):
+    """
+    Compute the SHA-256 digest of a file, such as a Perceval JSON file.
+
+    :param path: the path to the file
+
+    :returns: the hexadecimal digest (string)
+    """
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as data:
+        for block in iter(lambda: data.read(1024 ** 2), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def items_digest(items):
+    """
+    Compute a digest identifying a list of Perceval items.
+
+    Perceval gives every item a uuid, and the time it was
+    last updated, which are enough to tell two lists apart.
+
+    :param items: iterable of items fetched by Perceval
+
+    :returns: the hexadecimal digest (string)
+    """
+
+    sha = hashlib.sha256()
+    for item in items:
+        sha.update(('%s %s\n' % (item['uuid'], item['updated_on'])).encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+def chain_digest(base_digest, items):
+    """
+    Compute a digest identifying the items of a previous run,
+    completed with newer items.
+
+    :param base_digest: the digest of the items of the previous run,
+        or None if there was no previous run
+    :param items: iterable of items fetched by Perceval since then
+
+    :returns: the hexadecimal digest (string), which is base_digest
+        itself if there are no new items
+    """
+
+    items = list(items)
+    if base_digest is None:
+        return items_digest(items)
+    if not items:
+        return base_digest
+
+    description = '%s %s' % (base_digest, items_digest(items))
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+def describe(value):
+    """
+    Describe a value with a string which does not change between runs.
+
+    :param value: part of a key, such as the result of Metric._frame_key
+
+    :returns: a string
+    """
+
+    if isinstance(value, (tuple, list)):
+        return '(' + ', '.join(describe(part) for part in value) + ')'
+
+    if callable(value) and hasattr(value, '__qualname__'):
+        return value.__module__ + '.' + value.__qualname__
+
+    return repr(value)
+
+
+class FrameCache:
+    """
+    Directory of DataFrames stored as Parquet files.
+
+    When the files in the directory take more than max_size bytes,
+    the least recently used ones are removed.
+
+    Several processes may use the same directory, e.g. the workers
+    of a batch: files are written under a temporary name and then
+    renamed, and files removed by another process are skipped.
+
+    :param path: the directory of the cache, created if needed
+
+    :param max_size: the maximum size, in bytes, of the cache
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to cache DataFrames")
+
+        self.path = path
+        self.max_size = max_size
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, *parts):
+        """
+        Build the key of a DataFrame.
+
+        :param parts: what the DataFrame depends on, e.g. the digest
+            of the data and the options used to build the DataFrame
+
+        :returns: the key (string)
+        """
+
+        description = 'v%s %s' % (CACHE_VERSION, describe(parts))
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Read a DataFrame from the cache.
+
+        :param key: the key of the DataFrame
+
+        :returns: the DataFrame, or None if it is not in the cache
+        """
+
+        path = self._path(key)
+        try:
+            table = pyarrow.parquet.read_table(path)
+        except (IOError, OSError):
+            return None
+
+        # mark the file as recently used, unless another process evicted it
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            pass
+        logger.debug("Read DataFrame %s from cache" % key)
+
+        json_columns = []
+        metadata = table.schema.metadata or {}
+        if METADATA_KEY in metadata:
+            json_columns = json.loads(metadata[METADATA_KEY].decode('utf-8'))['json_columns']
+
+        df = table.to_pandas()
+        for column in json_columns:
+            df[column] = df[column].map(json.loads)
+
+        return df
+
+    def put(self, key, df):
+        """
+        Write a DataFrame to the cache.
+
+        Columns of lists or dictionaries, such as the refs of commits,
+        are stored as JSON text, to be read back exactly.
+
+        :param key: the key of the DataFrame
+        :param df: the DataFrame
+        """
+
+        json_columns = [column for column in df.columns
+                        if df[column].dtype == object
+                        and df[column].map(lambda value: isinstance(value, (list, dict))).any()]
+
+        if json_columns:
+            df = df.assign(**{column: df[column].map(json.dumps) for column in json_columns})
+
+        table = pyarrow.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[METADATA_KEY] = json.dumps({'json_columns': json_columns}).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                pyarrow.parquet.write_table(table, tmp_file)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        logger.debug("Wrote DataFrame %s to cache" % key)
+
+        self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.path, key + CACHE_SUFFIX)
+
+    def _evict(self):
+        """
+        Remove the least recently used files until the cache
+        takes no more than max_size bytes.
+        """
+
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(CACHE_SUFFIX):
+                try:
+                    stat = os.stat(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        size = sum(entry[1] for entry in entries)
+        for _, file_size, name in sorted(entries):
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                # already evicted by another process
+                pass
+            else:
+                logger.debug("Evicted %s from cache" % name)
+            size -= file_size
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalCacheMiss(Exception):
+    """
+    Raised when the DataFrames of a previous run, to be completed with
+    new items, are not in the cache anymore.
+    """
+
+
+class FrameStore:
+    """
+    Share the DataFrames built from the same items between metrics.
+
+    A FrameStore can be passed to any Metric in place of its items.
+    The first metric asking for a DataFrame builds it (flattening,
+    date filtering, source code checks and commit conditions); the
+    following metrics whose Metric._frame_key is the same get that
+    very DataFrame back (and its tables, see Metric.tables), instead
+    of building their own.
+
+    For instance, all the metrics on commits using the same date range,
+    is_code and conds share a single DataFrame.
+
+    DataFrames are shared, not copied: metrics must not modify
+    their `df` in place.
+
+    DataFrames can also be kept on disk between runs, in a FrameCache.
+    They are then looked up with the digest of the items, which must
+    be given, and the key of the metric.
+
+    :param items: A list of dictionaries.
+        Each item is a Perceval dictionary, obtained from a JSON
+        file or from Perceval directly. It must be possible to iterate
+        over items several times if metrics need different DataFrames.
+
+    :param cache: a FrameCache, or None not to keep DataFrames on disk
+
+    In incremental mode, `items` only holds the items fetched since a
+    previous run, and `base_digest` identifies the items of that run.
+    The flat DataFrames of the previous run are read from the cache and
+    merged with the new items (see Metric._merge), before the metrics
+    finish them. IncrementalCacheMiss is raised if they are missing.
+
+    :param digest: a string identifying the items, e.g. obtained from
+        frame_cache.file_digest or frame_cache.items_digest
+
+    :param base_digest: a string identifying the items of a previous
+        run, or None if `items` holds all the items
+    """
+
+    def __init__(self, items, cache=None, digest=None, base_digest=None):
+
+        if cache is not None and digest is None:
+            raise ValueError("a digest of the items is required to use a cache")
+        if base_digest is not None and cache is None:
+            raise ValueError("a cache is required to add items to a previous run")
+
+        self.items = items
+        self.cache = cache
+        self.digest = digest
+        self.base_digest = base_digest
+        self.frames = {}
+
+    def frame(self, metric):
+        """
+        Return the DataFrames of a metric, building them if needed.
+
+        :param metric: a Metric object
+
+        :returns: a dictionary of DataFrames, as built by metric._frame
+        """
+
+        key = metric._frame_key()
+        if key not in self.frames:
+            self.frames[key] = self._load(metric, key)
+
+        return self.frames[key]
+
+    def _load(self, metric, key):
+        """
+        Read the DataFrames of a metric from the cache, or build them.
+
+        :param metric: a Metric object
+        :param key: the result of metric._frame_key()
+
+        :returns: a dictionary of DataFrames, as built by metric._frame
+        """
+
+        if self.cache is None:
+            logger.debug("Building DataFrame for %s" % type(metric).__name__)
+            return metric._frame(self.items)
+
+        frames = self._get(metric, self.digest, key)
+        if frames is None:
+            flat_key = metric._flat_key()
+            frames = metric._finish(self._load_flat(metric, flat_key))
+            if flat_key != key:
+                self._put(self.digest, key, frames)
+
+        return frames
+
+    def _load_flat(self, metric, flat_key):
+        """
+        Read the flat DataFrames of a metric from the cache, or build them,
+        merging new items into the ones of a previous run if any.
+
+        :param metric: a Metric object
+        :param flat_key: the result of metric._flat_key()
+
+        :returns: a dictionary of DataFrames, as built by metric._flat_frame
+        """
+
+        frames = self._get(metric, self.digest, flat_key)
+        if frames is not None:
+            return frames
+
+        logger.debug("Building DataFrame for %s" % type(metric).__name__)
+        if self.base_digest is None:
+            frames = metric._flat_frame(self.items)
+        else:
+            base_frames = self._get(metric, self.base_digest, flat_key)
+            if base_frames is None:
+                raise IncrementalCacheMiss("no DataFrame of the previous run for %s"
+                                           % type(metric).__name__)
+            frames = metric._merge(base_frames, metric._flat_frame(self.items))
+
+        self._put(self.digest, flat_key, frames)
+        return frames
+
+    def _get(self, metric, digest, key):
+        """
+        Read the DataFrames of a metric from the cache.
+
+        :param metric: a Metric object
+        :param digest: the digest of the items
+        :param key: the key of the DataFrames, as returned by
+            metric._frame_key() or metric._flat_key()
+
+        :returns: a dictionary of DataFrames, or None if any is missing
+        """
+
+        frames = {}
+        for name in ('df',) + metric.tables:
+            frames[name] = self.cache.get(self.cache.key(digest, key, name))
+            if frames[name] is None:
+                return None
+
+        return frames
+
+    def _put(self, digest, key, frames):
+        """
+        Write the DataFrames of a metric to the cache.
+
+        :param digest: the digest of the items
+        :param key: the key of the DataFrames
+        :param frames: a dictionary of DataFrames
+        """
+
+        for name, frame in frames.items():
+            self.cache.put(self.cache.key(digest, key, name), frame)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Resolution of the identities behind author strings.
+
+Commits name their authors as 'Name <email>', while issues and pull
+requests name them by their GitHub login, and the same person often
+uses several names, emails and logins. The identity index maps all
+these strings to an integer id per person, using rules in the format
+of git's .mailmap files, and aliases between emails and logins.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# A name followed by an email, as in 'Name <email>'
+AUTHOR_PATTERN = re.compile(r'^\s*([^<]*?)\s*<([^>]*)>\s*$')
+# The names and emails of a line of a .mailmap file
+MAILMAP_PATTERN = re.compile(r'\s*([^<#]*?)\s*<([^>]*)>')
+
+
+def split_author(author):
+    """
+    Split an author string into a name and an email.
+
+    :param author: a string, such as 'Name <email>', or a login
+
+    :returns: a tuple with the name, and the email, or None if
+        the author string has none
+    """
+
+    match = AUTHOR_PATTERN.match(author)
+    if match is None:
+        return author.strip(), None
+
+    return match.group(1), match.group(2).strip()
+
+
+def parse_mailmap(lines):
+    """
+    Parse the lines of a .mailmap file.
+
+    Each line maps the name and email used in commits to the proper
+    ones, in one of the forms supported by git:
+
+        Proper Name <commit@email>
+        <proper@email> <commit@email>
+        Proper Name <proper@email> <commit@email>
+        Proper Name <proper@email> Commit Name <commit@email>
+
+    Emails are compared regardless of case, and so are commit names.
+
+    :param lines: an iterable of strings
+
+    :returns: a dictionary mapping (commit name, commit email) tuples,
+        where the name is None if the line does not give one, to the
+        proper email, or None if the line does not give one
+    """
+
+    rules = {}
+    for line in lines:
+        line = line.split('#', 1)[0]
+        pairs = MAILMAP_PATTERN.findall(line)
+        if not pairs:
+            continue
+
+        if len(pairs) == 1:
+            # only the proper name of an email: it is the same identity
+            continue
+
+        (_, proper_email), (commit_name, commit_email) = pairs[0], pairs[1]
+        commit_name = commit_name.lower() if commit_name else None
+        rules[(commit_name, commit_email.lower())] = proper_email.lower() or None
+
+    return rules
+
+
+class IdentityIndex:
+    """
+    Integer ids of the identities behind author strings.
+
+    An author string is resolved to the lowercased email it contains,
+    or to the lowercased string itself when it has no email, such as
+    a GitHub login. The email is first replaced as told by the mailmap
+    rules, then aliases replace emails or logins by the email or login
+    of the identity, following chains of aliases. Every identity gets
+    the next integer id the first time it is seen.
+
+    The ids of identities, and the ids of the author strings already
+    resolved, are kept in a JSON file if a path is given, so that ids
+    are the same across runs, and strings are resolved only once.
+    Strings are resolved again when the rules change.
+
+    :param path: the path to the JSON file, read if it exists, or None
+    :param mailmap: the path to a .mailmap file, or None
+    :param aliases: a dictionary mapping emails or logins to the
+        email or login of their identity, or None
+    """
+
+    def __init__(self, path=None, mailmap=None, aliases=None):
+
+        self.path = path
+        self.mailmap = {}
+        if mailmap:
+            with open(mailmap, 'r') as mailmap_file:
+                self.mailmap = parse_mailmap(mailmap_file)
+        self.aliases = {alias.lower(): identity.lower()
+                        for alias, identity in (aliases or {}).items()}
+
+        self.rules = self._digest()
+        self.identities = {}
+        self.resolved = {}
+
+        if path and os.path.exists(path):
+            with open(path, 'r') as index_file:
+                index = json.load(index_file)
+
+            self.identities = index['identities']
+            if index['rules'] == self.rules:
+                self.resolved = index['resolved']
+
+    def _digest(self):
+        """
+        Digest the rules, to tell when the resolved strings are stale.
+
+        :returns: a hexadecimal string
+        """
+
+        rules = {
+            'mailmap': sorted([name or '', email, proper or '']
+                              for (name, email), proper in self.mailmap.items()),
+            'aliases': self.aliases
+        }
+        description = json.dumps(rules, sort_keys=True)
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def identity(self, author):
+        """
+        Resolve an author string to the email or login of its identity.
+
+        :param author: a string, such as 'Name <email>', or a login
+
+        :returns: a string
+        """
+
+        name, email = split_author(author)
+        if email:
+            name, email = name.lower(), email.lower()
+            email = self.mailmap.get((name, email)) or self.mailmap.get((None, email)) or email
+            identity = email
+        else:
+            identity = name.lower()
+
+        seen = set()
+        while identity in self.aliases and identity not in seen:
+            seen.add(identity)
+            identity = self.aliases[identity]
+
+        return identity
+
+    def id(self, author):
+        """
+        Return the id of the identity behind an author string.
+
+        :param author: a string, such as 'Name <email>', or a login
+
+        :returns: an integer
+        """
+
+        id_ = self.resolved.get(author)
+        if id_ is None:
+            identity = self.identity(author)
+            id_ = self.identities.get(identity)
+            if id_ is None:
+                id_ = len(self.identities)
+                self.identities[identity] = id_
+            self.resolved[author] = id_
+
+        return id_
+
+    def ids(self, authors):
+        """
+        Return the ids of the identities behind a column of author strings.
+
+        Every distinct string is resolved once.
+
+        :param authors: a pandas Series of author strings
+
+        :returns: a pandas Series of integer ids, with the index of
+            authors, and -1 for missing strings
+        """
+
+        codes, uniques = pd.factorize(authors)
+        # missing strings have the code -1, hence the id of the last element
+        unique_ids = np.array([self.id(author) for author in uniques] + [-1], dtype='int64')
+
+        return pd.Series(unique_ids[codes], index=authors.index)
+
+    def save(self):
+        """
+        Write the index to its JSON file.
+
+        :raises ValueError: if the index was created without a path
+        """
+
+        if self.path is None:
+            raise ValueError("Identity index has no path to be saved to")
+
+        index = {
+            'rules': self.rules,
+            'identities': self.identities,
+            'resolved': self.resolved
+        }
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+        logger.debug("Identity index saved to %s" % self.path)
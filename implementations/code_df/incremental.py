@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+State of the incremental runs of the analysis.
+
+For each origin and category of items, the state remembers the last
+item seen by the previous run, and the digest of all the items seen
+so far. The next run only fetches the items updated since, and adds
+them to the DataFrames cached under that digest (see FrameStore).
+"""
+
+from datetime import datetime
+import json
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = 'incremental.json'
+
+
+class IncrementalState:
+    """
+    Last items seen by previous runs, kept in a JSON file.
+
+    The file maps every origin to its categories, and every category
+    to the 'updated_on' and 'uuid' of its last item and the 'digest'
+    of all its items.
+
+    :param path: the path to the JSON file, read if it exists
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        self.origins = {}
+
+        if os.path.exists(path):
+            with open(path, 'r') as state_file:
+                self.origins = json.load(state_file)
+
+    def last(self, origin, category):
+        """
+        Return what is known of the last item of a category.
+
+        :param origin: the origin of the items, e.g. 'owner/repository'
+        :param category: the category of the items, e.g. 'commit'
+
+        :returns: a dictionary with the 'updated_on', 'uuid' and 'digest'
+            keys, or None if no item was seen yet
+        """
+
+        return self.origins.get(origin, {}).get(category)
+
+    def from_date(self, origin, category):
+        """
+        Return the date from which the items of a category must be fetched.
+
+        Perceval fetches the items updated on or after that date, so the
+        last item seen is fetched again; it is merged with itself.
+
+        :param origin: the origin of the items, e.g. 'owner/repository'
+        :param category: the category of the items, e.g. 'commit'
+
+        :returns: a naive UTC datetime object, or None to fetch all items
+        """
+
+        last = self.last(origin, category)
+        if last is None:
+            return None
+
+        return datetime.utcfromtimestamp(last['updated_on'])
+
+    def digest(self, origin, category):
+        """
+        Return the digest of the items of a category seen so far.
+
+        :param origin: the origin of the items, e.g. 'owner/repository'
+        :param category: the category of the items, e.g. 'commit'
+
+        :returns: the digest (string), or None if no item was seen yet
+        """
+
+        last = self.last(origin, category)
+        return last['digest'] if last else None
+
+    def update(self, origin, category, items, digest):
+        """
+        Record the items fetched by a run.
+
+        :param origin: the origin of the items, e.g. 'owner/repository'
+        :param category: the category of the items, e.g. 'commit'
+        :param items: iterable of items fetched by Perceval during the run
+        :param digest: the digest of all the items seen so far
+        """
+
+        last = self.last(origin, category)
+        for item in items:
+            if last is None or item['updated_on'] >= last['updated_on']:
+                last = {'updated_on': item['updated_on'], 'uuid': item['uuid']}
+
+        if last is None:
+            return
+
+        last = dict(last, digest=digest)
+        self.origins.setdefault(origin, {})[category] = last
+
+    def save(self):
+        """
+        Write the state to its JSON file.
+        """
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as state_file:
+            json.dump(self.origins, state_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+        logger.debug("Incremental state saved to %s" % self.path)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from implementations.code_df.issue_github import IssueGitHub
+from implementations.code_df.utils import read_json_file
+
+
+class IssueBacklogGitHub(IssueGitHub):
+    """
+    Class for the Open Issue Backlog: the number of issues open,
+    and their mean age, at the end of every period.
+
+    Issues are open from their creation until they are closed, and
+    again from every time they are reopened until they are closed.
+    All these changes are sorted by date once, and the number of open
+    issues, as well as the sum of their creation dates, are computed
+    for all of them with cumulative sums. The backlog at any date is
+    then read with a binary search, instead of replaying the events
+    of every issue for every period.
+
+    Dates are truncated to the day: an issue opened or closed on a
+    day is counted as such for the whole day.
+
+    :param items: A list of dictionaries.
+        Each item is a Perceval dictionary, obtained from a JSON
+        file or from Perceval directly.
+
+    :param date_range: A tuple which represents the period of interest,
+        as for IssueGitHub. Only issues created in it are considered.
+
+    :param as_of: A datetime object, the time at which the backlog
+        is computed. Events after its day are ignored. By default, the
+        time at which the object is created.
+    """
+
+    def __init__(self, items, date_range=(None, None), as_of=None):
+
+        self.as_of = as_of if as_of is not None else datetime.now()
+        self._timeline_df = None
+        super().__init__(items, date_range)
+
+    def _timeline(self):
+        """
+        Sweep the openings and closings of issues in date order.
+
+        The timeline is built once for self.df, and must not be modified.
+
+        :returns: a tuple of three numpy arrays: the dates of the
+            openings and closings not after `as_of`, sorted, and, before
+            the first one and after each of them, the number of open
+            issues and the sum of their creation dates, in days since
+            the epoch.
+        """
+
+        if self._timeline_df is not self.df:
+            df = self.df
+            if df.empty:
+                created = np.array([], dtype='datetime64[ns]')
+                ids = pd.Index([], dtype='int64')
+            else:
+                created = df['created_date'].values
+                ids = pd.Index(df[self.id_column])
+
+            events = self.events[self.events['event'].isin(['closed', 'reopened'])]
+            rows = ids.get_indexer(events[self.id_column])
+            events = events[rows >= 0]
+            rows = rows[rows >= 0]
+
+            # an issue is opened when created, and every time it is reopened
+            dates = np.concatenate([created, events['created_at'].dt.normalize().values])
+            deltas = np.concatenate([np.ones(len(created), dtype='int64'),
+                                     np.where(events['event'] == 'closed', -1, 1)])
+            created_days = np.concatenate([created, created[rows]]) \
+                .astype('datetime64[D]').astype('int64')
+
+            as_of = np.datetime64(self.as_of, 'ns')
+            kept = dates <= as_of
+            dates, deltas, created_days = dates[kept], deltas[kept], created_days[kept]
+
+            order = np.argsort(dates, kind='mergesort')
+            deltas, created_days = deltas[order], created_days[order]
+            self._timeline_arrays = (dates[order],
+                                     np.concatenate([[0], np.cumsum(deltas)]),
+                                     np.concatenate([[0], np.cumsum(deltas * created_days)]))
+            self._timeline_df = df
+
+        return self._timeline_arrays
+
+    def backlog(self, dates):
+        """
+        Compute the backlog at the end of the day of some dates.
+
+        :param dates: a sequence of datetime-like values. Issues are
+            counted at the end of their day, and their age is measured,
+            in whole days as for OpenIssueAgeGitHub, at the date itself,
+            or at `as_of` if it is earlier.
+
+        :returns df: A DataFrame indexed by dates, with the number of
+            open issues, 'open_issues', and their mean age in days,
+            'mean_age' (NaN if there is none).
+        """
+
+        times, open_issues, created_days = self._timeline()
+
+        dates = pd.DatetimeIndex(dates)
+        positions = np.searchsorted(times, dates.normalize().values, side='right')
+        count = open_issues[positions]
+        total = created_days[positions]
+
+        measured = np.minimum(dates.values, np.datetime64(self.as_of, 'ns'))
+        measured_days = measured.astype('datetime64[D]').astype('int64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_age = np.where(count > 0, measured_days - total / count, np.nan)
+
+        return pd.DataFrame({'open_issues': count, 'mean_age': mean_age}, index=dates)
+
+    def compute(self):
+        """
+        Compute the number of issues open at `as_of`.
+
+        :returns open_issues: the number of open issues
+        """
+
+        return int(self.backlog([self.as_of])['open_issues'].iloc[0])
+
+    def _agg(self, df, period):
+        """
+        Compute the backlog at the end of every interval of the
+        period specified in the time_series method, like 'M', 'W', etc.,
+        from the creation of the first issue to `as_of`.
+
+        :param df: a pandas DataFrame, indexed by creation date, whose
+            first issue starts the time series.
+
+        :param period: A string which can be any one of the pandas time
+            series rules:
+            'W': week
+            'M': month
+            'D': day
+
+        :returns df: A DataFrame with the number of open issues,
+            'open_issues', and their mean age, 'mean_age', at the
+            end of every interval, labelled as by resample.
+        """
+
+        if df.empty or df.index[0] > self.as_of:
+            return pd.DataFrame({'open_issues': [], 'mean_age': []},
+                                index=pd.DatetimeIndex([], name='created_date'))
+
+        periods = pd.period_range(df.index[0], self.as_of, freq=period)
+        ends = periods.to_timestamp(how='end').normalize()
+
+        backlog = self.backlog(ends)
+        backlog.index.name = 'created_date'
+        return backlog
+
+    def _get_params(self):
+        """
+        Return parameters for creating a timeseries plot
+
+        :returns: A dictionary with axes to plot, a title
+            and if use_index should be true when creating
+            the plot.
+        """
+
+        title = "Trends in Open Issue Backlog"
+        x = None
+        y = 'open_issues'
+        use_index = True
+        return {'x': x, 'y': y, 'title': title, 'use_index': use_index}
+
+    def __str__(self):
+        return "Open Issue Backlog"
+
+
+if __name__ == "__main__":
+    items = read_json_file('../issues_events.json')
+
+    # the GitHub API considers all pull requests to be issues. Any
+    # pull request represented as an issue has a 'pull_request'
+    # attribute, which is used to filter them out from the issue
+    # data.
+
+    items = [item for item in items if 'pull_request' not in item['data']]
+
+    backlog = IssueBacklogGitHub(items)
+    print("The number of issues open now is {}"
+          .format(backlog.compute()))
+
+    # number and mean age of open issues at the end of every month
+    print("The open issue backlog at the end of every month: ")
+    print(backlog.time_series('M'))
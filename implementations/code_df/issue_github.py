@@ -19,13 +19,21 @@
 #     Aniruddha Karajgi <akarajgi0@gmail.com>
 #
 
+import pandas as pd
+
 from implementations.code_df.metric import Metric
-from implementations.code_df.utils import str_to_date
+from implementations.code_df.utils import github_str_to_date, GITHUB_DATE_FORMAT
 
 
 class IssueGitHub(Metric):
     """
-    Initializes self.df, the DataFrame, with one issue per row.
+    Initializes self.df, the DataFrame, with one issue per row,
+    and self.events, the DataFrame with one row per event of each
+    issue, linked to self.df by the integer 'issue_id' column.
+
+    The events are sorted by 'issue_id', keeping the order in which
+    GitHub lists the events of an issue, so that the events of an
+    issue are contiguous.
 
     :param items: A list of dictionaries.
         Each item is a Perceval dictionary, obtained from a JSON
@@ -43,13 +51,64 @@ class IssueGitHub(Metric):
         it is treated as a new issue.
     """
 
+    tables = ('events',)
+    id_column = 'issue_id'
+    categorical_columns = ('event', 'actor')
+
     def __init__(self, items, date_range=(None, None), reopen_as_new=False):
 
         self.since, self.until = date_range
+        self.reopen_as_new = reopen_as_new
         super().__init__(items)
 
         if reopen_as_new is True:
-            self.df = self._update_with_reopened_items(self.df)
+            self.df = self._update_with_reopened_items(self.df, self.events)
+
+    def _table(self, name, ids, lists):
+        """
+        Build the DataFrame of the events of some issues
+
+        :param name: 'events'
+        :param ids: the ids of the issues
+        :param lists: the 'events_data' lists of the issues
+
+        :returns: a DataFrame with the 'issue_id', 'event', 'actor'
+            and 'created_at' (a datetime, not truncated) columns
+        """
+
+        rows = [(issue_id, event['event'], (event.get('actor') or {}).get('login'),
+                 event.get('created_at'))
+                for issue_id, events in zip(ids, lists) for event in events]
+        events = pd.DataFrame(rows, columns=[self.id_column, 'event', 'actor', 'created_at'])
+
+        events[self.id_column] = events[self.id_column].astype('int64')
+        events['created_at'] = pd.to_datetime(events['created_at'], format=GITHUB_DATE_FORMAT)
+
+        return events
+
+    def _stream(self, items):
+        """
+        Flatten issues one at a time, for the accumulate method.
+
+        :param items: iterable of issues fetched by Perceval
+        :returns: a generator of flat dictionaries
+
+        :raises ValueError: if reopened issues are considered as new
+        """
+
+        if self.reopen_as_new is True:
+            raise ValueError("Reopened issues cannot be accumulated as new issues")
+
+        return super()._stream(items)
+
+    def _flat_key(self):
+        """
+        Describe how _flat_frame builds the DataFrame of issues
+
+        :returns: a hashable tuple
+        """
+
+        return super()._flat_key() + (self.since, self.until)
 
     def _flatten(self, item):
         """
@@ -64,7 +123,7 @@ class IssueGitHub(Metric):
         :returns:   list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['created_at'])
+        creation_date = github_str_to_date(item['data']['created_at'])
         if self.since and (self.since > creation_date):
             return []
 
@@ -78,70 +137,92 @@ class IssueGitHub(Metric):
             'author': item['data']['user']['login'],
             'created_date': creation_date,
             'current_status': item['data']['state'],
-            'events_data': item['data']['events_data']
+            'events': item['data']['events_data']
         }
 
         return [flat]
 
-    def _update_with_reopened_items(self, df):
+    def _update_with_reopened_items(self, df, events):
         """
         Add reopened items as new items to the data frame df.
 
         The original item to be replaced is removed, while its constituent
         items (created from a reopen-close cycle) are appending to the dataframe.
 
+        For every item with closed or reopened events, the first
+        constituent item is created at the creation date of the item,
+        as closed; then every reopened event at an odd position among
+        these events creates another one, closed as well unless it is
+        the last event, in which case it is still open.
+
         :param df: A pandas DataFrame, containing items obtained from Perceval.
+        :param events: A pandas DataFrame, the events of the items of df.
 
         :returns df: A modified pandas DataFrame.
         """
 
-        reopened_items = []
-        new_items = []
-        for index, item in df.iterrows():
-
-            events = [event for event in item['events_data'] if event['event'] == 'closed'
-                      or event['event'] == 'reopened']
-
-            if events:
-
-                # the first closing event gives us our first item
-                new_item = self._add_item(item, item['created_date'], 'closed')
-                new_items.append(new_item)
-
-                # for every reopen-close pair, create another event
-                for i in range(1, len(events), 2):
-                    if events[i]['event'] == 'reopened':
-                        if i == len(events) - 1:
-                            new_item = self._add_item(item, str_to_date(events[i]['created_at']), 'open')
-                        else:
-                            new_item = self._add_item(item, str_to_date(events[i]['created_at']), 'closed')
-                        # print(new_item['created_date'])
-                        new_items.append(new_item)
-                reopened_items.append(index)
+        if df.empty:
+            return df
+
+        events = self._closing_events(df, events)
+        if events.empty:
+            return df
+
+        events['cycle'] = events.groupby('row').cumcount()
+        last_cycle = events.groupby('row')['cycle'].transform('max')
+
+        # the first closing event gives us our first item
+        first = events[events['cycle'] == 0]
+        first_items = pd.DataFrame({
+            'row': first['row'],
+            'cycle': first['cycle'],
+            'created_date': df['created_date'].values[first['row']],
+            'current_status': 'closed'
+        })
+
+        # for every reopen-close pair, create another item
+        reopened = events[(events['cycle'] % 2 == 1) & (events['event'] == 'reopened')]
+        reopened_items = pd.DataFrame({
+            'row': reopened['row'],
+            'cycle': reopened['cycle'],
+            'created_date': reopened['created_at'].dt.normalize(),
+            'current_status': (reopened['cycle'] == last_cycle[reopened.index])
+            .map({True: 'open', False: 'closed'})
+        })
+
+        new_items = pd.concat([first_items, reopened_items], ignore_index=True)
+        new_items = new_items.sort_values(['row', 'cycle'], kind='mergesort')
+
+        items = df.iloc[new_items['row']]
+        items = items.assign(created_date=new_items['created_date'].values,
+                             current_status=new_items['current_status'].values)
 
         # remove the items that we split into constituent items
-        df = df.drop(reopened_items)
+        df = df.drop(df.index[first['row']])
 
-        df = df.append(new_items, ignore_index=True)
-        return df
+        return pd.concat([df, items], ignore_index=True)
 
-    def _add_item(self, item, created_date, current_status):
+    def _closing_events(self, df, events):
         """
-        Create a copy of an item with slight modifications to status and
-        creation date.
+        Select the closed and reopened events of the items of df.
 
-        :param item: A pandas Series object, a single unit of Perceval data.
+        :param df: A pandas DataFrame, containing items obtained from Perceval.
+        :param events: A pandas DataFrame, the events of the items of df.
 
-        :param created_date: A datetime object representing when the item to be
-            added was created.
+        :returns events: A pandas DataFrame with the closed and reopened
+            events, in the order of the items and of their events, with
+            the position of its item in df ('row'), its type ('event'),
+            and its date ('created_at')
+        """
 
-        :param current status: A string representing the current state of the item
-            to be added. Either "open" or "closed"
+        events = events[events['event'].isin(['closed', 'reopened'])]
+        rows = pd.Index(df[self.id_column]).get_indexer(events[self.id_column])
 
-        :returns new_item: A pandas Series object, a constituent of item.
-        """
+        events = pd.DataFrame({
+            'row': rows,
+            'event': events['event'].astype(str).values,
+            'created_at': events['created_at'].values
+        })
+        events = events[events['row'] >= 0]
 
-        new_item = item.copy(deep=True)
-        new_item['created_date'] = created_date
-        new_item['current_status'] = current_status
-        return new_item
+        return events.sort_values('row', kind='mergesort').reset_index(drop=True)
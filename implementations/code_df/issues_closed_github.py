@@ -21,6 +21,7 @@
 
 from datetime import datetime
 
+from implementations.code_df.accumulators import Count
 from implementations.code_df.issue_github import IssueGitHub
 from implementations.code_df.utils import read_json_file
 
@@ -42,6 +43,15 @@ class IssuesClosedGitHub(IssueGitHub):
         closed_issues = len(self.df[self.df['current_status'] == 'closed'])
         return closed_issues
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'count': Count(where=lambda flat: flat['current_status'] == 'closed')}
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to find
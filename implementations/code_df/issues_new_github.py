@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from implementations.code_df.utils import read_json_file
+from implementations.code_df.accumulators import Count
 from implementations.code_df.issue_github import IssueGitHub
 
 
@@ -19,6 +20,15 @@ class IssuesNewGitHub(IssueGitHub):
         new_issues = len(self.df.index)
         return new_issues
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'count': Count()}
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to find
@@ -1,6 +1,11 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from implementations import profiling
+from implementations.code_df.accumulators import accumulate
+from implementations.code_df.frame_store import FrameStore
+from implementations.code_df.utils import chunks
+
 
 class Metric:
     """
@@ -9,17 +14,303 @@ class Metric:
     All classes computing metrics based on data frames
     will be descendants of this class.
 
-    :param items: A list of dictionaries.
+    :param items: An iterable of dictionaries, such as a list or
+        the generator returned by utils.iter_items.
         Each element is a Perceval dictionary, obtained from a JSON
         file produced by Perceval, or directly from Perceval.
+        It can also be a FrameStore, shared with other metrics.
+
+    Items are consumed lazily and flattened in chunks of `chunk_size`
+    rows, each of them turned into a DataFrame before the next one is
+    read, so that the raw items never need to be in memory at once.
+
+    Lists of dictionaries nested in the flat dictionaries, such as the
+    files of a commit, are not kept in `df`: each key of `tables` is
+    moved to a DataFrame of its own, with a row per element of the
+    lists, set as the attribute of the metric with the same name.
+    Its rows are linked to the ones of `df` by the integer `id_column`.
+
+    Time series are computed from a view of `df` indexed and sorted by
+    creation date, built once, and memoized per period. Assigning `df`
+    discards both, so they are never out of date.
+
+    Metrics declaring accumulators (see _accumulators) can also be
+    computed without a DataFrame, in a single pass over the items,
+    with the accumulate method.
     """
 
+    chunk_size = 10000
+
+    # Keys of the flat dictionaries moved to tables of their own
+    tables = ()
+    # Column of df, and of the tables, identifying the rows of df
+    id_column = None
+    # Columns of the tables stored as categoricals
+    categorical_columns = ()
+
     def __init__(self, items):
 
-        flat_items = []
+        if isinstance(items, FrameStore):
+            frames = items.frame(self)
+        else:
+            frames = self._frame(items)
+
+        for name, frame in frames.items():
+            setattr(self, name, frame)
+
+    @property
+    def df(self):
+        """
+        The DataFrame of the metric, with a row per flat dictionary
+        """
+
+        return self._df
+
+    @df.setter
+    def df(self, df):
+
+        self._df = df
+        self._dated_df = None
+        self._series = {}
+
+    def _frame(self, items):
+        """
+        Build the DataFrames of the metric from Perceval items
+
+        :param items: iterable of items fetched by Perceval
+        :returns: a dictionary of DataFrames: 'df', with a row per flat
+            dictionary, and one per name in `tables`
+        """
+
+        return self._finish(self._flat_frame(items))
+
+    def _flat_frame(self, items):
+        """
+        Build a DataFrame with a row per flat dictionary, and the tables
+
+        :param items: iterable of items fetched by Perceval
+        :returns: a dictionary of DataFrames, as returned by _frame
+        """
+
+        with profiling.stage('flatten', metric=type(self).__name__) as record:
+            if hasattr(items, '__len__'):
+                record['items_in'] = len(items)
+
+            frames = {name: [] for name in ('df',) + self.tables}
+            next_id = 0
+            for chunk in chunks(self._flat_items(items), self.chunk_size):
+                ids = range(next_id, next_id + len(chunk))
+                next_id += len(chunk)
+
+                for name in self.tables:
+                    lists = [flat.pop(name) for flat in chunk]
+                    frames[name].append(self._table(name, ids, lists))
+
+                df = pd.DataFrame(chunk)
+                if self.tables:
+                    df[self.id_column] = ids
+                frames['df'].append(df)
+
+            for name, chunk_frames in frames.items():
+                if chunk_frames:
+                    frames[name] = pd.concat(chunk_frames, ignore_index=True)
+                elif name == 'df':
+                    frames[name] = pd.DataFrame()
+                else:
+                    frames[name] = self._table(name, [], [])
+
+            for name in self.tables:
+                for column in self.categorical_columns:
+                    frames[name][column] = frames[name][column].astype('category')
+
+            record['items_out'] = len(frames['df'])
+
+        return frames
+
+    def _table(self, name, ids, lists):
+        """
+        Build the DataFrame of a table from the lists of some rows of df
+
+        Descendant classes override it to keep only the columns they
+        need, with the right types.
+
+        :param name: a name in `tables`
+        :param ids: the values of `id_column` of the rows of df
+        :param lists: the lists of dictionaries of these rows
+
+        :returns: a DataFrame with a row per dictionary
+        """
+
+        rows = [dict(element, **{self.id_column: id_})
+                for id_, elements in zip(ids, lists) for element in elements]
+        return pd.DataFrame(rows)
+
+    def _finish(self, frames):
+        """
+        Complete the DataFrames of flat dictionaries into the DataFrames
+        of the metric, once all the items are known.
+
+        Descendant classes override it for steps which depend on all
+        the rows at once, such as filtering commits with conditions.
+
+        :param frames: a dictionary of DataFrames built by _flat_frame
+        :returns: a dictionary of DataFrames
+        """
+
+        return frames
+
+    def _merge(self, frames, new_frames):
+        """
+        Merge the DataFrames built by _flat_frame from two sets of items
+
+        Rows of df are replaced by the rows of the new df with the same
+        'hash', e.g. when an issue was updated since df was built, and
+        so are their rows in the tables. The ids of the new rows are
+        shifted after the ones of df.
+
+        :param frames: a dictionary of DataFrames built by _flat_frame
+        :param new_frames: a dictionary of DataFrames built by
+            _flat_frame from newer items
+
+        :returns: a dictionary of DataFrames
+        """
+
+        df, new_df = frames['df'], new_frames['df']
+        if new_df.empty:
+            return frames
+        if df.empty:
+            return new_frames
+
+        replaced = df['hash'].isin(new_df['hash'])
+        merged = {'df': df[~replaced]}
+        if self.tables:
+            shift = df[self.id_column].max() + 1
+            new_df = new_df.assign(**{self.id_column: new_df[self.id_column] + shift})
+            replaced_ids = df[self.id_column][replaced]
+
+            for name in self.tables:
+                table, new_table = frames[name], new_frames[name]
+                table = table[~table[self.id_column].isin(replaced_ids)]
+                new_table = new_table.assign(**{self.id_column: new_table[self.id_column] + shift})
+                merged[name] = self._concat_table(table, new_table)
+
+        merged['df'] = pd.concat([merged['df'], new_df], ignore_index=True)
+        return merged
+
+    def _concat_table(self, table, new_table):
+        """
+        Concatenate two DataFrames of a table, keeping categoricals.
+
+        :param table: a DataFrame of a table
+        :param new_table: another DataFrame of the same table
+
+        :returns: a DataFrame
+        """
+
+        table = pd.concat([table, new_table], ignore_index=True)
+        for column in self.categorical_columns:
+            table[column] = table[column].astype('category')
+
+        return table
+
+    def _flat_key(self):
+        """
+        Describe how _flat_frame builds the DataFrame of flat dictionaries
+
+        Descendant classes extend the key with the parameters their
+        _flatten method depends on.
+
+        :returns: a hashable tuple
+        """
+
+        return (type(self)._flatten,)
+
+    def _frame_key(self):
+        """
+        Describe how _frame builds the DataFrame of the metric
+
+        Metrics with equal keys build equal DataFrames from the same
+        items, and thus share them when created from a FrameStore.
+        Descendant classes extend the key with the parameters their
+        _finish method depends on.
+
+        :returns: a hashable tuple
+        """
+
+        return self._flat_key()
+
+    def _flat_items(self, items):
+        """
+        Flatten items one at a time.
+
+        :param items: iterable of items to flatten
+        :returns: a generator of flat dictionaries
+        """
+
         for item in items:
-            flat_items.extend(self._flatten(item))
-        self.df = pd.DataFrame(flat_items)
+            for flat in self._flatten(item):
+                yield flat
+
+    def accumulate(self, items, period='M'):
+        """
+        Compute the metric, and its time series, in a single pass over
+        items, with the accumulators of the metric instead of a DataFrame.
+
+        The parameters of the metric are the ones it was created with,
+        so it can be created from no items, e.g. CodeChangesGit([]).
+
+        :param items: iterable of items fetched by Perceval
+        :param period: A string which can be any one of the pandas time
+            series rules:
+                'W': week
+                'M': month
+                'D': day
+
+        :returns: a tuple with the value of the metric, as returned by
+            compute, and a DataFrame with its time series, as returned
+            by time_series (see accumulators.accumulate)
+        """
+
+        return accumulate(self._accumulators(), self._stream(items), period,
+                          self._total_accumulator())
+
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, one flat dictionary at
+        a time, by the accumulate method.
+
+        This method will be overridden by descendant classes. The names
+        of the accumulators are the columns of the DataFrame returned
+        by _agg, in the same order.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        raise NotImplementedError("%s cannot be accumulated" % type(self).__name__)
+
+    def _total_accumulator(self):
+        """
+        Declare how the value returned by compute is accumulated, when
+        it is not accumulated as the first column of the time series.
+
+        :returns: an Accumulator object, or None
+        """
+
+        return None
+
+    def _stream(self, items):
+        """
+        Flatten items one at a time, keeping the flat dictionaries
+        which would be rows of df, for the accumulate method.
+
+        Descendant classes override it to apply the filters they apply
+        to df as a whole, or to refuse to stream if they cannot.
+
+        :param items: iterable of items
+        :returns: a generator of flat dictionaries
+        """
+
+        return self._flat_items(items)
 
     def _flatten(self, item):
         """
@@ -58,15 +349,38 @@ class Metric:
                 'D': day
 
         :returns df: A DataFrame whose rows each represent an interval
-            of "period" and the count for that interval
+            of "period" and the count for that interval.
+            The result is memoized per period, and must not be modified.
+        """
+
+        if period not in self._series:
+            self._series[period] = self._agg(self._dated(), period)
+
+        return self._series[period]
+
+    def _dated(self):
         """
+        Return a view of the DataFrame indexed and sorted by the
+        'created_date' column.
+
+        The view is built once, with a single copy of the DataFrame,
+        and must not be modified.
+
+        :returns: a DataFrame
+        """
+
+        if self._dated_df is None:
+            df = self.df
+            columns = [column for column in df.columns if column != 'created_date']
 
-        df = self.df.copy(deep=True)
+            dated_df = df[columns]
+            dated_df.index = pd.Index(df['created_date'])
+            if not dated_df.index.is_monotonic_increasing:
+                dated_df = dated_df.sort_index(kind='mergesort')
 
-        df = df.set_index('created_date')
-        df = self._agg(df, period)
+            self._dated_df = dated_df
 
-        return df
+        return self._dated_df
 
     def plot_time_series(self, period='M', style='seaborn'):
         """
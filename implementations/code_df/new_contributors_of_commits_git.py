@@ -25,7 +25,8 @@ from implementations.code_df.commit_git import CommitGit
 from implementations.code_df.conditions import (Naive,
                                                 DirExclude,
                                                 PostfixExclude)
-from implementations.code_df.utils import str_to_date, read_json_file
+from implementations.code_df.frame_cache import describe
+from implementations.code_df.utils import commit_str_to_date, read_json_file
 
 
 class NewContributorsOfCommitsGit(CommitGit):
@@ -51,24 +52,63 @@ class NewContributorsOfCommitsGit(CommitGit):
     :param conds: list of Commit sub-class objects.
         Used to add restrictions on which commits are
         included in the analysis.
+
+    :param registry: A ContributorRegistry, or None.
+        If given, items only need to be the commits made since the
+        registry was last updated: the registry is updated with them,
+        and the first commits of authors are taken from it. Only
+        the columns of the registry are then kept in self.df.
+        The registry must be saved by the caller.
+
+    :param identities: An IdentityIndex, or None.
+        If given, authors are identified by the integer id of their
+        identity, in the 'author_id' column, rather than by their
+        'author' string, so that the names and emails of a person
+        count as a single contributor.
         """
 
     def __init__(self, items, date_range=(None, None),
-                 is_code=[Naive()], conds=[]):
+                 is_code=[Naive()], conds=[], registry=None, identities=None):
 
         super().__init__(items, date_range, is_code, conds)
 
-        self.df = self.df.loc[self.df.groupby('author')['created_date']
-                              .idxmin()]
-
         since, until = date_range
 
+        by = 'author'
+        if identities is not None:
+            by = 'author_id'
+            if not self.df.empty:
+                self.df = self.df.assign(author_id=identities.ids(self.df['author']))
+
+        if registry is not None:
+            key = self._registry_key()
+            if identities is not None:
+                key += (identities.rules,)
+            registry.check_key(describe(key))
+            registry.update(self.df, by)
+            self.df = registry.first_contributions(since, until)
+            return
+
+        self.df = self.df.loc[self.df.groupby(by)['created_date']
+                              .idxmin()]
+
         if since:
             self.df = self.df[self.df['created_date'] >= since]
 
         if until:
             self.df = self.df[self.df['created_date'] <= until]
 
+    def _registry_key(self):
+        """
+        Describe how the commits of authors are selected, which a
+        registry of their first commits depends on. Unlike the frame
+        key, it does not depend on date_range, as _flatten ignores it.
+
+        :returns: a hashable tuple
+        """
+
+        return (type(self)._flatten, tuple(self.is_code), tuple(self.conds))
+
     def _flatten(self, item):
         """
         Flatten a raw commit fetched by Perceval into a flat dictionary.
@@ -84,19 +124,16 @@ class NewContributorsOfCommitsGit(CommitGit):
         meaning. For this metric, date_range signifies the dates between which
         we look for new contributors when compared to all contributors,
         while the general use of date_range is to decide which commits to consider
-        for analysis.
+        for analysis. As for CommitGit._flatten, commits touching no
+        source code file are left out later on, by _flat_frame.
 
         :param item: raw item fetched by Perceval (dictionary)
         :returns:    list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['AuthorDate'])
-
-        code_files = [file['file'] for file in item['data']['files'] if
-                      all(condition.check(file['file'])
-                          for condition in self.is_code)]
+        creation_date = commit_str_to_date(item['data']['AuthorDate'])
 
-        if len(code_files) > 0:
+        if len(item['data']['files']) > 0:
             flat = {
                 'repo': item['origin'],
                 'hash': item['data']['commit'],
@@ -104,7 +141,7 @@ class NewContributorsOfCommitsGit(CommitGit):
                 'category': "commit",
                 'created_date': creation_date,
                 'committer': item['data']['Commit'],
-                'commit_date': str_to_date(item['data']['CommitDate']),
+                'commit_date': commit_str_to_date(item['data']['CommitDate']),
                 'files_no': len(item['data']['files']),
                 'refs': item['data']['refs'],
                 'parents': item['data']['parents'],
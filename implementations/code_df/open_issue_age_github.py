@@ -1,14 +1,42 @@
 from datetime import datetime
 
+from implementations.code_df.accumulators import Mean
 from implementations.code_df.issue_github import IssueGitHub
-from implementations.code_df.utils import str_to_date, read_json_file
+from implementations.code_df.utils import github_str_to_date, read_json_file
 
 
 class OpenIssueAgeGitHub(IssueGitHub):
     """
     Class for the Open Issue Age metric.
+
+    :param items: A list of dictionaries.
+        Each item is a Perceval dictionary, obtained from a JSON
+        file or from Perceval directly.
+
+    :param date_range: A tuple which represents the period of interest,
+        as for IssueGitHub.
+
+    :param reopen_as_new: as for IssueGitHub.
+
+    :param as_of: A datetime object, the time at which the age of
+        open issues is measured. By default, the time at which the
+        object is created, so that all the issues are measured at
+        the same time.
     """
 
+    # The age of open issues does not depend on their events
+    tables = ()
+
+    def __init__(self, items, date_range=(None, None), reopen_as_new=False, as_of=None):
+
+        self.as_of = as_of if as_of is not None else datetime.now()
+        super().__init__(items, date_range, reopen_as_new)
+
+        # The age is computed from the DataFrame of open issues, which is
+        # cached and shared, so that it does not depend on the current time
+        if not self.df.empty:
+            self.df = self.df.assign(open_issue_age=(self.as_of - self.df['created_date']).dt.days)
+
     def _flatten(self, item):
         """
         Flatten a raw issue fetched by Perceval into a flat dictionary.
@@ -22,7 +50,7 @@ class OpenIssueAgeGitHub(IssueGitHub):
         :returns:   list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['created_at'])
+        creation_date = github_str_to_date(item['data']['created_at'])
         if self.since and (self.since > creation_date):
             return []
 
@@ -41,8 +69,6 @@ class OpenIssueAgeGitHub(IssueGitHub):
         if flat['current_status'] != 'open':
             return []
 
-        flat['open_issue_age'] = (datetime.now() - flat['created_date']).days
-
         return [flat]
 
     def compute(self):
@@ -56,6 +82,15 @@ class OpenIssueAgeGitHub(IssueGitHub):
         avg_open_issue_age = self.df['open_issue_age'].mean()
         return avg_open_issue_age
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'mean': Mean(lambda flat: (self.as_of - flat['created_date']).days)}
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to find
@@ -20,7 +20,7 @@
 #
 
 from implementations.code_df.metric import Metric
-from implementations.code_df.utils import str_to_date
+from implementations.code_df.utils import github_str_to_date
 
 
 class PullRequestGitHub(Metric):
@@ -44,6 +44,15 @@ class PullRequestGitHub(Metric):
         self.since, self.until = date_range
         super().__init__(items)
 
+    def _flat_key(self):
+        """
+        Describe how _flat_frame builds the DataFrame of pull requests
+
+        :returns: a hashable tuple
+        """
+
+        return super()._flat_key() + (self.since, self.until)
+
     def _flatten(self, item):
         """
         Flatten a raw pull_request fetched by Perceval into a flat dictionary.
@@ -57,7 +66,7 @@ class PullRequestGitHub(Metric):
         :returns:   list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['created_at'])
+        creation_date = github_str_to_date(item['data']['created_at'])
         if self.since and (self.since > creation_date):
             return []
 
@@ -71,7 +80,11 @@ class PullRequestGitHub(Metric):
             'author': item['data']['user']['login'],
             'created_date': creation_date,
             'current_status': item['data']['state'],
-            'merged': item['data']['merged']
+            'merged': item['data']['merged'],
+            'merged_date': None
         }
 
+        if item['data']['merged_at']:
+            flat['merged_date'] = github_str_to_date(item['data']['merged_at'])
+
         return [flat]
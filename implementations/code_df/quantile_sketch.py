@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Mergeable sketches of the quantiles of a stream of values.
+
+Values are counted in buckets whose bounds grow geometrically, as in
+DDSketch: a value x > 0 falls in the bucket i such that
+gamma ** (i - 1) < x <= gamma ** i, with gamma = (1 + a) / (1 - a).
+Any quantile is then known with a relative error of at most a, with
+a number of buckets which only grows with the logarithm of the range
+of the values. Sketches with the same accuracy are merged by adding
+their counts, so sketches of parts of the values, such as the pull
+requests of several repositories, give the quantiles of all of them.
+"""
+
+import math
+
+import numpy as np
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+# Values whose magnitude is below this are counted as zeros
+MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Sketch of the quantiles of a set of numbers.
+
+    Positive and negative values are counted in buckets of their
+    magnitude, and values close to zero on their own. When there are
+    more than max_buckets buckets of either sign, the buckets of the
+    smallest magnitudes are collapsed, which only loses accuracy for
+    the lowest quantiles of that sign.
+
+    :param relative_accuracy: the relative error of quantiles, a
+        number between 0 and 1
+    :param max_buckets: the maximum number of buckets of each sign
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets=DEFAULT_MAX_BUCKETS):
+
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1, not %s"
+                             % relative_accuracy)
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+
+        self.count = 0
+        self.zero_count = 0
+        # bucket index -> count, for positive and negative values
+        self.positive = {}
+        self.negative = {}
+
+    def __len__(self):
+
+        return self.count
+
+    def _add_counts(self, store, indexes, counts):
+        """
+        Add counts to buckets, collapsing the lowest ones if needed.
+
+        :param store: self.positive or self.negative
+        :param indexes: an iterable of bucket indexes
+        :param counts: an iterable of counts, one per index
+        """
+
+        for index, count in zip(indexes, counts):
+            index = int(index)
+            store[index] = store.get(index, 0) + int(count)
+
+        if len(store) > self.max_buckets:
+            indexes = sorted(store)
+            collapsed = indexes[:len(indexes) - self.max_buckets + 1]
+            lowest = collapsed[-1]
+            store[lowest] = sum(store.pop(index) for index in collapsed[:-1]) + store[lowest]
+
+    def update(self, values):
+        """
+        Add values to the sketch.
+
+        :param values: an iterable of numbers, such as a numpy array
+            or a pandas Series; missing values are ignored
+
+        :returns: the sketch itself
+        """
+
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        magnitudes = np.abs(values)
+        zeros = magnitudes < MIN_VALUE
+        self.zero_count += int(zeros.sum())
+
+        for store, mask in ((self.positive, (values > 0) & ~zeros),
+                            (self.negative, (values < 0) & ~zeros)):
+            if mask.any():
+                indexes = np.ceil(np.log(magnitudes[mask]) / self.log_gamma)
+                indexes, counts = np.unique(indexes, return_counts=True)
+                self._add_counts(store, indexes, counts)
+
+        self.count += len(values)
+        return self
+
+    def add(self, value):
+        """
+        Add a value to the sketch.
+
+        :param value: a number
+
+        :returns: the sketch itself
+        """
+
+        return self.update([value])
+
+    def merge(self, other):
+        """
+        Add the values counted by another sketch to this one.
+
+        :param other: a QuantileSketch with the same relative accuracy
+
+        :returns: the sketch itself
+
+        :raises ValueError: if the accuracies of the sketches differ
+        """
+
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with relative accuracies %s and %s"
+                             % (self.relative_accuracy, other.relative_accuracy))
+
+        self._add_counts(self.positive, other.positive.keys(), other.positive.values())
+        self._add_counts(self.negative, other.negative.keys(), other.negative.values())
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _value(self, index):
+        """
+        Return the value representing a bucket of positive values:
+        the one with the same relative error to both of its bounds.
+
+        :param index: the index of the bucket
+
+        :returns: a float
+        """
+
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile of the values.
+
+        The estimate is within the relative accuracy of the value of
+        rank q * (count - 1), rounded down, among the sorted values:
+        unlike pandas, values are not interpolated, e.g. the median
+        of an even number of values is close to the lower middle one.
+
+        :param q: a number between 0 and 1, e.g. 0.5 for the median
+
+        :returns: a float, or NaN if the sketch is empty
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1, not %s" % q)
+
+        if self.count == 0:
+            return float('nan')
+
+        rank = q * (self.count - 1)
+
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+
+        return self._value(max(self.positive))
+
+    def quantiles(self, qs):
+        """
+        Estimate several quantiles of the values.
+
+        :param qs: an iterable of numbers between 0 and 1
+
+        :returns: a list of floats
+        """
+
+        return [self.quantile(q) for q in qs]
+
+    def to_dict(self):
+        """
+        Describe the sketch with a dictionary which can be stored as
+        JSON, e.g. to merge it later with the sketches of other runs.
+
+        :returns: a dictionary
+        """
+
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'positive': {str(index): count for index, count in self.positive.items()},
+            'negative': {str(index): count for index, count in self.negative.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, description):
+        """
+        Create a sketch from the dictionary returned by to_dict.
+
+        :param description: a dictionary
+
+        :returns: a QuantileSketch
+        """
+
+        sketch = cls(description['relative_accuracy'], description['max_buckets'])
+        sketch.count = description['count']
+        sketch.zero_count = description['zero_count']
+        sketch.positive = {int(index): count for index, count in description['positive'].items()}
+        sketch.negative = {int(index): count for index, count in description['negative'].items()}
+        return sketch
+
+
+def update_sketches(sketches, keys, values, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """
+    Add values to the sketches of their groups, e.g. of the day they
+    were observed, counting the values of all the groups at once.
+
+    :param sketches: a dictionary of QuantileSketch objects, by group
+        key, where sketches are created for the groups not in it yet
+    :param keys: an array of the keys of the groups of the values
+    :param values: an array of numbers, with the same length as keys;
+        missing values are ignored
+    :param relative_accuracy: the relative accuracy of the sketches
+
+    :returns: sketches
+    """
+
+    keys = np.asarray(keys)
+    values = np.asarray(values, dtype='float64')
+    present = ~np.isnan(values)
+    keys, values = keys[present], values[present]
+    if not len(values):
+        return sketches
+
+    groups, codes = np.unique(keys, return_inverse=True)
+    for group in groups:
+        if group not in sketches:
+            sketches[group] = QuantileSketch(relative_accuracy)
+    log_gamma = sketches[groups[0]].log_gamma
+
+    magnitudes = np.abs(values)
+    zeros = magnitudes < MIN_VALUE
+    signs = np.where(zeros, 0, np.sign(values)).astype('int64')
+    indexes = np.zeros(len(values), dtype='int64')
+    indexes[~zeros] = np.ceil(np.log(magnitudes[~zeros]) / log_gamma)
+
+    buckets, counts = np.unique(np.stack([codes, signs, indexes]), axis=1, return_counts=True)
+    updated = set()
+    for (code, sign, index), count in zip(buckets.T.tolist(), counts.tolist()):
+        sketch = sketches[groups[code]]
+        sketch.count += count
+        if sign == 0:
+            sketch.zero_count += count
+        else:
+            store = sketch.positive if sign > 0 else sketch.negative
+            store[index] = store.get(index, 0) + count
+            updated.add(code)
+
+    # collapse the lowest buckets of the sketches which grew too much
+    for code in updated:
+        sketch = sketches[groups[code]]
+        for store in (sketch.positive, sketch.negative):
+            sketch._add_counts(store, (), ())
+
+    return sketches
@@ -21,6 +21,7 @@
 
 from datetime import datetime
 
+from implementations.code_df.accumulators import Count, Distinct
 from implementations.code_df.pullrequest_github import PullRequestGitHub
 from implementations.code_df.utils import read_json_file
 
@@ -41,6 +42,25 @@ class ReviewsAcceptedGitHub(PullRequestGitHub):
         count = len(self.df['hash'][self.df['merged']].unique())
         return count
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'count': Count(where=lambda flat: flat['merged'])}
+
+    def _total_accumulator(self):
+        """
+        Declare how the value returned by compute is accumulated:
+        pull requests are counted once, even if found several times.
+
+        :returns: an Accumulator object
+        """
+
+        return Distinct('hash', where=lambda flat: flat['merged'])
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to find
@@ -21,6 +21,7 @@
 
 from datetime import datetime
 
+from implementations.code_df.accumulators import Count
 from implementations.code_df.pullrequest_github import PullRequestGitHub
 from implementations.code_df.utils import read_json_file
 
@@ -43,6 +44,15 @@ class ReviewsDeclinedGitHub(PullRequestGitHub):
                     & (self.df['current_status'] == 'closed')])
         return count
 
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        return {'count': Count(where=lambda flat: not flat['merged'] and flat['current_status'] == 'closed')}
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to find
@@ -19,54 +19,100 @@
 #     Aniruddha Karajgi <akarajgi0@gmail.com>
 #
 
+from collections import OrderedDict
 from datetime import datetime
 
+import pandas as pd
+
+from implementations.code_df.accumulators import Median, Quantile
+from implementations.code_df.frame_store import FrameStore
 from implementations.code_df.pullrequest_github import PullRequestGitHub
-from implementations.code_df.utils import (str_to_date,
-                                           read_json_file)
+from implementations.code_df.quantile_sketch import QuantileSketch, DEFAULT_RELATIVE_ACCURACY, update_sketches
+from implementations.code_df.utils import read_json_file
+
+
+# Quantiles of the durations reported in sketch mode
+SKETCH_QUANTILES = (('median', 0.5), ('p90', 0.9), ('p99', 0.99))
 
 
 class ReviewsDurationGitHub(PullRequestGitHub):
     """
     Class for Reviews Duration metric
+
+    Only merged pull requests are kept, with their duration in days,
+    from creation to merge, in the 'duration' column.
+
+    :param items: A list of dictionaries.
+        Each item is a Perceval dictionary, obtained from a JSON
+        file or from Perceval directly.
+
+    :param date_range: A tuple which represents the period of interest,
+        as for PullRequestGitHub.
+
+    :param sketch: If True, quantiles of durations are estimated with
+        QuantileSketch objects, within relative_accuracy, rather than
+        computed exactly. The sketches of the whole period, or of every
+        interval of a time series, can be merged with the ones of other
+        repositories, to get the quantiles of all of them. The time
+        series then has the p90 and p99 of durations besides their median.
+        Items are then streamed into a sketch per day, by batches of
+        sketch_buffer_size reviews, and df is left empty: memory does
+        not grow with the number of reviews.
+        When items is a FrameStore, the sketches are filled from the
+        DataFrame of the store, shared with other metrics.
+
+    :param relative_accuracy: The relative error of quantiles estimated
+        in sketch mode.
     """
 
-    def _flatten(self, item):
-        """
-        Flatten a raw pull_request fetched by Perceval into a flat dictionary.
+    sketch_buffer_size = 1024
 
-        A list with a single flat directory will be returned.
-        That dictionary will have the elements we need for computing metrics.
-        The list may be empty, if for some reason the pull_request should not
-        be considered.
+    def __init__(self, items, date_range=(None, None), sketch=False,
+                 relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
 
-        :param item: raw item fetched by Perceval (dictionary)
-        :returns:   list of a single flat dictionary
-        """
+        self.sketch_mode = sketch
+        self.relative_accuracy = relative_accuracy
+        streamed = sketch and not isinstance(items, FrameStore)
+        super().__init__([] if streamed else items, date_range)
+
+        # sketches of the durations of the reviews created every day
+        self.daily_sketches = {}
 
-        creation_date = str_to_date(item['data']['created_at'])
-        if self.since and (self.since > creation_date):
-            return []
+        if streamed:
+            dates, durations = [], []
+            for flat in self._stream(items):
+                if flat['merged']:
+                    dates.append(flat['created_date'])
+                    durations.append(duration(flat))
+                if len(dates) >= self.sketch_buffer_size:
+                    self._sketch_days(dates, durations)
+                    dates, durations = [], []
+            self._sketch_days(dates, durations)
 
-        if self.until and (self.until < creation_date):
-            return []
+            self.df = pd.DataFrame({'created_date': pd.to_datetime([]), 'duration': []})
+            return
 
-        flat = {
-            'repo': item['origin'],
-            'hash': item['data']['id'],
-            'category': "pull_request",
-            'author': item['data']['user']['login'],
-            'created_date': creation_date,
-            'current_status': item['data']['state'],
-            'merged': item['data']['merged']
-        }
-        if flat['merged'] is False:
-            return []
+        if self.df.empty:
+            return
 
-        flat['duration'] = (str_to_date(item['data']['merged_at'])
-                            - flat['created_date']).days
+        df = self.df[self.df['merged']].reset_index(drop=True)
+        merged_date = pd.to_datetime(df['merged_date'])
+        self.df = df.assign(duration=(merged_date - df['created_date']).dt.days)
 
-        return [flat]
+        if sketch:
+            self._sketch_days(self.df['created_date'], self.df['duration'].values)
+
+    def _sketch_days(self, dates, durations):
+        """
+        Add durations to the sketches of the days the reviews were created.
+
+        :param dates: an iterable of the creation dates of reviews
+        :param durations: an iterable of their durations, in days
+        """
+
+        if len(dates):
+            days = pd.DatetimeIndex(dates).normalize().values
+            update_sketches(self.daily_sketches, days, durations, self.relative_accuracy)
 
     def compute(self):
         """
@@ -76,9 +122,80 @@ class ReviewsDurationGitHub(PullRequestGitHub):
         :returns median_review_duration: The median duration of a review.
         """
 
+        if self.sketch_mode:
+            return self.sketch().quantile(0.5)
+
         median_review_duration = self.df['duration'].median()
         return median_review_duration
 
+    def sketch(self):
+        """
+        Sketch the quantiles of the durations of all reviews.
+
+        :returns: a QuantileSketch
+        """
+
+        sketch = QuantileSketch(self.relative_accuracy)
+        if not self.sketch_mode:
+            if not self.df.empty:
+                sketch.update(self.df['duration'].values)
+            return sketch
+
+        for daily_sketch in self.daily_sketches.values():
+            sketch.merge(daily_sketch)
+
+        return sketch
+
+    def sketches(self, period='M'):
+        """
+        Sketch the quantiles of the durations of the reviews created
+        in every interval of a period.
+
+        :param period: A string which can be any one of the pandas time
+            series rules:
+            'W': week
+            'M': month
+            'D': day
+
+        :returns: A pandas Series of QuantileSketch objects, indexed by
+            the intervals with reviews, labelled as by resample.
+        """
+
+        if not self.sketch_mode:
+            durations = self._dated()['duration']
+            sketches = {label: QuantileSketch(self.relative_accuracy).update(group.values)
+                        for label, group in durations.groupby(pd.Grouper(freq=period))
+                        if len(group)}
+            return pd.Series(sketches, dtype=object)
+
+        days = sorted(self.daily_sketches)
+        labels = pd.DatetimeIndex(days).to_period(period).end_time.normalize()
+
+        sketches = {}
+        for day, label in zip(days, labels):
+            if label not in sketches:
+                sketches[label] = QuantileSketch(self.relative_accuracy)
+            sketches[label].merge(self.daily_sketches[day])
+
+        return pd.Series(sketches, dtype=object)
+
+    def _accumulators(self):
+        """
+        Declare how the metric is accumulated, without a DataFrame.
+
+        In sketch mode, quantiles are estimated with sketches; otherwise
+        the median is exact, as computed by compute and time_series.
+
+        :returns: a dictionary of Accumulator objects, by name
+        """
+
+        if not self.sketch_mode:
+            return {'median': Median(duration, where=lambda flat: flat['merged'])}
+
+        return OrderedDict((name, Quantile(duration, q, where=lambda flat: flat['merged'],
+                                           relative_accuracy=self.relative_accuracy))
+                           for name, q in SKETCH_QUANTILES)
+
     def _agg(self, df, period):
         """
         Perform an aggregation operation on a DataFrame to median duration of
@@ -98,9 +215,17 @@ class ReviewsDurationGitHub(PullRequestGitHub):
             'D': day
 
         :returns df: The aggregated dataframe, where aggregations have
-            been performed on the "duration" column
+            been performed on the "duration" column. In sketch mode,
+            it has the estimated 'median', 'p90' and 'p99' columns.
         """
 
+        if self.sketch_mode:
+            sketches = self.sketches(period)
+            columns = {name: [sketch.quantile(q) for sketch in sketches]
+                       for name, q in SKETCH_QUANTILES}
+            return pd.DataFrame(columns, index=pd.DatetimeIndex(sketches.index, name=df.index.name),
+                                columns=[name for name, _ in SKETCH_QUANTILES])
+
         df = df.resample(period)['duration'].agg(['median'])
         df = df.dropna()
 
@@ -125,6 +250,18 @@ class ReviewsDurationGitHub(PullRequestGitHub):
         return "Reviews Duration"
 
 
+def duration(flat):
+    """
+    Compute the duration in days of a merged pull request.
+
+    :param flat: a flat dictionary, as produced by PullRequestGitHub._flatten
+
+    :returns: the number of days from creation to merge
+    """
+
+    return (flat['merged_date'] - flat['created_date']).days
+
+
 if __name__ == "__main__":
     date_since = datetime.strptime("2018-09-07", "%Y-%m-%d")
     items = read_json_file('../pull_requests.json')
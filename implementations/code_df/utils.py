@@ -20,13 +20,77 @@
 #
 
 import datetime
+import functools
 import json
 
 
+COMMIT_DATE_FORMAT = "%a %b %d %H:%M:%S %Y %z"
+GITHUB_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+# Number of raw date strings remembered by the parsers below.
+# AuthorDate and CommitDate are often equal, and issues and pull
+# requests share many timestamps, so parsed values are reused.
+DATE_CACHE_SIZE = 2 ** 16
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def commit_str_to_date(date):
+    """
+    Converts a Git date string to a datetime object, truncated to the day.
+
+    The date is read token by token instead of going through strptime:
+    the day is the one of the local time of the commit, as with
+    COMMIT_DATE_FORMAT, and the time and the offset are dropped.
+
+    :param date: a date string of COMMIT_DATE_FORMAT,
+        e.g. 'Tue Aug 18 18:08:27 2015 +0200'
+
+    :returns datetimeobj: the datetime object obtained from date string
+
+    :raises ValueError: when the date does not follow COMMIT_DATE_FORMAT
+    """
+
+    tokens = date.split()
+    if len(tokens) != 6 or tokens[1] not in MONTHS:
+        raise ValueError("date '%s' does not match format '%s'"
+                         % (date, COMMIT_DATE_FORMAT))
+
+    return datetime.datetime(int(tokens[4]), MONTHS[tokens[1]], int(tokens[2]))
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def github_str_to_date(date):
+    """
+    Converts a GitHub date string to a datetime object, truncated to the day.
+
+    :param date: a date string of GITHUB_DATE_FORMAT,
+        e.g. '2013-10-20T01:56:25Z'
+
+    :returns datetimeobj: the datetime object obtained from date string
+
+    :raises ValueError: when the date does not follow GITHUB_DATE_FORMAT
+    """
+
+    if len(date) != 20 or date[4] != '-' or date[7] != '-' \
+            or date[10] != 'T' or date[19] != 'Z':
+        raise ValueError("date '%s' does not match format '%s'"
+                         % (date, GITHUB_DATE_FORMAT))
+
+    return datetime.datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]))
+
+
 def str_to_date(date):
     """
     Converts date, of type string, to a datetime object
 
+    When the kind of data is known, prefer commit_str_to_date or
+    github_str_to_date, which do not have to guess the format.
+
     :param date: a date, of type string
         Note: the string format for the date in the json file is either:
          - %a %b %d %H:%M:%S %Y %z --> for commits
@@ -36,16 +100,69 @@ def str_to_date(date):
     """
 
     try:
-        datetimestr = datetime.datetime.strptime(
-            date, "%a %b %d %H:%M:%S %Y %z").strftime("%Y-%m-%d")
-
+        return commit_str_to_date(date)
     except ValueError:
-        datetimestr = datetime.datetime.strptime(
-                date, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
+        return github_str_to_date(date)
+
+
+def iter_json_file(path):
+    """
+    Given a line-by-line JSON file, this function converts its lines
+    to Python dicts one at a time, so that only the line being read
+    is kept in memory.
+
+    :param path: the path to the JSON file
+
+    :returns: a generator of dictionaries read from a JSON file
+    """
+
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            if not line.strip():
+                continue
 
-    finally:
-        datetimeobj = datetime.datetime.strptime(datetimestr, "%Y-%m-%d")
-        return datetimeobj
+            yield json.loads(line)
+
+
+def iter_items(path, category=None):
+    """
+    Lazily read the Perceval items stored in a line-by-line JSON file.
+
+    :param path: the path to the JSON file
+
+    :param category: if set, only the items of this Perceval category
+        ('commit', 'issue', 'pull_request') are returned
+
+    :returns: a generator of Perceval items (dictionaries)
+    """
+
+    for item in iter_json_file(path):
+        if category is None or item['category'] == category:
+            yield item
+
+
+def chunks(items, size):
+    """
+    Split an iterable into lists of at most `size` elements.
+
+    The iterable is consumed lazily: only one chunk is kept
+    in memory at any time.
+
+    :param items: an iterable
+    :param size: the maximum number of elements in a chunk
+
+    :returns: a generator of lists
+    """
+
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
 
 
 def read_json_file(path):
@@ -58,10 +175,4 @@ def read_json_file(path):
     :returns items: a list of dictionaries read from a JSON file
     """
 
-    items = list()
-    with open(path, 'r') as raw_data:
-        for line in raw_data:
-            line = json.loads(line)
-
-            items.append(line)
-    return items
+    return list(iter_json_file(path))
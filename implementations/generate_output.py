@@ -42,7 +42,9 @@ class GenerateOutput():
     Class for generating output in different formats.
 
     :param results: A dictionary with the computed values of metrics,
-        groups according to the category of metrics.
+        groups according to the category of metrics. The results of
+        several repositories can be reported together, if each result
+        has a 'repo' key.
 
     :param output_formats: Possible formats for output. Currently, pdf,
         images, markdown and json are supported.
@@ -87,7 +89,7 @@ class GenerateOutput():
         if os.path.exists(self.write_to):
             shutil.rmtree(self.write_to)
 
-        os.mkdir(self.write_to)
+        os.makedirs(self.write_to)
         for output_format in self.output_formats:
             self.generate_options[output_format]()
 
@@ -117,7 +119,7 @@ class GenerateOutput():
         for category, results_ in self.results.items():
             for result in results_:
                 pdf.add_page()
-                pdf.cell(w=100, h=10, txt=str(result['metric']), border=0, ln=1)
+                pdf.cell(w=100, h=10, txt=self._title(result), border=0, ln=1)
                 pdf.ln()
 
                 txt = \
@@ -128,7 +130,7 @@ class GenerateOutput():
                 pdf.set_font('Arial', style='', size=16)
                 pdf.multi_cell(w=0, h=3, txt=txt)
                 pdf.image(self.write_to + '/' + IMAGES_DIR + '/'
-                          + "_".join(str(result['metric']).split()) + '.png', w=200)
+                          + self._image_name(result), w=200)
 
         pdf.output(self.write_to + '/' + PDF_FILE, 'F')
 
@@ -148,7 +150,7 @@ class GenerateOutput():
         for category, results_ in self.results.items():
             for result in results_:
 
-                template += "## " + str(result['metric']) + '\n'
+                template += "## " + self._title(result) + '\n'
 
                 txt = \
                     "The value of the metric is:\n" \
@@ -156,8 +158,7 @@ class GenerateOutput():
 
                 template += txt
 
-                embed_img = '![](../' + self.write_to + '/' + IMAGES_DIR + '/' \
-                            + "_".join(str(result['metric']).split()) + '.png)'
+                embed_img = '![](' + IMAGES_DIR + '/' + self._image_name(result) + ')'
 
                 template += embed_img + "\n\n"
 
@@ -177,6 +178,8 @@ class GenerateOutput():
         {'category': 'issue', 'metric': <metric3>, 'value': <metric3_val>}
         ..
         .
+
+        Results of several repositories also have a 'repo' key.
         """
 
         logger.info("Generating %s" % JSON_FILE)
@@ -184,10 +187,14 @@ class GenerateOutput():
         with open(self.write_to + '/' + JSON_FILE, 'w') as json_file:
             for category, results_ in self.results.items():
                 for result in results_:
-                    json.dump({
-                                'category': category,
-                                'metric': str(result['metric']),
-                                'value': str(result['value'])}, json_file)
+                    line = {
+                        'category': category,
+                        'metric': str(result['metric']),
+                        'value': str(result['value'])
+                    }
+                    if 'repo' in result:
+                        line['repo'] = result['repo']
+                    json.dump(line, json_file)
                     json_file.write('\n')
 
     def _generate_images(self):
@@ -205,4 +212,33 @@ class GenerateOutput():
             for result in results_:
                 result['metric'].plot_time_series(self.period)
                 plt.savefig(self.write_to + '/' + IMAGES_DIR + '/'
-                            + "_".join(str(result['metric']).split()) + '.png')
+                            + self._image_name(result))
+
+    def _title(self, result):
+        """
+        Title of a result in the reports: the name of its metric,
+        preceded by its repository if any.
+
+        :param result: A dictionary with the 'metric' and 'value' keys,
+            and optionally 'repo'
+
+        :returns: a string
+        """
+
+        if 'repo' in result:
+            return result['repo'] + ': ' + str(result['metric'])
+
+        return str(result['metric'])
+
+    def _image_name(self, result):
+        """
+        Name of the image file of a result.
+
+        :param result: A dictionary with the 'metric' and 'value' keys,
+            and optionally 'repo'
+
+        :returns: a string
+        """
+
+        name = self._title(result).replace('/', '_').replace(':', '')
+        return "_".join(name.split()) + '.png'
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Matchers of file paths against many prefixes or postfixes at once.
+
+Rules are grouped by length: a path is checked by looking up its
+prefix (or postfix) of each length in the set of rules of that length,
+so the number of lookups depends on the number of distinct lengths of
+the rules, not on the number of rules. Rules with glob wildcards
+('*', '?', '[...]', see fnmatch) are grouped in the same way by their
+literal prefix (or postfix), the part before the first wildcard (or
+after the last one), and the rules of a group are compiled together
+into a single regular expression. A path is thus only matched against
+the groups of the literal affixes it has, with one match per group:
+the cost of the globs still grows with the number of rules sharing the
+same literal affix, e.g. rules starting with a wildcard.
+
+These matchers are shared by the conditions of the `scripts` and
+`code_df` implementations.
+"""
+
+import fnmatch
+import re
+
+
+# Wildcards of globs, where '[' only starts a set of characters
+# when it is closed by a ']', as in fnmatch
+GLOB_PATTERN = re.compile(r'[*?]|\[.+?\]')
+
+
+def is_glob(rule):
+    """
+    Check whether a rule has glob wildcards.
+
+    :param rule: a prefix or postfix (string)
+    :returns: True if the rule has wildcards (Boolean)
+    """
+
+    return GLOB_PATTERN.search(rule) is not None
+
+
+class AffixMatcher:
+    """
+    Root of the matchers, checking whether some rule is a prefix or
+    a postfix of a path.
+
+    :param rules: list of prefixes or postfixes (strings)
+    """
+
+    def __init__(self, rules):
+
+        self.rules = {}
+        globs = {}
+        for rule in rules:
+            if is_glob(rule):
+                globs.setdefault(self._literal(rule), []).append(self._translate(rule))
+            else:
+                self.rules.setdefault(len(rule), set()).add(rule)
+
+        self.lengths = sorted(self.rules)
+
+        # literal affix -> regular expression of the globs having it
+        self.globs = {literal: re.compile('|'.join('(?:%s)' % glob for glob in literal_globs))
+                      for literal, literal_globs in globs.items()}
+        self.glob_lengths = sorted(set(len(literal) for literal in self.globs))
+
+    def match(self, path):
+        """
+        Check whether a path matches some rule.
+
+        :param path: file name to check (full path)
+        :returns: True if some rule matches the path (Boolean)
+        """
+
+        for length in self.lengths:
+            if length > len(path):
+                break
+            if self._affix(path, length) in self.rules[length]:
+                return True
+
+        for length in self.glob_lengths:
+            if length > len(path):
+                break
+            glob = self.globs.get(self._affix(path, length))
+            if glob is not None and glob.match(path):
+                return True
+
+        return False
+
+    def _affix(self, path, length):
+        """
+        Return the prefix or postfix of a path with a given length.
+
+        :param path: file name (string)
+        :param length: length of the affix, at most the one of path
+
+        :returns: a string
+        """
+
+        raise NotImplementedError
+
+    def _literal(self, rule):
+        """
+        Return the literal part of a glob rule which is an affix of all
+        the paths it matches.
+
+        :param rule: a rule with wildcards (string)
+        :returns: a string, possibly empty
+        """
+
+        raise NotImplementedError
+
+    def _translate(self, rule):
+        """
+        Translate a glob rule into a regular expression matching
+        the whole paths the rule is a prefix or postfix of.
+
+        :param rule: a rule with wildcards (string)
+        :returns: a regular expression (string)
+        """
+
+        raise NotImplementedError
+
+
+class PrefixMatcher(AffixMatcher):
+    """
+    Check whether some rule is a prefix of a path, as str.startswith.
+    """
+
+    def _affix(self, path, length):
+
+        return path[:length]
+
+    def _literal(self, rule):
+
+        return rule[:GLOB_PATTERN.search(rule).start()]
+
+    def _translate(self, rule):
+
+        return fnmatch.translate(rule + '*')
+
+
+class PostfixMatcher(AffixMatcher):
+    """
+    Check whether some rule is a postfix of a path, as str.endswith.
+    """
+
+    def _affix(self, path, length):
+
+        return path[len(path) - length:]
+
+    def _literal(self, rule):
+
+        wildcards = list(GLOB_PATTERN.finditer(rule))
+        return rule[wildcards[-1].end():]
+
+    def _translate(self, rule):
+
+        return fnmatch.translate('*' + rule)
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Instrumentation of the stages of an analysis.
+
+Stages, such as fetching the items of a repository, flattening them,
+filtering commits with conditions, or computing a metric, are wrapped
+with the stage context manager:
+
+    with profiling.stage('compute', metric='Code Changes') as record:
+        ...
+
+When a Profiler is started, every stage gets a record with its wall
+time, its CPU time, the peak memory traced by tracemalloc during the
+stage (if memory is traced), and the maximum resident set size of the
+process at its end. Code running a stage can add counts of items to
+its record, such as the commits kept by every condition. Stages can
+be nested, and records tell their parent.
+
+When no Profiler is started, stage and count do nothing, so that
+instrumented code does not need to know whether it is profiled.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+# CPU time of the running thread, as fetches run in threads
+thread_time = getattr(time, 'thread_time', time.process_time)
+
+_profiler = None
+# whether start began tracing memory, which stop must then end
+_started_tracing = False
+
+
+def max_rss_mib():
+    """
+    Return the maximum resident set size of the process so far.
+
+    :returns: a number of MiB, or None if it is not available
+    """
+
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    if sys.platform == 'darwin':
+        return max_rss / 2 ** 20
+    return max_rss / 2 ** 10
+
+
+# Keys of the records which are not labels
+RECORD_FIELDS = ('id', 'parent', 'stage', 'wall_seconds', 'cpu_seconds', 'peak_traced_mib',
+                 'max_rss_mib', 'items_in', 'items_out', 'counts')
+
+
+def format_items(items_in, items_out):
+    """
+    Format counts of items for a summary, e.g. '120 -> 80'.
+    """
+
+    if items_in is None and items_out is None:
+        return ''
+
+    return '%s -> %s' % ('?' if items_in is None else items_in,
+                         '?' if items_out is None else items_out)
+
+
+class Profiler:
+    """
+    Records of the stages of an analysis.
+
+    Records are dictionaries with the 'id' of the stage, the 'id' of
+    its 'parent' (or None), its 'stage' name, its labels (such as the
+    'repo' or the 'metric'), 'wall_seconds', 'cpu_seconds' (of the
+    thread running the stage), 'peak_traced_mib' (or None),
+    'max_rss_mib' (or None), and, if they were set, 'items_in',
+    'items_out' and 'counts', a list of dictionaries with a 'name',
+    'items_in' and 'items_out'.
+
+    Peak traced memory is only known for the stages of the thread which
+    started the profiler, as tracemalloc traces the whole process, and
+    with Python 3.9 or later, to reset its peak at every stage.
+
+    :param trace_memory: whether to trace memory allocations with
+        tracemalloc, which slows down the analysis
+    """
+
+    def __init__(self, trace_memory=False):
+
+        self.trace_memory = trace_memory and hasattr(tracemalloc, 'reset_peak')
+        self.started_at = datetime.now()
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread = threading.current_thread()
+        # traced memory peaks of the running stages of the thread
+        self._peaks = []
+
+        if trace_memory and not self.trace_memory:
+            logger.warning("Peak memory of stages needs tracemalloc.reset_peak (Python 3.9)")
+
+    def _stack(self):
+        """
+        Return the records of the running stages of the current thread.
+        """
+
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _tracing(self):
+        """
+        Tell whether memory is traced for the stages of the current thread.
+        """
+
+        return self.trace_memory and threading.current_thread() is self._thread
+
+    @contextmanager
+    def stage(self, name, parent=None, **labels):
+        """
+        Record a stage.
+
+        :param name: the name of the stage, e.g. 'fetch'
+        :param parent: the id of the parent stage, or None for the
+            innermost stage of the current thread; stages running in
+            other threads than their parent must be given it
+        :param labels: strings describing the stage, e.g. its 'repo'
+
+        :returns: a context manager, whose value is the record of the
+            stage, where 'items_in' and 'items_out' can be set
+        """
+
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1]['id']
+        record = OrderedDict([('id', None),
+                              ('parent', parent),
+                              ('stage', name)])
+        record.update(sorted(labels.items()))
+        with self._lock:
+            record['id'] = len(self.records)
+            self.records.append(record)
+
+        tracing = self._tracing()
+        if tracing:
+            peak = tracemalloc.get_traced_memory()[1]
+            self._peaks = [max(running, peak) for running in self._peaks]
+            tracemalloc.reset_peak()
+            self._peaks.append(tracemalloc.get_traced_memory()[0])
+
+        stack.append(record)
+        wall, cpu = time.perf_counter(), thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = round(time.perf_counter() - wall, 6)
+            record['cpu_seconds'] = round(thread_time() - cpu, 6)
+            stack.pop()
+
+            record['peak_traced_mib'] = None
+            if tracing:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                self._peaks = [max(running, peak) for running in self._peaks]
+                record['peak_traced_mib'] = round(peak / 2 ** 20, 3)
+
+            rss = max_rss_mib()
+            record['max_rss_mib'] = round(rss, 3) if rss is not None else None
+
+    def count(self, name, items_in, items_out):
+        """
+        Add a count of items to the innermost stage of the current thread.
+
+        :param name: what the items went through, e.g. a condition
+        :param items_in: the number of items before
+        :param items_out: the number of items after
+        """
+
+        stack = self._stack()
+        if not stack:
+            return
+
+        stack[-1].setdefault('counts', []).append(
+            OrderedDict([('name', name), ('items_in', int(items_in)), ('items_out', int(items_out))]))
+
+    def add_records(self, records, **labels):
+        """
+        Add the records of another profiler, e.g. of another process.
+
+        :param records: a list of records, as in `records`
+        :param labels: labels added to all of them, e.g. their 'repo'
+        """
+
+        with self._lock:
+            offset = len(self.records)
+            for record in records:
+                record = OrderedDict(record)
+                record['id'] += offset
+                if record['parent'] is not None:
+                    record['parent'] += offset
+                record.update(labels)
+                self.records.append(record)
+
+    def to_dict(self):
+        """
+        Describe the profile with a dictionary which can be stored as JSON.
+
+        :returns: a dictionary
+        """
+
+        return OrderedDict([
+            ('started_at', self.started_at.strftime('%Y-%m-%dT%H:%M:%S')),
+            ('trace_memory', self.trace_memory),
+            ('stages', self.records)
+        ])
+
+    def save(self, path):
+        """
+        Write the profile to a JSON file.
+
+        :param path: the path of the file
+        """
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2)
+        os.replace(tmp_path, path)
+
+        logger.debug("Profile saved to %s" % path)
+
+    def summary(self):
+        """
+        Summarize the profile in a table, with a line per stage,
+        indented under its parent, and a line per count of items.
+
+        :returns: a string
+        """
+
+        children = {}
+        for record in self.records:
+            children.setdefault(record['parent'], []).append(record)
+
+        header = "%-60s %10s %10s %10s %16s" % ('stage', 'wall (s)', 'cpu (s)', 'peak MiB', 'items in -> out')
+        lines = [header, '-' * len(header)]
+
+        def add(record, depth):
+            labels = ', '.join(str(value) for key, value in record.items()
+                               if key not in RECORD_FIELDS)
+            name = '  ' * depth + record['stage'] + (' (%s)' % labels if labels else '')
+            peak = record.get('peak_traced_mib')
+            lines.append("%-60s %10.3f %10.3f %10s %16s" % (
+                name, record.get('wall_seconds', 0), record.get('cpu_seconds', 0),
+                '-' if peak is None else '%.1f' % peak,
+                format_items(record.get('items_in'), record.get('items_out'))))
+
+            for count in record.get('counts', []):
+                lines.append("%-60s %10s %10s %10s %16s" % (
+                    '  ' * (depth + 1) + count['name'], '', '', '',
+                    format_items(count['items_in'], count['items_out'])))
+
+            for child in children.get(record['id'], []):
+                add(child, depth + 1)
+
+        for record in children.get(None, []):
+            add(record, 0)
+
+        return '\n'.join(line.rstrip() for line in lines)
+
+
+def start(trace_memory=False):
+    """
+    Start profiling the stages of the analysis.
+
+    :param trace_memory: whether to trace memory allocations
+
+    :returns: the Profiler recording the stages
+    """
+
+    global _profiler, _started_tracing
+
+    _profiler = Profiler(trace_memory)
+    _started_tracing = _profiler.trace_memory and not tracemalloc.is_tracing()
+    if _started_tracing:
+        tracemalloc.start()
+
+    return _profiler
+
+
+def stop():
+    """
+    Stop profiling, and tracing memory if start began it.
+
+    :returns: the Profiler which recorded the stages, or None
+    """
+
+    global _profiler, _started_tracing
+
+    profiler, _profiler = _profiler, None
+    if _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+    return profiler
+
+
+def active():
+    """
+    Return the running Profiler, or None.
+    """
+
+    return _profiler
+
+
+@contextmanager
+def stage(name, parent=None, **labels):
+    """
+    Record a stage with the running Profiler, if any.
+
+    :param name: the name of the stage, e.g. 'fetch'
+    :param parent: the id of the parent stage, as for Profiler.stage
+    :param labels: strings describing the stage, e.g. its 'repo'
+
+    :returns: a context manager, whose value is the record of the
+        stage, or a dictionary which is not recorded if no Profiler
+        is running
+    """
+
+    if _profiler is None:
+        yield {}
+        return
+
+    with _profiler.stage(name, parent, **labels) as record:
+        yield record
+
+
+def count(name, items_in, items_out):
+    """
+    Add a count of items to the innermost stage, if a Profiler is running.
+
+    :param name: what the items went through, e.g. a condition
+    :param items_in: the number of items before
+    :param items_out: the number of items after
+    """
+
+    if _profiler is not None:
+        _profiler.count(name, items_in, items_out)
@@ -21,12 +21,21 @@
 
 from datetime import datetime
 
-from implementations.scripts.commit_git import CommitGit
+from implementations.scripts.commit_git import CommitGit, CommitRecord
 from implementations.scripts.conditions import (DirExclude,
                                                 MasterInclude,
                                                 PostfixExclude)
 from implementations.scripts.utils import (read_json_file,
-                                           str_to_date)
+                                           commit_str_to_date)
+
+
+class CodeChangesLinesRecord(CommitRecord):
+    """
+    Flattened commit, with the number of lines it modifies.
+    """
+
+    fields = CommitRecord.fields + ('modifications',)
+    __slots__ = ('modifications',)
 
 
 class CodeChangesLinesGit(CommitGit):
@@ -34,6 +43,8 @@ class CodeChangesLinesGit(CommitGit):
     Class for Code_Changes_Lines for Git repositories (non-pandas)
     """
 
+    record_class = CodeChangesLinesRecord
+
     def _flatten(self, item):
         """
         Flatten a raw commit fetched by Perceval into a flat dictionary.
@@ -47,7 +58,7 @@ class CodeChangesLinesGit(CommitGit):
         :returns:    list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['AuthorDate'])
+        creation_date = commit_str_to_date(item['data']['AuthorDate'])
         if self.since and (self.since > creation_date):
             return []
 
@@ -66,7 +77,7 @@ class CodeChangesLinesGit(CommitGit):
                 'category': "commit",
                 'created_date': creation_date,
                 'committer': item['data']['Commit'],
-                'commit_date': str_to_date(item['data']['CommitDate']),
+                'commit_date': commit_str_to_date(item['data']['CommitDate']),
                 'files_no': len(item['data']['files']),
                 'refs': item['data']['refs'],
                 'parents': item['data']['parents'],
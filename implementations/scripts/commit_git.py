@@ -20,8 +20,25 @@
 #
 
 from implementations.scripts.metric import Metric
+from implementations.scripts.records import Record
 from implementations.scripts.conditions import Naive, Commit
-from implementations.scripts.utils import str_to_date
+from implementations.scripts.utils import commit_str_to_date
+
+
+class CommitRecord(Record):
+    """
+    Flattened commit, without the list of its files.
+
+    Hashes are interned too, so that the hash of a commit and the
+    hashes naming it as a parent of other commits are the same string.
+    """
+
+    fields = ('repo', 'hash', 'author', 'category', 'created_date',
+              'committer', 'commit_date', 'files_no', 'refs', 'parents',
+              'files_action', 'merge')
+    interned = ('repo', 'hash', 'author', 'category', 'committer')
+    interned_lists = ('refs', 'parents')
+    __slots__ = fields
 
 
 class CommitGit(Metric):
@@ -29,7 +46,8 @@ class CommitGit(Metric):
     Initializes self.items, a list with items(dictionary) as
     elements.
 
-    :param items: A list of dictionaries.
+    :param items: An iterable of dictionaries, such as a list or
+        the generator returned by utils.iter_items.
         Each item is a Perceval dictionary, obtained from a JSON
         file or from Perceval directly.
 
@@ -45,8 +63,12 @@ class CommitGit(Metric):
     :param conds: list of Commit sub-class objects.
         Used to add restrictions on which commits are
         included in the analysis.
+
+    Flattened commits are kept as CommitRecord objects.
         """
 
+    record_class = CommitRecord
+
     def __init__(self, items, date_range=(None, None),
                  is_code=[Naive()], conds=[]):
 
@@ -85,7 +107,7 @@ class CommitGit(Metric):
         :returns:    list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['AuthorDate'])
+        creation_date = commit_str_to_date(item['data']['AuthorDate'])
         if self.since and (self.since > creation_date):
             return []
 
@@ -104,7 +126,7 @@ class CommitGit(Metric):
                 'category': "commit",
                 'created_date': creation_date,
                 'committer': item['data']['Commit'],
-                'commit_date': str_to_date(item['data']['CommitDate']),
+                'commit_date': commit_str_to_date(item['data']['CommitDate']),
                 'files_no': len(item['data']['files']),
                 'refs': item['data']['refs'],
                 'parents': item['data']['parents'],
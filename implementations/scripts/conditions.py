@@ -36,6 +36,8 @@ We have two kinds of conditions:
   the list has been selected by set_commits() or not.
 """
 
+from implementations.path_matcher import PrefixMatcher, PostfixMatcher
+
 
 class Code():
     """
@@ -86,20 +88,22 @@ class DirExclude(Code):
     def __init__(self, dirs=['tests', 'bin']):
 
         self.dirs = dirs
+        self.matcher = PrefixMatcher(dirs)
 
     def check(self, file):
         """
         Check if a file path is source code or not.
 
         If the path is in the list of directories,
-        return False. True otherwise.
+        return False. True otherwise. Directories can
+        have glob wildcards, like 'src/*/generated'.
 
         :param file: file name to check (full path)
 
         :returns:    False if in the list of directories (Boolean)
         """
 
-        if any(file.startswith(path) for path in self.dirs):
+        if self.matcher.match(file):
             return False
         else:
             return True
@@ -113,20 +117,22 @@ class PostfixExclude(Code):
     def __init__(self, postfixes=['.md', 'README']):
 
         self.postfixes = postfixes
+        self.matcher = PostfixMatcher(postfixes)
 
     def check(self, file):
         """
         Check if a file path is source code or not.
 
         If the path last characters match some element in the list
-        of postfixes, consider it is not source code.
+        of postfixes, consider it is not source code. Postfixes can
+        have glob wildcards, like '.min.*'.
 
         :param file: file name to check (full path)
 
         :returns:    False if in the list of postfixes (Boolean)
         """
 
-        if any(file.endswith(postfix) for postfix in self.postfixes):
+        if self.matcher.match(file):
             return False
         else:
             return True
@@ -165,44 +171,99 @@ class Commit():
             return False
 
 
-class MasterInclude(Commit):
+class BranchInclude(Commit):
     """
-    Consider as included only commits in master
+    Consider as included only commits reachable from a branch (or tag)
+
+    :param ref: name of the branch, e.g. 'master', or full name
+        of a ref, e.g. 'refs/heads/master', 'refs/tags/0.1.0'
+
+    :param first_parent: if True, only the first parent of every
+        commit is followed, as in `git log --first-parent`
     """
 
+    def __init__(self, ref='master', first_parent=False):
+
+        if not ref.startswith('refs/'):
+            ref = 'refs/heads/' + ref
+
+        self.ref = ref
+        self.first_parent = first_parent
+
+    def _is_head(self, refs):
+        """
+        Check if a commit is annotated with the ref of the branch.
+
+        Perceval reports refs as 'refs/heads/<branch>', prefixed with
+        'HEAD -> ' for the checked out branch and with 'tag: ' for tags.
+
+        :param refs: the refs of a commit (list of strings)
+
+        :returns: True if the ref of the branch points to the commit
+        """
+
+        for ref in refs:
+            if ref.startswith('HEAD -> '):
+                ref = ref[len('HEAD -> '):]
+            elif ref.startswith('tag: '):
+                ref = ref[len('tag: '):]
+
+            if ref == self.ref:
+                return True
+
+        return False
+
     def set_commits(self, commits):
         """
         Set the list with commits to be analyzed for condition
 
         This method also prepares the set of included commits
-        (those in master), so that the check can be done quickly later.
+        (those in the branch), so that the check can be done quickly later.
 
-        To find commits in the master branch, this method finds
-        the commit annotated with the ref 'HEAD -> refs/heads/master',
-        and then goes back, following parents for each commit,
-        until the first one present in the data frame.
+        To find commits in the branch, this method finds the commit
+        annotated with the ref of the branch, and then goes back,
+        following parents for each commit, until the first one present
+        in the list. Parents are looked up in an index built once
+        from the 'hash' and 'parents' of commits, so that the walk is
+        linear in the number of commits.
 
         :param commits: commits (list)
         """
 
-        list_of_commits = [dict(commit) for commit in commits]
-        todo = set()
-
-        for commit in list_of_commits:
-            if 'HEAD -> refs/heads/master' in commit['refs']:
-                todo.add(commit['hash'])
+        graph = {}
+        todo = []
+        for commit in commits:
+            graph.setdefault(commit['hash'], commit['parents'])
+            if self._is_head(commit['refs']):
+                todo.append(commit['hash'])
 
         self.included = set()
-        while len(todo) > 0:
+        while todo:
             current = todo.pop()
+            if current in self.included:
+                continue
             self.included.add(current)
 
-            parents = [commit['parents'] for commit in list_of_commits
-                       if commit['hash'] == current]
-            if len(parents) > 0:
-                for parent in parents[0]:
-                    if parent not in self.included:
-                        todo.add(parent)
+            parents = graph.get(current, ())
+            if self.first_parent:
+                parents = parents[:1]
+
+            for parent in parents:
+                if parent not in self.included:
+                    todo.append(parent)
+
+
+class MasterInclude(BranchInclude):
+    """
+    Consider as included only commits in master
+
+    :param first_parent: if True, only the first parent of every
+        commit is followed, as in `git log --first-parent`
+    """
+
+    def __init__(self, first_parent=False):
+
+        super().__init__('master', first_parent)
 
 
 class EmptyExclude(Commit):
@@ -226,10 +287,8 @@ class EmptyExclude(Commit):
         :param commits: commits (list)
         """
 
-        items = [dict(commit) for commit in commits]
-
-        items = [item for item in items if item['files_action'] > 0]
-        self.included = [item['hash'] for item in items]
+        self.included = {commit['hash'] for commit in commits
+                         if commit['files_action'] > 0}
 
 
 class MergeExclude(Commit):
@@ -252,7 +311,5 @@ class MergeExclude(Commit):
         :param commits: commits (list)
         """
 
-        items = [dict(commit) for commit in commits]
-
-        items = [item for item in items if item['merge'] is False]
-        self.included = [item['hash'] for item in items]
+        self.included = {commit['hash'] for commit in commits
+                         if commit['merge'] is False}
@@ -27,18 +27,38 @@ class Metric():
     All classes computing metrics based on data frames
     will be descendants of this class.
 
-    :param items: A list of dictionaries.
+    :param items: An iterable of dictionaries, such as a list or
+        the generator returned by utils.iter_items.
         Each element is a Perceval dictionary, obtained from a JSON
         file produced by Perceval, or directly from Perceval.
+        Items are consumed one at a time, so that only the flattened
+        items are kept in memory, as records of record_class if it
+        is set (see records.Record).
     """
 
+    record_class = None
+
     def __init__(self, items):
 
         flat_items = []
         for item in items:
-            flat_items.extend(self._flatten(item))
+            flat_items.extend(self._record(flat) for flat in self._flatten(item))
         self.items = flat_items
 
+    def _record(self, flat):
+        """
+        Turn a flat dictionary into the element kept in self.items.
+
+        :param flat: a flat dictionary, as produced by _flatten
+        :returns:    a record of record_class, or flat itself if
+            record_class is None
+        """
+
+        if self.record_class is None:
+            return flat
+
+        return self.record_class.from_flat(flat)
+
     def _flatten(self, item):
         """
         Flatten an item into a list of flat dictionaries
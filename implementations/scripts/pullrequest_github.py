@@ -20,7 +20,19 @@
 #
 
 from implementations.scripts.metric import Metric
-from implementations.scripts.utils import str_to_date
+from implementations.scripts.records import Record
+from implementations.scripts.utils import github_str_to_date
+
+
+class PullRequestRecord(Record):
+    """
+    Flattened pull request.
+    """
+
+    fields = ('repo', 'hash', 'category', 'author', 'created_date',
+              'current_status', 'merged')
+    interned = ('repo', 'category', 'author', 'current_status')
+    __slots__ = fields
 
 
 class PullRequestGitHub(Metric):
@@ -38,8 +50,12 @@ class PullRequestGitHub(Metric):
         is None, that would mean that all pull_requests from the first
         pull_request to the pull_request which last falls inside the
         until range will be included.
+
+    Flattened pull requests are kept as PullRequestRecord objects.
     """
 
+    record_class = PullRequestRecord
+
     def __init__(self, items, date_range=(None, None)):
 
         self.since, self.until = date_range
@@ -58,7 +74,7 @@ class PullRequestGitHub(Metric):
         :returns:   list of a single flat dictionary
         """
 
-        creation_date = str_to_date(item['data']['created_at'])
+        creation_date = github_str_to_date(item['data']['created_at'])
         if self.since and (self.since > creation_date):
             return []
 
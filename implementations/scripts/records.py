@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Compact records holding the flattened items of the metrics.
+
+Flat dictionaries carry a hash table per item, and often more than
+the metrics need. Records store their fields in __slots__ instead,
+and intern the strings shared by many of them, such as authors and
+repositories, so that a single copy of every distinct string is kept.
+Records are read-only mappings: they are used as flat dictionaries,
+e.g. record['author'] or dict(record).
+"""
+
+import sys
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """
+    Root of all records.
+
+    Descendant classes name their fields in __slots__ and in `fields`,
+    and create records from flat dictionaries with from_flat.
+    """
+
+    __slots__ = ()
+
+    # names of the fields, in the order of the flat dictionaries
+    fields = ()
+    # fields holding strings, which are interned
+    interned = ()
+    # fields holding lists of strings, kept as tuples of interned strings
+    interned_lists = ()
+
+    @classmethod
+    def from_flat(cls, flat):
+        """
+        Create a record from a flat dictionary.
+
+        Keys of the flat dictionary which are not fields of the record
+        are left out.
+
+        :param flat: a flat dictionary, as produced by Metric._flatten
+
+        :returns: a record
+        """
+
+        record = cls.__new__(cls)
+        for field in cls.fields:
+            value = flat[field]
+            if value is not None:
+                if field in cls.interned:
+                    value = sys.intern(value)
+                elif field in cls.interned_lists:
+                    value = tuple(sys.intern(string) for string in value)
+            object.__setattr__(record, field, value)
+
+        return record
+
+    def __getitem__(self, key):
+
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+
+        return iter(self.fields)
+
+    def __len__(self):
+
+        return len(self.fields)
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError("%s records are read-only" % type(self).__name__)
+
+    def __reduce__(self):
+
+        return (self.__class__.from_flat, (dict(self),))
+
+    def __repr__(self):
+
+        return "%s(%s)" % (type(self).__name__, dict(self))
@@ -237,9 +237,10 @@ class Test_flatten(unittest.TestCase):
         """
 
         commit = CommitGit(self.items, is_code=[DirExclude()])
-        expected_items = CommitGit(self.items).items
+        naive = CommitGit([])
+        flat_items = [flat for item in self.items for flat in naive._flatten(item)]
 
-        expected_items = [item for item in expected_items if
+        expected_items = [naive._record(item) for item in flat_items if
                           len(
                              [file['file'] for file in item['files'] if
                               all(condition.check(file['file'])
@@ -255,9 +256,10 @@ class Test_flatten(unittest.TestCase):
         """
 
         commit = CommitGit(self.items, is_code=[PostfixExclude()])
-        expected_items = CommitGit(self.items).items
+        naive = CommitGit([])
+        flat_items = [flat for item in self.items for flat in naive._flatten(item)]
 
-        expected_items = [item for item in expected_items if
+        expected_items = [naive._record(item) for item in flat_items if
                           len(
                              [file['file'] for file in item['files'] if
                               all(condition.check(file['file'])
@@ -27,6 +27,7 @@ from implementations.scripts.metric import Metric
 from implementations.scripts.conditions import (
             Naive, DirExclude, PostfixExclude,
             MasterInclude, MergeExclude, EmptyExclude,
+            BranchInclude,
             )
 
 
@@ -137,6 +138,19 @@ class TestDirExclude(unittest.TestCase):
 
         self.assertFalse(DirExclude(['perceval']).check(self.file_perceval))
 
+    def test_check_exclude_glob(self):
+        """
+        Test whether the check method of the DirExclude class
+        correctly returns False for files in directories matching
+        a glob.
+        """
+
+        self.assertTrue(DirExclude(['*/backends']).check(self.file_perceval))
+        self.assertFalse(DirExclude(['*/err*']).check(self.file_perceval))
+
+        self.assertFalse(DirExclude(['t?sts', 'b[aeiou]n']).check(self.file_tests))
+        self.assertFalse(DirExclude(['t?sts', 'b[aeiou]n']).check(self.file_bin))
+
 
 class TestPostfixExclude(unittest.TestCase):
     """
@@ -272,5 +286,66 @@ class TestCommitConditions(unittest.TestCase):
         self.assertEqual(merge_exclude.included, commit.conds[0].included)
 
 
+class TestBranchInclude(unittest.TestCase):
+    """
+    Tests for the BranchInclude and MasterInclude classes
+    in the conditions module.
+    """
+
+    def setUp(self):
+        """
+        Run before each test to build a small commit graph, where
+        master (HEAD) is f, whose history a-b-c-e-f merges in e the
+        branch topic, made of d (tagged v1) forked from b, and where
+        g on the branch other is not in master.
+        """
+
+        self.commits = [
+            {'hash': 'a', 'parents': [], 'refs': []},
+            {'hash': 'b', 'parents': ['a'], 'refs': []},
+            {'hash': 'c', 'parents': ['b'], 'refs': []},
+            {'hash': 'd', 'parents': ['b'], 'refs': ['refs/heads/topic', 'tag: refs/tags/v1']},
+            {'hash': 'e', 'parents': ['c', 'd'], 'refs': []},
+            {'hash': 'f', 'parents': ['e'], 'refs': ['HEAD -> refs/heads/master']},
+            {'hash': 'g', 'parents': ['a'], 'refs': ['refs/heads/other']},
+        ]
+
+    def test_set_commits_master(self):
+        """
+        Test whether MasterInclude includes every ancestor of master.
+        """
+
+        condition = MasterInclude()
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'c', 'd', 'e', 'f'}, condition.included)
+
+    def test_set_commits_first_parent(self):
+        """
+        Test whether only first parents are followed when
+        first_parent is set.
+        """
+
+        condition = MasterInclude(first_parent=True)
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'c', 'e', 'f'}, condition.included)
+
+    def test_set_commits_branch(self):
+        """
+        Test whether BranchInclude follows the given branch or tag.
+        """
+
+        condition = BranchInclude('topic')
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'd'}, condition.included)
+
+        condition = BranchInclude('refs/tags/v1')
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'd'}, condition.included)
+
+        condition = BranchInclude('missing')
+        condition.set_commits(self.commits)
+        self.assertEqual(set(), condition.included)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fnmatch
+import unittest
+
+from implementations.path_matcher import PrefixMatcher, PostfixMatcher
+
+
+class TestPrefixMatcher(unittest.TestCase):
+    """
+    Tests for the PrefixMatcher class
+    """
+
+    def test_match(self):
+        """
+        Test whether paths are matched as with str.startswith,
+        whatever the number of prefixes.
+        """
+
+        prefixes = ['tests', 'bin', 'docs/'] + ['vendor%s/' % i for i in range(2000)]
+        matcher = PrefixMatcher(prefixes)
+        paths = ['tests/run.py', 'testsuite.py', 'bin', 'bi', 'docs/index.rst', 'docs',
+                 'vendor1999/lib.c', 'vendor2000/lib.c', 'src/tests/a.py', '']
+
+        for path in paths:
+            self.assertEqual(any(path.startswith(prefix) for prefix in prefixes),
+                             matcher.match(path), path)
+
+    def test_match_empty(self):
+        """
+        Test whether no path is matched without prefixes, and all
+        of them are with an empty prefix.
+        """
+
+        self.assertFalse(PrefixMatcher([]).match('tests/run.py'))
+        self.assertTrue(PrefixMatcher(['']).match('tests/run.py'))
+
+    def test_match_glob(self):
+        """
+        Test whether prefixes with wildcards match paths as globs.
+        """
+
+        matcher = PrefixMatcher(['src/*/generated', 'lib?/', '[ab]in/'])
+
+        self.assertTrue(matcher.match('src/core/generated/parser.py'))
+        self.assertTrue(matcher.match('lib2/a.c'))
+        self.assertTrue(matcher.match('bin/perceval'))
+        self.assertFalse(matcher.match('src/generated/parser.py'))
+        self.assertFalse(matcher.match('lib/a.c'))
+        self.assertFalse(matcher.match('cin/a.c'))
+
+        # globs are grouped by their literal prefix
+        self.assertEqual(['', 'lib', 'src/'], sorted(matcher.globs))
+
+        prefixes = ['*/vendor/', 'gen?/'] + ['pkg%s/*/gen' % i for i in range(2000)]
+        matcher = PrefixMatcher(prefixes)
+        paths = ['a/vendor/x.go', 'vendor/x.go', 'gen1/a', 'gen/a', 'pkg12/a/gen.go',
+                 'pkg1999/a/gen', 'pkg2000/a/gen', 'pkg12/gen', '']
+
+        for path in paths:
+            self.assertEqual(any(fnmatch.fnmatchcase(path, prefix + '*') for prefix in prefixes),
+                             matcher.match(path), path)
+
+        # '[' without a closing ']' is not a wildcard
+        matcher = PrefixMatcher(['docs[/'])
+        self.assertEqual({}, matcher.globs)
+        self.assertTrue(matcher.match('docs[/index.md'))
+        self.assertFalse(matcher.match('docsa/index.md'))
+
+
+class TestPostfixMatcher(unittest.TestCase):
+    """
+    Tests for the PostfixMatcher class
+    """
+
+    def test_match(self):
+        """
+        Test whether paths are matched as with str.endswith,
+        whatever the number of postfixes.
+        """
+
+        postfixes = ['.md', 'README', '.pb.go'] + ['.gen%s' % i for i in range(2000)]
+        matcher = PostfixMatcher(postfixes)
+        paths = ['README', 'docs/README.md', 'amd', 'md', 'api.pb.go', 'api.go',
+                 'x.gen1999', 'x.gen2000', 'README.txt', '']
+
+        for path in paths:
+            self.assertEqual(any(path.endswith(postfix) for postfix in postfixes),
+                             matcher.match(path), path)
+
+    def test_match_empty(self):
+        """
+        Test whether no path is matched without postfixes, and all
+        of them are with an empty postfix.
+        """
+
+        self.assertFalse(PostfixMatcher([]).match('README.md'))
+        self.assertTrue(PostfixMatcher(['']).match('README.md'))
+
+    def test_match_glob(self):
+        """
+        Test whether postfixes with wildcards match paths as globs.
+        """
+
+        matcher = PostfixMatcher(['.min.*', '_pb2.py?'])
+
+        self.assertTrue(matcher.match('static/app.min.js'))
+        self.assertTrue(matcher.match('api_pb2.pyi'))
+        self.assertFalse(matcher.match('static/app.js'))
+        self.assertFalse(matcher.match('api_pb2.py'))
+
+        # globs are grouped by their literal postfix
+        self.assertEqual(['', '.py'], sorted(PostfixMatcher(['.min.*', 'test_*.py']).globs))
+
+        postfixes = ['.min.*'] + ['_v%s.p?' % i for i in range(2000)]
+        matcher = PostfixMatcher(postfixes)
+        paths = ['app.min.js', 'app.js', 'x_v1999.pb', 'x_v2000.pb', 'x_v12.p', '']
+
+        for path in paths:
+            self.assertEqual(any(fnmatch.fnmatchcase(path, '*' + postfix) for postfix in postfixes),
+                             matcher.match(path), path)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import tracemalloc
+import unittest
+
+from implementations import profiling
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    Tests for the Profiler class
+    """
+
+    def test_stages(self):
+        """
+        Test the records of nested stages, and their counts of items.
+        """
+
+        profiler = profiling.Profiler()
+        with profiler.stage('metrics', repo='chaoss/wg-evolution'):
+            with profiler.stage('conditions', metric='CodeChangesGit') as record:
+                record['items_in'] = 10
+                profiler.count('MasterInclude()', 10, 8)
+                profiler.count('EmptyExclude()', 8, 7)
+                record['items_out'] = 7
+            with profiler.stage('compute'):
+                pass
+
+        metrics, conditions, compute = profiler.records
+        self.assertEqual((metrics['id'], metrics['parent']), (0, None))
+        self.assertEqual(metrics['repo'], 'chaoss/wg-evolution')
+        self.assertEqual((conditions['id'], conditions['parent']), (1, 0))
+        self.assertEqual((compute['id'], compute['parent']), (2, 0))
+
+        self.assertEqual((conditions['items_in'], conditions['items_out']), (10, 7))
+        self.assertEqual([(count['name'], count['items_in'], count['items_out'])
+                          for count in conditions['counts']],
+                         [('MasterInclude()', 10, 8), ('EmptyExclude()', 8, 7)])
+        self.assertNotIn('counts', metrics)
+
+        for record in profiler.records:
+            self.assertGreaterEqual(record['wall_seconds'], 0)
+            self.assertGreaterEqual(record['cpu_seconds'], 0)
+            self.assertIsNone(record['peak_traced_mib'])
+        self.assertGreaterEqual(metrics['wall_seconds'], conditions['wall_seconds'])
+
+    def test_failed_stage(self):
+        """
+        Test whether a stage is recorded when it raises an exception.
+        """
+
+        profiler = profiling.Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage('fetch'):
+                raise ValueError
+
+        self.assertIn('wall_seconds', profiler.records[0])
+        with profiler.stage('output'):
+            pass
+        self.assertIsNone(profiler.records[1]['parent'])
+
+    @unittest.skipUnless(hasattr(tracemalloc, 'reset_peak'), "needs Python 3.9")
+    def test_trace_memory(self):
+        """
+        Test whether the peak memory of a stage includes the memory
+        allocated by the stages nested in it, and only them.
+        """
+
+        profiler = profiling.start(trace_memory=True)
+        try:
+            with profiler.stage('outer'):
+                with profiler.stage('small'):
+                    small = bytearray(2 ** 20)
+                    del small
+                with profiler.stage('large'):
+                    large = bytearray(8 * 2 ** 20)
+                    del large
+                with profiler.stage('after'):
+                    pass
+        finally:
+            profiling.stop()
+
+        outer, small, large, after = [record['peak_traced_mib'] for record in profiler.records]
+        self.assertGreaterEqual(large, 8)
+        self.assertLess(small, large - 6)
+        self.assertLess(after, large - 6)
+        self.assertGreaterEqual(outer, large)
+
+    @unittest.skipUnless(hasattr(tracemalloc, 'reset_peak'), "needs Python 3.9")
+    def test_trace_memory_started_before(self):
+        """
+        Test whether tracing memory started before profiling goes on
+        once profiling stops, and tracing started by it does not.
+        """
+
+        tracemalloc.start()
+        try:
+            profiling.start(trace_memory=True)
+            profiling.stop()
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+        profiling.start(trace_memory=True)
+        self.assertTrue(tracemalloc.is_tracing())
+        profiling.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_threads(self):
+        """
+        Test whether stages running in threads have parents of their
+        own thread, unless they are given one, and no traced memory.
+        """
+
+        profiler = profiling.Profiler(trace_memory=True)
+
+        def fetch(name, parent=None):
+            with profiler.stage(name, parent):
+                with profiler.stage('inner', outer=name):
+                    pass
+
+        with profiler.stage('fetch') as record:
+            for args in (('orphan',), ('fetch_category', record['id'])):
+                thread = threading.Thread(target=fetch, args=args)
+                thread.start()
+                thread.join()
+
+        records = {record.get('outer', '') + record['stage']: record for record in profiler.records}
+        self.assertIsNone(records['orphan']['parent'])
+        self.assertEqual(records['fetch_category']['parent'], records['fetch']['id'])
+        self.assertEqual(records['orphaninner']['parent'], records['orphan']['id'])
+        self.assertEqual(records['fetch_categoryinner']['parent'], records['fetch_category']['id'])
+        self.assertIsNone(records['fetch_category']['peak_traced_mib'])
+
+    def test_add_records(self):
+        """
+        Test adding the records of another profiler.
+        """
+
+        profiler = profiling.Profiler()
+        with profiler.stage('fetch'):
+            pass
+
+        other = profiling.Profiler()
+        with other.stage('metrics'):
+            with other.stage('compute'):
+                pass
+
+        profiler.add_records(other.records, repo='chaoss/wg-evolution')
+
+        self.assertEqual([(record['id'], record['parent']) for record in profiler.records],
+                         [(0, None), (1, None), (2, 1)])
+        self.assertEqual(profiler.records[2]['repo'], 'chaoss/wg-evolution')
+        self.assertNotIn('repo', other.records[1])
+
+    def test_save_and_summary(self):
+        """
+        Test the JSON profile, and the summary table.
+        """
+
+        profiler = profiling.Profiler()
+        with profiler.stage('metric', metric='CodeChangesGit') as record:
+            record['items_in'], record['items_out'] = 20, 18
+            profiler.count('EmptyExclude()', 20, 18)
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'profile.json')
+            profiler.save(path)
+            with open(path, 'r') as profile_file:
+                profile = json.load(profile_file)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertFalse(profile['trace_memory'])
+        self.assertEqual(profile['stages'], json.loads(json.dumps(profiler.records)))
+
+        lines = profiler.summary().split('\n')
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].startswith('metric (CodeChangesGit)'))
+        self.assertTrue(lines[2].endswith('20 -> 18'))
+        self.assertTrue(lines[3].startswith('  EmptyExclude()'))
+
+
+class TestModuleFunctions(unittest.TestCase):
+    """
+    Tests for the functions using the running profiler
+    """
+
+    def test_not_started(self):
+        """
+        Test whether stages and counts are ignored when no profiler runs.
+        """
+
+        self.assertIsNone(profiling.active())
+        with profiling.stage('fetch') as record:
+            record['items_in'] = 10
+            profiling.count('EmptyExclude()', 10, 8)
+
+    def test_started(self):
+        """
+        Test whether stages and counts go to the running profiler.
+        """
+
+        profiler = profiling.start()
+        try:
+            self.assertIs(profiling.active(), profiler)
+            with profiling.stage('conditions', metric='CodeChangesGit'):
+                profiling.count('EmptyExclude()', 10, 8)
+            profiling.count('ignored, out of any stage', 1, 1)
+        finally:
+            self.assertIs(profiling.stop(), profiler)
+
+        self.assertIsNone(profiling.active())
+        self.assertEqual(len(profiler.records), 1)
+        self.assertEqual(profiler.records[0]['metric'], 'CodeChangesGit')
+        self.assertEqual(len(profiler.records[0]['counts']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import pickle
+import unittest
+
+from implementations.scripts.code_changes_lines_git import CodeChangesLinesGit, CodeChangesLinesRecord
+from implementations.scripts.commit_git import CommitGit, CommitRecord
+from implementations.scripts.pullrequest_github import PullRequestGitHub, PullRequestRecord
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+class TestRecords(unittest.TestCase):
+    """
+    Tests for the records holding flattened items
+    """
+
+    def setUp(self):
+        """
+        Run before each test to read the test data files
+        """
+
+        self.commits = read_file('data/test_commits_data.json')
+        self.pulls = read_file('data/test_pulls_data.json')
+
+    def assertRecords(self, metric, record_class, items):
+        """
+        Check that the items of a metric are records with the fields
+        of its flat dictionaries.
+        """
+
+        self.assertEqual(len(metric.items), len(items))
+        for record, item in zip(metric.items, items):
+            flat = metric._flatten(item)[0]
+
+            self.assertIsInstance(record, record_class)
+            self.assertFalse(hasattr(record, '__dict__'))
+            self.assertEqual(list(record), list(record_class.fields))
+            for field in record_class.fields:
+                if field in record_class.interned_lists:
+                    self.assertEqual(record[field], tuple(flat[field]))
+                else:
+                    self.assertEqual(record[field], flat[field])
+
+    def test_commits(self):
+        """
+        Test the records of commits, which leave out their files.
+        """
+
+        commit = CommitGit(self.commits)
+        self.assertRecords(commit, CommitRecord, self.commits)
+
+        record = commit.items[0]
+        self.assertNotIn('files', record)
+        with self.assertRaises(KeyError):
+            record['files']
+        self.assertEqual(dict(record)['files_no'], 3)
+        self.assertIsInstance(record['parents'], tuple)
+
+        lines = CodeChangesLinesGit(self.commits)
+        self.assertRecords(lines, CodeChangesLinesRecord, self.commits)
+
+    def test_pull_requests(self):
+        """
+        Test the records of pull requests.
+        """
+
+        pulls = PullRequestGitHub(self.pulls)
+        self.assertRecords(pulls, PullRequestRecord, self.pulls)
+
+    def test_interned(self):
+        """
+        Test whether strings shared by records are the same object.
+        """
+
+        commit = CommitGit(self.commits)
+        first, second = commit.items[0], commit.items[1]
+        self.assertIs(first['author'], second['author'])
+        self.assertIs(first['repo'], second['repo'])
+
+        hashes = {record['hash']: record['hash'] for record in commit.items}
+        for record in commit.items:
+            for parent in record['parents']:
+                if parent in hashes:
+                    self.assertIs(parent, hashes[parent])
+
+    def test_read_only(self):
+        """
+        Test that records cannot be changed, and can be pickled.
+        """
+
+        record = CommitGit(self.commits).items[0]
+        with self.assertRaises(AttributeError):
+            record.author = 'someone'
+        with self.assertRaises(TypeError):
+            record['author'] = 'someone'
+
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -24,7 +24,11 @@ import json
 from datetime import datetime
 
 from implementations.scripts.utils import (str_to_date,
-                                           read_json_file)
+                                           commit_str_to_date,
+                                           github_str_to_date,
+                                           read_json_file,
+                                           iter_json_file,
+                                           iter_items)
 
 
 def read_file(path):
@@ -85,6 +89,45 @@ class TestUtils(unittest.TestCase):
         datetimeobj = str_to_date(date)
         self.assertEqual(expected, datetimeobj)
 
+    def test_commit_str_to_date(self):
+        """
+        Test whether commit_str_to_date gives the same result as
+        str_to_date, keeping the day of the commit's local time.
+        """
+
+        for date in ["Tue Aug 18 18:08:27 2015 +0200",
+                     "Tue Aug 18 23:30:00 2015 -0700",
+                     "Wed Aug 19 00:30:00 2015 +0900",
+                     "Sat Feb  1 10:00:00 2020 +0000"]:
+            expected = datetime.strptime(date, "%a %b %d %H:%M:%S %Y %z")
+            expected = datetime(expected.year, expected.month, expected.day)
+            self.assertEqual(expected, commit_str_to_date(date))
+            self.assertEqual(expected, str_to_date(date))
+
+    def test_github_str_to_date(self):
+        """
+        Test whether github_str_to_date correctly converts an
+        issue's date string to a datetime object.
+        """
+
+        date = "2013-10-20T01:56:25Z"
+        self.assertEqual(datetime(2013, 10, 20), github_str_to_date(date))
+
+    def test_str_to_date_invalid(self):
+        """
+        Test whether the date parsers raise ValueError when the date
+        does not follow their format.
+        """
+
+        with self.assertRaises(ValueError):
+            commit_str_to_date("2013-10-20T01:56:25Z")
+
+        with self.assertRaises(ValueError):
+            github_str_to_date("Tue Aug 18 18:08:27 2015 +0200")
+
+        with self.assertRaises(ValueError):
+            str_to_date("20/10/2013")
+
     def test_read_json_file(self):
         """
         Test whether read_json_file correctly reads a file of
@@ -96,6 +139,32 @@ class TestUtils(unittest.TestCase):
 
         self.assertEqual(expected, items)
 
+    def test_iter_json_file(self):
+        """
+        Test whether iter_json_file lazily yields the same items
+        as read_json_file.
+        """
+
+        expected = read_file('data/test_commits_data.json')
+        items = iter_json_file('data/test_commits_data.json')
+
+        self.assertNotIsInstance(items, list)
+        self.assertEqual(expected, list(items))
+
+    def test_iter_items_category(self):
+        """
+        Test whether iter_items only yields items of the
+        requested category.
+        """
+
+        expected = read_file('data/test_commits_data.json')
+
+        items = list(iter_items('data/test_commits_data.json', category='commit'))
+        self.assertEqual(expected, items)
+
+        items = list(iter_items('data/test_commits_data.json', category='issue'))
+        self.assertEqual([], items)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import math
+import unittest
+from datetime import datetime
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from implementations.code_df.accumulators import (Count, Sum, Mean, Median, Distinct, Quantile,
+                                                  accumulate, period_end)
+from implementations.code_df.code_changes_git import CodeChangesGit
+from implementations.code_df.code_changes_lines_git import CodeChangesLinesGit
+from implementations.code_df.conditions import DirExclude, EmptyExclude, PostfixExclude
+from implementations.code_df.issues_closed_github import IssuesClosedGitHub
+from implementations.code_df.issues_new_github import IssuesNewGitHub
+from implementations.code_df.new_contributors_of_commits_git import NewContributorsOfCommitsGit
+from implementations.code_df.open_issue_age_github import OpenIssueAgeGitHub
+from implementations.code_df.reviews_accepted_github import ReviewsAcceptedGitHub
+from implementations.code_df.reviews_declined_github import ReviewsDeclinedGitHub
+from implementations.code_df.reviews_duration_github import ReviewsDurationGitHub
+from implementations.code_df.reviews_github import ReviewsGitHub
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+class TestAccumulators(unittest.TestCase):
+    """
+    Tests for the accumulators and the accumulate function
+    """
+
+    def setUp(self):
+        """
+        Build a few flat dictionaries
+        """
+
+        self.flats = [
+            {'created_date': datetime(2019, 1, 3), 'author': 'alice', 'lines': 10, 'merged': True},
+            {'created_date': datetime(2019, 1, 20), 'author': 'bob', 'lines': 5, 'merged': False},
+            {'created_date': datetime(2019, 1, 31), 'author': 'alice', 'lines': 1, 'merged': True},
+            {'created_date': datetime(2019, 4, 2), 'author': 'carol', 'lines': 7, 'merged': False}
+        ]
+
+    def test_results(self):
+        """
+        Test the result of every kind of accumulator.
+        """
+
+        accumulators = [
+            (Count(), 4),
+            (Count(where=lambda flat: flat['merged']), 2),
+            (Sum('lines'), 23),
+            (Sum(lambda flat: 2 * flat['lines']), 46),
+            (Mean('lines'), 23 / 4),
+            (Median('lines'), 6),
+            (Distinct('author'), 3),
+            (Quantile('lines', 0.5), 5)
+        ]
+
+        for accumulator, expected in accumulators:
+            for flat in self.flats:
+                if accumulator.accepts(flat):
+                    accumulator.add(flat)
+            self.assertAlmostEqual(accumulator.result(), expected, delta=0.01 * expected)
+
+        self.assertTrue(math.isnan(Mean('lines').result()))
+        self.assertTrue(math.isnan(Median('lines').result()))
+        self.assertTrue(math.isnan(Quantile('lines', 0.5).result()))
+
+    def test_merge(self):
+        """
+        Test whether merged accumulators give the result of all the values.
+        """
+
+        for kind in (lambda: Count(), lambda: Sum('lines'), lambda: Mean('lines'), lambda: Median('lines'),
+                     lambda: Distinct('author'), lambda: Quantile('lines', 0.9)):
+            first, second, whole = kind(), kind(), kind()
+            for index, flat in enumerate(self.flats):
+                (first if index < 2 else second).add(flat)
+                whole.add(flat)
+
+            self.assertEqual(first.merge(second).result(), whole.result())
+
+    def test_accumulate(self):
+        """
+        Test the total and the time series produced in a single pass.
+        """
+
+        accumulators = {'count': Count(), 'sum': Sum('lines')}
+        total, series = accumulate(accumulators, iter(self.flats), 'M', Distinct('author'))
+
+        self.assertEqual(total, 3)
+        expected = pd.DataFrame({'count': [3, 0, 0, 1], 'sum': [16, 0, 0, 7]},
+                                index=pd.date_range('2019-01-31', '2019-04-30', freq='M',
+                                                    name='created_date'))
+        assert_frame_equal(series, expected)
+
+        # intervals only span the flat dictionaries which are accumulated
+        total, series = accumulate({'count': Count(where=lambda flat: not flat['merged'])},
+                                   iter(self.flats), 'W')
+        self.assertEqual(total, 2)
+        self.assertEqual(series.index[0], pd.Timestamp('2019-01-20'))
+        self.assertEqual(series.index[-1], pd.Timestamp('2019-04-07'))
+
+        total, series = accumulate({'count': Count()}, iter([]), 'M')
+        self.assertEqual(total, 0)
+        self.assertTrue(series.empty)
+
+    def test_period_end(self):
+        """
+        Test the labels of the intervals of periods, as given by resample.
+        """
+
+        self.assertEqual(period_end(datetime(2019, 2, 10, 15), 'M'), pd.Timestamp('2019-02-28'))
+        self.assertEqual(period_end(datetime(2019, 2, 10), 'W'), pd.Timestamp('2019-02-10'))
+        self.assertEqual(period_end(datetime(2019, 2, 11), 'W'), pd.Timestamp('2019-02-17'))
+        self.assertEqual(period_end(datetime(2019, 2, 11, 8), 'D'), pd.Timestamp('2019-02-11'))
+
+
+class TestMetricAccumulate(unittest.TestCase):
+    """
+    Tests for Metric.accumulate, compared with DataFrame metrics
+    """
+
+    def setUp(self):
+        """
+        Run before each test to read the test data files
+        """
+
+        self.commits = read_file('data/test_commits_data.json')
+        self.issues = read_file('data/test_issues_events_data.json')
+        self.pulls = read_file('data/test_pulls_data.json')
+
+    def assertAccumulated(self, metric_class, items, periods=('W', 'M', 'D'), **kwargs):
+        """
+        Check that accumulating a metric gives the value and the time
+        series of the DataFrame metric.
+        """
+
+        metric = metric_class(items, **kwargs)
+        for period in periods:
+            total, series = metric_class([], **kwargs).accumulate(iter(items), period)
+
+            self.assertEqual(total, metric.compute())
+            assert_frame_equal(series, metric.time_series(period), check_dtype=False)
+
+    def test_commits(self):
+        """
+        Test metrics on commits, with conditions on source code.
+        """
+
+        is_code = [DirExclude(['tests']), PostfixExclude(['.md'])]
+
+        self.assertAccumulated(CodeChangesGit, self.commits, is_code=is_code)
+        self.assertAccumulated(CodeChangesLinesGit, self.commits, is_code=is_code,
+                               date_range=(datetime(2015, 8, 20), None))
+
+    def test_issues_and_pull_requests(self):
+        """
+        Test metrics on issues and pull requests, with filters.
+        """
+
+        self.assertAccumulated(IssuesClosedGitHub, self.issues)
+        self.assertAccumulated(ReviewsDeclinedGitHub, self.pulls)
+        self.assertAccumulated(ReviewsDurationGitHub, self.pulls, sketch=True)
+
+    def test_every_metric(self):
+        """
+        Test every metric which can be accumulated, with its default
+        parameters, which must give its value and time series exactly.
+        """
+
+        metrics = [
+            (CodeChangesGit, self.commits, {}),
+            (CodeChangesLinesGit, self.commits, {}),
+            (IssuesClosedGitHub, self.issues, {}),
+            (IssuesNewGitHub, self.issues, {}),
+            (OpenIssueAgeGitHub, read_file('data/test_issues_data.json'), {'as_of': datetime(2020, 1, 1)}),
+            (ReviewsGitHub, self.pulls, {}),
+            (ReviewsAcceptedGitHub, self.pulls, {}),
+            (ReviewsDeclinedGitHub, self.pulls, {}),
+            (ReviewsDurationGitHub, self.pulls, {}),
+            (ReviewsDurationGitHub, self.pulls, {'sketch': True})
+        ]
+
+        for metric_class, items, kwargs in metrics:
+            with self.subTest(metric=metric_class.__name__, **kwargs):
+                self.assertAccumulated(metric_class, items, **kwargs)
+
+    def test_cannot_accumulate(self):
+        """
+        Test metrics which need all their items at once.
+        """
+
+        with self.assertRaises(ValueError):
+            CodeChangesGit([], conds=[EmptyExclude()]).accumulate(iter(self.commits))
+
+        with self.assertRaises(ValueError):
+            IssuesClosedGitHub([], reopen_as_new=True).accumulate(iter(self.issues))
+
+        with self.assertRaises(NotImplementedError):
+            NewContributorsOfCommitsGit(self.commits).accumulate(iter(self.commits))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -23,6 +23,7 @@ import datetime
 import json
 import unittest
 
+from implementations import profiling
 from implementations.code_df.commit_git import CommitGit
 from implementations.code_df.conditions import (Commit as CommitCond,
                                                 DirExclude,
@@ -159,6 +160,62 @@ class Test_filterout(unittest.TestCase):
 
         assert_frame_equal(expected_df, temp.df)
 
+    def test__filterout_all_conditions(self):
+        """
+        Test whether _filterout, given several conditions at once,
+        keeps exactly the rows accepted by every one of them, with
+        their original index.
+        """
+
+        items = read_file('data/test_commits_data_2.json')
+        conds = [MasterInclude(), EmptyExclude(), MergeExclude()]
+        temp = self.temp_class(items)
+        for condition in conds:
+            condition.set_commits(temp.df)
+
+        expected_df = temp.df.copy()
+        for index, row in temp.df.iterrows():
+            if not all(condition.check(row['hash']) for condition in conds):
+                expected_df.drop(index, inplace=True)
+
+        filtered_df = temp._filterout(temp.df, conds)
+
+        self.assertLess(len(filtered_df), len(items))
+        assert_frame_equal(expected_df, filtered_df)
+
+        commit = CommitGit(items, conds=conds)
+        assert_frame_equal(expected_df, commit.df)
+
+    def test_profiled_conditions(self):
+        """
+        Test whether the commits kept by every condition are counted
+        when the analysis is profiled.
+        """
+
+        items = read_file('data/test_commits_data_2.json')
+        conds = [MasterInclude(), EmptyExclude(), MergeExclude()]
+
+        profiler = profiling.start()
+        try:
+            commit = CommitGit(items, conds=conds)
+        finally:
+            profiling.stop()
+
+        records = {record['stage']: record for record in profiler.records}
+        self.assertEqual(set(records), {'flatten', 'is_code', 'conditions'})
+        self.assertEqual(records['flatten']['items_in'], len(items))
+
+        conditions = records['conditions']
+        self.assertEqual(conditions['items_in'], records['is_code']['items_out'])
+        self.assertEqual(conditions['items_out'], len(commit.df))
+
+        counts = conditions['counts']
+        self.assertEqual([count['name'] for count in counts], [repr(condition) for condition in conds])
+        self.assertEqual(counts[0]['items_in'], conditions['items_in'])
+        for count, next_count in zip(counts, counts[1:]):
+            self.assertEqual(count['items_out'], next_count['items_in'])
+        self.assertEqual(counts[-1]['items_out'], len(commit.df))
+
 
 class Test_flatten(unittest.TestCase):
     """
@@ -205,11 +262,36 @@ class Test_flatten(unittest.TestCase):
                      'indexes': ['0000000', '94a9ed0'],
                         'modes': ['000000', '100644'], 'removed': '0'}],
                 'files_action': 3,
-                'merge': False
+                'merge': False,
+                'modifications': 685
              }
         ]
         self.assertEqual(flat_item, flat_expected)
 
+    def test_files(self):
+        """
+        Test whether the files of commits are moved to a table of their
+        own, linked to the commits by their id.
+        """
+
+        commit = CommitGit(self.items)
+
+        self.assertNotIn('files', commit.df.columns)
+        self.assertEqual(sum(len(item['data']['files']) for item in self.items),
+                         len(commit.files))
+        self.assertEqual(['commit_id', 'file', 'action', 'added', 'removed'],
+                         list(commit.files.columns))
+        self.assertEqual('category', commit.files['file'].dtype.name)
+        self.assertEqual('int64', commit.files['added'].dtype.name)
+
+        first_files = commit.files[commit.files['commit_id'] == commit.df['commit_id'][0]]
+        self.assertEqual(['.gitignore', 'AUTHORS', 'LICENSE'], list(first_files['file']))
+        self.assertEqual([10, 1, 674], list(first_files['added']))
+
+        lines = commit.files.groupby('commit_id')[['added', 'removed']].sum().sum(axis=1)
+        self.assertEqual(list(commit.df['modifications']),
+                         list(lines[commit.df['commit_id']]))
+
     def test__flatten_invalid_input(self):
         """
         Test for invalid input. An empty list is expected to be
@@ -232,18 +314,17 @@ class Test_flatten(unittest.TestCase):
         """
 
         commit = CommitGit(self.items, is_code=[DirExclude()])
-        expected_df = CommitGit(self.items).df
+        all_commits = CommitGit(self.items)
+        expected_df = all_commits.df
 
-        for index, item in expected_df.iterrows():
+        code_files = [all(condition.check(file) for condition in commit.is_code)
+                      for file in all_commits.files['file']]
+        code_ids = all_commits.files['commit_id'][code_files]
 
-            valid_files = [file['file'] for file in item['files'] if
-                           all(condition.check(file['file'])
-                               for condition in commit.is_code)]
-
-            if len(valid_files) == 0:
-                expected_df.drop(index, inplace=True)
+        expected_df = expected_df[expected_df['commit_id'].isin(code_ids)]
         expected_df = expected_df.reset_index(drop=True)
-        assert_frame_equal(expected_df, commit.df)
+        assert_frame_equal(expected_df.drop(columns='commit_id'),
+                           commit.df.drop(columns='commit_id'))
 
     def test__flatten_PostfixExclude(self):
         """
@@ -253,18 +334,17 @@ class Test_flatten(unittest.TestCase):
         """
 
         commit = CommitGit(self.items, is_code=[PostfixExclude()])
-        expected_df = CommitGit(self.items).df
-
-        for index, item in expected_df.iterrows():
+        all_commits = CommitGit(self.items)
+        expected_df = all_commits.df
 
-            valid_files = [file['file'] for file in item['files'] if
-                           all(condition.check(file['file'])
-                               for condition in commit.is_code)]
+        code_files = [all(condition.check(file) for condition in commit.is_code)
+                      for file in all_commits.files['file']]
+        code_ids = all_commits.files['commit_id'][code_files]
 
-            if len(valid_files) == 0:
-                expected_df.drop(index, inplace=True)
+        expected_df = expected_df[expected_df['commit_id'].isin(code_ids)]
         expected_df = expected_df.reset_index(drop=True)
-        assert_frame_equal(expected_df, commit.df)
+        assert_frame_equal(expected_df.drop(columns='commit_id'),
+                           commit.df.drop(columns='commit_id'))
 
 
 if __name__ == '__main__':
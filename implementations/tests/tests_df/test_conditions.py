@@ -22,11 +22,14 @@
 import unittest
 import json
 
+import pandas as pd
+
 from implementations.code_df.commit_git import CommitGit
 from implementations.code_df.metric import Metric
 from implementations.code_df.conditions import (
             Naive, DirExclude, PostfixExclude,
             MasterInclude, MergeExclude, EmptyExclude,
+            BranchInclude,
             )
 
 
@@ -78,6 +81,15 @@ class TestNaive(unittest.TestCase):
         self.assertTrue(Naive().check(self.file_py))
         self.assertTrue(Naive().check(self.file_authors))
 
+    def test_check_paths(self):
+        """
+        Test whether the check_paths method of the Naive class
+        returns True for all test files.
+        """
+
+        paths = pd.Series([self.file_gitignore, self.file_tests, self.file_py])
+        self.assertEqual([True, True, True], list(Naive().check_paths(paths)))
+
 
 class TestDirExclude(unittest.TestCase):
     """
@@ -137,6 +149,22 @@ class TestDirExclude(unittest.TestCase):
 
         self.assertFalse(DirExclude(['perceval']).check(self.file_perceval))
 
+    def test_check_paths(self):
+        """
+        Test whether the check_paths method of the DirExclude class
+        agrees with its check method, including for directories with
+        characters special in regular expressions.
+        """
+
+        paths = pd.Series([self.file_gitignore, self.file_tests, self.file_bin,
+                           self.file_perceval, self.file_authors,
+                           'docs.v1/index.rst', 'docsxv1/index.rst', 'src/tests/x.py'])
+
+        for dirs in (['tests', 'bin'], [], ['perceval'], ['docs.v1']):
+            condition = DirExclude(dirs)
+            self.assertEqual([condition.check(path) for path in paths],
+                             list(condition.check_paths(paths)))
+
 
 class TestPostfixExclude(unittest.TestCase):
     """
@@ -194,6 +222,83 @@ class TestPostfixExclude(unittest.TestCase):
         self.assertFalse(PostfixExclude(['py']).check(self.file_py))
         self.assertFalse(PostfixExclude(['py']).check(self.file__init__))
 
+    def test_check_paths(self):
+        """
+        Test whether the check_paths method of the PostfixExclude class
+        agrees with its check method, including for postfixes with
+        characters special in regular expressions.
+        """
+
+        paths = pd.Series([self.file_gitignore, self.file__init__, self.file_bin,
+                           self.file_py, self.file_authors,
+                           'README', 'docs/README.md', 'amd', 'notes.md.txt', 'a.md\n'])
+
+        for postfixes in (['.md', 'README'], [], ['py'], ['.md']):
+            condition = PostfixExclude(postfixes)
+            self.assertEqual([condition.check(path) for path in paths],
+                             list(condition.check_paths(paths)))
+
+
+class TestBranchInclude(unittest.TestCase):
+    """
+    Tests for the BranchInclude and MasterInclude classes
+    in the conditions module.
+    """
+
+    def setUp(self):
+        """
+        Run before each test to build a small commit graph, where
+        master (HEAD) is f, whose history a-b-c-e-f merges in e the
+        branch topic, made of d (tagged v1) forked from b, and where
+        g on the branch other is not in master.
+        """
+
+        self.commits = pd.DataFrame([
+            {'hash': 'a', 'parents': [], 'refs': []},
+            {'hash': 'b', 'parents': ['a'], 'refs': []},
+            {'hash': 'c', 'parents': ['b'], 'refs': []},
+            {'hash': 'd', 'parents': ['b'], 'refs': ['refs/heads/topic', 'tag: refs/tags/v1']},
+            {'hash': 'e', 'parents': ['c', 'd'], 'refs': []},
+            {'hash': 'f', 'parents': ['e'], 'refs': ['HEAD -> refs/heads/master']},
+            {'hash': 'g', 'parents': ['a'], 'refs': ['refs/heads/other']},
+        ])
+
+    def test_set_commits_master(self):
+        """
+        Test whether MasterInclude includes every ancestor of master.
+        """
+
+        condition = MasterInclude()
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'c', 'd', 'e', 'f'}, condition.included)
+
+    def test_set_commits_first_parent(self):
+        """
+        Test whether only first parents are followed when
+        first_parent is set.
+        """
+
+        condition = MasterInclude(first_parent=True)
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'c', 'e', 'f'}, condition.included)
+
+    def test_set_commits_branch(self):
+        """
+        Test whether BranchInclude follows the given branch or tag.
+        """
+
+        condition = BranchInclude('topic')
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'd'}, condition.included)
+
+        condition = BranchInclude('refs/tags/v1')
+        condition.set_commits(self.commits)
+        self.assertEqual({'a', 'b', 'd'}, condition.included)
+
+        condition = BranchInclude('missing')
+        condition.set_commits(self.commits)
+        self.assertEqual(set(), condition.included)
+
 
 class TestCommitConditions(unittest.TestCase):
     """
@@ -271,6 +376,21 @@ class TestCommitConditions(unittest.TestCase):
         commit = CommitGit(self.items, conds=[MergeExclude()])
         self.assertEqual(merge_exclude.included, commit.conds[0].included)
 
+    def test_mask(self):
+        """
+        Test whether the mask method of Commit conditions agrees
+        with their check method for every commit.
+        """
+
+        temp = self.Temp(self.items)
+        for condition in [MasterInclude(), EmptyExclude(), MergeExclude()]:
+            condition.set_commits(temp.df)
+            expected = [condition.check(commit) for commit in temp.df['hash']]
+
+            mask = condition.mask(temp.df)
+            self.assertEqual(expected, mask.tolist())
+            self.assertTrue(mask.index.equals(temp.df.index))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
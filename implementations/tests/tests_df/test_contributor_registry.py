@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from implementations.code_df.contributor_registry import ContributorRegistry
+
+
+def contributions(rows):
+    """
+    Build a DataFrame of contributions.
+
+    :param rows: a list of (author, created_date, hash) tuples
+
+    :returns: a DataFrame with the columns of a registry
+    """
+
+    df = pd.DataFrame(rows, columns=['author', 'created_date', 'hash'])
+    df['repo'] = 'https://github.com/chaoss/wg-evolution'
+    return df
+
+
+class TestContributorRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a directory for the registry file
+        """
+
+        self.path = tempfile.mkdtemp()
+        self.registry_path = os.path.join(self.path, 'contributors.json')
+
+    def tearDown(self):
+        """
+        Remove the directory of the registry file
+        """
+
+        shutil.rmtree(self.path)
+
+    def test_update(self):
+        """
+        Test whether contributors keep their earliest contribution
+        across updates.
+        """
+
+        registry = ContributorRegistry(self.registry_path)
+        registry.update(contributions([
+            ('alice', datetime(2019, 1, 5), 'a2'),
+            ('alice', datetime(2019, 1, 2), 'a1'),
+            ('bob', datetime(2019, 1, 3), 'b1')
+        ]))
+        registry.update(contributions([
+            ('bob', datetime(2019, 2, 1), 'b2'),
+            ('carol', datetime(2019, 2, 2), 'c1'),
+            ('dave', datetime(2018, 12, 1), 'd1')
+        ]))
+        registry.update(contributions([]))
+
+        self.assertEqual(list(registry.df['author']), ['dave', 'alice', 'bob', 'carol'])
+        self.assertEqual(list(registry.df['hash']), ['d1', 'a1', 'b1', 'c1'])
+
+        first = registry.first_contributions(datetime(2019, 1, 3), datetime(2019, 2, 1))
+        self.assertEqual(list(first['author']), ['bob'])
+
+    def test_save(self):
+        """
+        Test whether a saved registry is read back, with its key.
+        """
+
+        registry = ContributorRegistry(self.registry_path)
+        registry.check_key('key')
+        registry.update(contributions([
+            ('alice', datetime(2019, 1, 2, 10, 30), 'a1'),
+            ('bob', datetime(2019, 1, 3), 'b1')
+        ]))
+        registry.save()
+
+        read = ContributorRegistry(self.registry_path)
+        self.assertEqual(read.key, 'key')
+        assert_frame_equal(registry.df, read.df)
+
+        read.check_key('key')
+        with self.assertRaises(ValueError):
+            read.check_key('other')
+
+    def test_empty(self):
+        """
+        Test a registry without contributors.
+        """
+
+        registry = ContributorRegistry(self.registry_path)
+        self.assertIsNone(registry.key)
+        self.assertTrue(registry.first_contributions().empty)
+
+        registry.save()
+        self.assertTrue(ContributorRegistry(self.registry_path).df.empty)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
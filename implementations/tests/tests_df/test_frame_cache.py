@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from pandas.testing import assert_frame_equal
+
+from implementations.code_df import frame_cache
+from implementations.code_df.code_changes_git import CodeChangesGit
+from implementations.code_df.conditions import DirExclude, MergeExclude
+from implementations.code_df.frame_cache import FrameCache, chain_digest, file_digest, items_digest
+from implementations.code_df.frame_store import FrameStore, IncrementalCacheMiss
+from implementations.code_df.open_issue_age_github import OpenIssueAgeGitHub
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+def put_and_evict(path, df, times):
+    """
+    Write and read the same key of a cache many times, evicting
+    all the files of the cache after every write.
+
+    :param path: the directory of the cache
+    :param df: the DataFrame to write
+    :param times: the number of writes
+    """
+
+    cache = FrameCache(path, max_size=1)
+    for _ in range(times):
+        cache.put('shared', df)
+        cache.get('shared')
+
+
+@unittest.skipIf(frame_cache.pyarrow is None, "pyarrow is not installed")
+class TestFrameCache(unittest.TestCase):
+    """
+    Tests for the FrameCache class
+    """
+
+    def setUp(self):
+        """
+        Run before each test to read the test data file
+        and create the cache directory
+        """
+
+        self.items = read_file('data/test_commits_data_2.json')
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_get_put(self):
+        """
+        Test whether a DataFrame, with columns of lists and dicts,
+        is read back exactly as it was written.
+        """
+
+        df = CodeChangesGit(self.items, conds=[MergeExclude()]).df
+        cache = FrameCache(self.path)
+        key = cache.key('digest', 'options')
+
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, df)
+        assert_frame_equal(df, cache.get(key))
+
+    def test_key(self):
+        """
+        Test whether keys depend on all their parts, but not on
+        the identity of the objects describing them.
+        """
+
+        cache = FrameCache(self.path)
+
+        self.assertEqual(cache.key('digest', (DirExclude(['tests']),)),
+                         cache.key('digest', (DirExclude(['tests']),)))
+        self.assertNotEqual(cache.key('digest', (DirExclude(['tests']),)),
+                            cache.key('digest', (DirExclude(['bin']),)))
+        self.assertNotEqual(cache.key('digest', (DirExclude(['tests']),)),
+                            cache.key('other', (DirExclude(['tests']),)))
+
+    def test_evict(self):
+        """
+        Test whether the least recently used DataFrames are
+        removed when the cache grows beyond its maximum size.
+        """
+
+        df = CodeChangesGit(self.items).df
+        cache = FrameCache(self.path)
+        cache.put('first', df)
+        size = os.path.getsize(os.path.join(self.path, 'first' + frame_cache.CACHE_SUFFIX))
+
+        cache.max_size = int(size * 2.5)
+        os.utime(os.path.join(self.path, 'first' + frame_cache.CACHE_SUFFIX), (0, 0))
+        cache.put('second', df)
+        cache.put('third', df)
+
+        self.assertIsNone(cache.get('first'))
+        assert_frame_equal(df, cache.get('second'))
+        assert_frame_equal(df, cache.get('third'))
+
+    def test_concurrent_processes(self):
+        """
+        Test whether processes writing and evicting the same key
+        of a cache do not make each other fail.
+        """
+
+        df = CodeChangesGit(self.items).df
+        processes = [multiprocessing.Process(target=put_and_evict, args=(self.path, df, 50))
+                     for _ in range(2)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        self.assertFalse([name for name in os.listdir(self.path) if name.endswith('.tmp')])
+
+    def test_frame_store(self):
+        """
+        Test whether a FrameStore reads the DataFrames built
+        in a previous run from the cache.
+        """
+
+        class Temp(CodeChangesGit):
+            built = 0
+
+            def _flat_frame(self, items):
+                Temp.built += 1
+                return super()._flat_frame(items)
+
+        digest = items_digest(self.items)
+        cache = FrameCache(self.path)
+
+        first = Temp(FrameStore(self.items, cache, digest), conds=[MergeExclude()])
+        second = Temp(FrameStore(self.items, cache, digest), conds=[MergeExclude()])
+        self.assertEqual(1, Temp.built)
+        assert_frame_equal(first.df, second.df)
+        assert_frame_equal(first.files, second.files)
+
+        # the flat DataFrame is reused with other conditions
+        without_conds = Temp(FrameStore(self.items, cache, digest))
+        self.assertEqual(1, Temp.built)
+        assert_frame_equal(CodeChangesGit(self.items).df, without_conds.df)
+
+        Temp(FrameStore(self.items[1:], cache, items_digest(self.items[1:])), conds=[MergeExclude()])
+        self.assertEqual(2, Temp.built)
+
+    def test_frame_store_as_of(self):
+        """
+        Test whether the age of open issues, which depends on the time
+        it is measured at, is computed from the cached DataFrame instead
+        of being cached for every time.
+        """
+
+        issues = read_file('data/test_issues_data.json')
+        digest = items_digest(issues)
+        cache = FrameCache(self.path)
+
+        first = OpenIssueAgeGitHub(FrameStore(issues, cache, digest), as_of=datetime(2020, 1, 1))
+        files = sorted(os.listdir(self.path))
+        later = OpenIssueAgeGitHub(FrameStore(issues, cache, digest), as_of=datetime(2020, 1, 11))
+
+        self.assertEqual(files, sorted(os.listdir(self.path)))
+        self.assertEqual(first.compute() + 10, later.compute())
+        assert_frame_equal(OpenIssueAgeGitHub(issues, as_of=datetime(2020, 1, 11)).df, later.df)
+
+    def test_frame_store_incremental(self):
+        """
+        Test whether a FrameStore adds new items to the DataFrames
+        of a previous run, replacing the items fetched again.
+        """
+
+        base_items = self.items[:15]
+        new_items = self.items[14:]
+        cache = FrameCache(self.path)
+
+        base_digest = items_digest(base_items)
+        CodeChangesGit(FrameStore(base_items, cache, base_digest), conds=[MergeExclude()])
+
+        digest = chain_digest(base_digest, new_items)
+        store = FrameStore(new_items, cache, digest, base_digest)
+        changes = CodeChangesGit(store, conds=[MergeExclude()])
+
+        # commit ids of new items are shifted after the ones of the
+        # previous run, compare files by the hash of their commit
+        expected = CodeChangesGit(self.items, conds=[MergeExclude()])
+        assert_frame_equal(expected.df.drop(columns='commit_id'),
+                           changes.df.drop(columns='commit_id'))
+        self.assertEqual(expected.compute(), changes.compute())
+
+        expected_files = expected.files.merge(expected.df[['commit_id', 'hash']])
+        files = changes.files.merge(changes.df[['commit_id', 'hash']])
+        assert_frame_equal(expected_files.drop(columns='commit_id'),
+                           files.drop(columns='commit_id'))
+
+        with self.assertRaises(IncrementalCacheMiss):
+            CodeChangesGit(FrameStore(new_items, cache, 'other', 'unknown'))
+
+    def test_digests(self):
+        """
+        Test whether file and item digests tell data apart.
+        """
+
+        self.assertEqual(file_digest('data/test_commits_data_2.json'),
+                         file_digest('data/test_commits_data_2.json'))
+        self.assertNotEqual(file_digest('data/test_commits_data_2.json'),
+                            file_digest('data/test_commits_data.json'))
+        self.assertNotEqual(items_digest(self.items), items_digest(self.items[1:]))
+
+        base_digest = items_digest(self.items[:10])
+        self.assertEqual(items_digest(self.items), chain_digest(None, self.items))
+        self.assertEqual(base_digest, chain_digest(base_digest, []))
+        self.assertNotEqual(chain_digest(base_digest, self.items[10:]),
+                            chain_digest(base_digest, self.items[11:]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import datetime
+import json
+import unittest
+
+from pandas.testing import assert_frame_equal
+
+from implementations.code_df.code_changes_git import CodeChangesGit
+from implementations.code_df.code_changes_lines_git import CodeChangesLinesGit
+from implementations.code_df.conditions import EmptyExclude, Naive
+from implementations.code_df.frame_store import FrameStore
+from implementations.code_df.reviews_github import ReviewsGitHub
+from implementations.code_df.reviews_accepted_github import ReviewsAcceptedGitHub
+from implementations.code_df.reviews_duration_github import ReviewsDurationGitHub
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+class TestFrameStore(unittest.TestCase):
+    """
+    Tests for the FrameStore class
+    """
+
+    def setUp(self):
+        """
+        Run before each test to read the test data files
+        """
+
+        self.commits = read_file('data/test_commits_data_2.json')
+        self.pulls = read_file('data/test_pulls_data.json')
+
+    def test_frame_shared(self):
+        """
+        Test whether metrics built with the same options from
+        a FrameStore share the same DataFrame.
+        """
+
+        is_code = [Naive()]
+        conds = [EmptyExclude()]
+        store = FrameStore(self.commits)
+
+        changes = CodeChangesGit(store, is_code=is_code, conds=conds)
+        changes_lines = CodeChangesLinesGit(store, is_code=is_code, conds=conds)
+
+        self.assertIs(changes.df, changes_lines.df)
+        self.assertEqual(1, len(store.frames))
+
+        expected = CodeChangesLinesGit(self.commits, is_code=is_code, conds=conds)
+        assert_frame_equal(expected.df, changes_lines.df)
+        self.assertEqual(expected.compute(), changes_lines.compute())
+
+    def test_frame_options(self):
+        """
+        Test whether metrics built with different options from
+        a FrameStore get different DataFrames.
+        """
+
+        date_since = datetime.datetime.strptime("2016-01-01", "%Y-%m-%d")
+        store = FrameStore(self.commits)
+
+        changes = CodeChangesGit(store)
+        changes_since = CodeChangesGit(store, date_range=(date_since, None))
+
+        self.assertIsNot(changes.df, changes_since.df)
+        self.assertEqual(2, len(store.frames))
+        self.assertEqual(CodeChangesGit(self.commits, date_range=(date_since, None)).compute(),
+                         changes_since.compute())
+
+    def test_frame_pull_requests(self):
+        """
+        Test whether all pull request metrics are views over
+        a single DataFrame of a FrameStore.
+        """
+
+        store = FrameStore(self.pulls)
+
+        reviews = ReviewsGitHub(store)
+        reviews_accepted = ReviewsAcceptedGitHub(store)
+        reviews_duration = ReviewsDurationGitHub(store)
+
+        self.assertIs(reviews.df, reviews_accepted.df)
+        self.assertEqual(1, len(store.frames))
+
+        expected = ReviewsDurationGitHub(self.pulls)
+        assert_frame_equal(expected.df, reviews_duration.df)
+        self.assertEqual(ReviewsGitHub(self.pulls).compute(), reviews.compute())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
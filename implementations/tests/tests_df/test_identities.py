@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from implementations.code_df.identities import IdentityIndex, parse_mailmap, split_author
+
+
+MAILMAP = """
+# comments and lines with a single email are ignored
+Jane Doe <jane@example.com>
+<jane@example.com> <jdoe@old.example.com>
+Jane Doe <jane@example.com> <JANE@laptop.local>
+John Roe <john@example.com> Jane Doe <shared@example.com>
+"""
+
+
+class TestIdentities(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a directory for the mailmap and index files
+        """
+
+        self.path = tempfile.mkdtemp()
+        self.mailmap = os.path.join(self.path, '.mailmap')
+        with open(self.mailmap, 'w') as mailmap_file:
+            mailmap_file.write(MAILMAP)
+        self.index_path = os.path.join(self.path, 'identities.json')
+
+    def tearDown(self):
+        """
+        Remove the directory of the mailmap and index files
+        """
+
+        shutil.rmtree(self.path)
+
+    def test_split_author(self):
+        """
+        Test the names and emails of author strings.
+        """
+
+        self.assertEqual(split_author('Jane Doe <jane@example.com>'), ('Jane Doe', 'jane@example.com'))
+        self.assertEqual(split_author('<jane@example.com>'), ('', 'jane@example.com'))
+        self.assertEqual(split_author('jdoe'), ('jdoe', None))
+
+    def test_parse_mailmap(self):
+        """
+        Test the rules read from a .mailmap file.
+        """
+
+        rules = parse_mailmap(MAILMAP.splitlines())
+        expected = {
+            (None, 'jdoe@old.example.com'): 'jane@example.com',
+            (None, 'jane@laptop.local'): 'jane@example.com',
+            ('jane doe', 'shared@example.com'): 'john@example.com'
+        }
+
+        self.assertEqual(rules, expected)
+
+    def test_ids(self):
+        """
+        Test whether the strings of a person get the same id.
+        """
+
+        index = IdentityIndex(mailmap=self.mailmap,
+                              aliases={'janedoe': 'jane@example.com'})
+        authors = pd.Series([
+            'Jane Doe <jane@example.com>',
+            'J. Doe <JDoe@old.example.com>',
+            'Jane <jane@laptop.local>',
+            'janedoe',
+            'Jane Doe <shared@example.com>',
+            'John Roe <john@example.com>',
+            'Someone Else <shared@example.com>',
+            None,
+            'Jane Doe <jane@example.com>'
+        ], index=range(10, 19))
+
+        ids = index.ids(authors)
+
+        self.assertEqual(list(ids.index), list(authors.index))
+        self.assertEqual(list(ids), [0, 0, 0, 0, 1, 1, 2, -1, 0])
+
+    def test_save(self):
+        """
+        Test whether ids are kept across runs, and strings are resolved
+        again when the rules change.
+        """
+
+        index = IdentityIndex(self.index_path)
+        self.assertEqual(index.id('janedoe'), 0)
+        self.assertEqual(index.id('Jane Doe <jane@example.com>'), 1)
+        index.save()
+
+        index = IdentityIndex(self.index_path)
+        self.assertEqual(index.resolved, {'janedoe': 0, 'Jane Doe <jane@example.com>': 1})
+        self.assertEqual(index.id('Jane Doe <jane@example.com>'), 1)
+        self.assertEqual(index.id('jroe'), 2)
+
+        index = IdentityIndex(self.index_path, aliases={'janedoe': 'jane@example.com'})
+        self.assertEqual(index.resolved, {})
+        self.assertEqual(index.id('janedoe'), 1)
+        self.assertEqual(index.id('Jane Doe <jane@example.com>'), 1)
+
+    def test_save_without_path(self):
+        """
+        Test whether an index created without a path cannot be saved.
+        """
+
+        index = IdentityIndex()
+        index.id('janedoe')
+
+        with self.assertRaises(ValueError):
+            index.save()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from implementations.code_df.incremental import IncrementalState, STATE_FILE
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+class TestIncrementalState(unittest.TestCase):
+    """
+    Tests for the IncrementalState class
+    """
+
+    def setUp(self):
+        """
+        Run before each test to read the test data file
+        and create the state directory
+        """
+
+        self.items = read_file('data/test_commits_data.json')
+        self.path = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.path, STATE_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_empty(self):
+        """
+        Test whether all items are fetched when there was no previous run.
+        """
+
+        state = IncrementalState(self.state_path)
+
+        self.assertIsNone(state.last('chaoss/grimoirelab-perceval', 'commit'))
+        self.assertIsNone(state.from_date('chaoss/grimoirelab-perceval', 'commit'))
+        self.assertIsNone(state.digest('chaoss/grimoirelab-perceval', 'commit'))
+
+    def test_update(self):
+        """
+        Test whether the last item seen is recorded, and kept when
+        a run fetches no new items.
+        """
+
+        last_item = max(self.items, key=lambda item: item['updated_on'])
+        state = IncrementalState(self.state_path)
+
+        state.update('chaoss/grimoirelab-perceval', 'commit', self.items[:5], 'first')
+        state.update('chaoss/grimoirelab-perceval', 'commit', self.items, 'second')
+        state.update('chaoss/grimoirelab-perceval', 'commit', [], 'third')
+        state.update('chaoss/grimoirelab-perceval', 'issue', [], 'fourth')
+
+        expected = {
+            'updated_on': last_item['updated_on'],
+            'uuid': last_item['uuid'],
+            'digest': 'third'
+        }
+        self.assertEqual(expected, state.last('chaoss/grimoirelab-perceval', 'commit'))
+        self.assertEqual(datetime.datetime.utcfromtimestamp(last_item['updated_on']),
+                         state.from_date('chaoss/grimoirelab-perceval', 'commit'))
+        self.assertIsNone(state.last('chaoss/grimoirelab-perceval', 'issue'))
+
+    def test_save(self):
+        """
+        Test whether the state is read back as it was saved.
+        """
+
+        state = IncrementalState(self.state_path)
+        state.update('chaoss/grimoirelab-perceval', 'commit', self.items, 'digest')
+        state.save()
+
+        saved = IncrementalState(self.state_path)
+        self.assertEqual(state.origins, saved.origins)
+        self.assertEqual('digest', saved.digest('chaoss/grimoirelab-perceval', 'commit'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import unittest
+import json
+from datetime import datetime
+
+import numpy as np
+
+from implementations.code_df.issue_backlog_github import IssueBacklogGitHub
+from implementations.code_df.open_issue_age_github import OpenIssueAgeGitHub
+
+
+def read_file(path):
+    """
+    Given a line-by-line JSON file, this function converts it to
+    a Python dictionary and returns all such lines as a list.
+
+    :param path: the path to the JSON file
+
+    :returns items: a list of dictionaries read from the JSON file
+    """
+
+    items = list()
+    with open(path, 'r') as raw_data:
+        for line in raw_data:
+            line = json.loads(line)
+
+            items.append(line)
+    return items
+
+
+def issue(item, created_at, events):
+    """
+    Modify a Perceval issue to be created at a given date,
+    with a given list of closed and reopened events.
+
+    :param item: a Perceval issue
+    :param created_at: a date string, as 'YYYY-MM-DD'
+    :param events: a list of (event, date string) tuples
+
+    :returns item: the modified issue
+    """
+
+    item['data']['created_at'] = created_at + 'T10:00:00Z'
+    item['data']['events_data'] = [{'event': event, 'created_at': date + 'T12:00:00Z'}
+                                   for event, date in events]
+    item['data']['state'] = 'closed' if events and events[-1][0] == 'closed' else 'open'
+    return item
+
+
+class TestIssueBacklogGitHub(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Run before each test to read the test data file
+        """
+
+        self.items = read_file('data/test_issues_events_data.json')
+
+    def synthetic_items(self):
+        """
+        Three issues: one closed, one reopened and closed again,
+        and one never closed.
+        """
+
+        return [
+            issue(self.items[0], '2019-01-10', [('closed', '2019-02-05')]),
+            issue(self.items[1], '2019-01-20', [('closed', '2019-01-25'),
+                                                ('reopened', '2019-03-01'),
+                                                ('closed', '2019-04-15')]),
+            issue(self.items[2], '2019-02-10', [])
+        ]
+
+    def test_time_series(self):
+        """
+        Test the number and mean age of open issues at the end of
+        every month.
+        """
+
+        backlog = IssueBacklogGitHub(self.synthetic_items(), as_of=datetime(2019, 5, 10))
+        ts = backlog.time_series('M')
+
+        self.assertEqual([str(date.date()) for date in ts.index],
+                         ['2019-01-31', '2019-02-28', '2019-03-31',
+                          '2019-04-30', '2019-05-31'])
+        self.assertEqual(list(ts['open_issues']), [1, 1, 2, 1, 1])
+
+        # only the first issue is open on 2019-01-31, 21 days old,
+        # then the third one, 18 days old, joined by the reopened
+        # second one, 70 days old, then the third one alone is 79
+        # days old, and 89 days old at as_of
+        self.assertEqual(list(ts['mean_age']), [21, 18, (49 + 70) / 2, 79, 89])
+
+    def test_compute(self):
+        """
+        Test the number of open issues at as_of, ignoring later events.
+        """
+
+        items = self.synthetic_items()
+
+        self.assertEqual(IssueBacklogGitHub(items, as_of=datetime(2019, 5, 10)).compute(), 1)
+        self.assertEqual(IssueBacklogGitHub(items, as_of=datetime(2019, 3, 1)).compute(), 2)
+        self.assertEqual(IssueBacklogGitHub(items, as_of=datetime(2019, 1, 24)).compute(), 2)
+        self.assertEqual(IssueBacklogGitHub(items, as_of=datetime(2019, 1, 1)).compute(), 0)
+
+    def test_backlog_as_open_issue_age(self):
+        """
+        Test whether the backlog at as_of agrees with the open issue
+        age, when the state of issues matches their events.
+        """
+
+        items = self.synthetic_items()
+        as_of = datetime(2019, 5, 10, 8, 30)
+
+        backlog = IssueBacklogGitHub(items, as_of=as_of).backlog([as_of])
+        age = OpenIssueAgeGitHub(items, as_of=as_of)
+
+        self.assertEqual(backlog['open_issues'].iloc[0], len(age.df))
+        self.assertEqual(backlog['mean_age'].iloc[0], age.compute())
+
+    def test_empty(self):
+        """
+        Test the backlog when there is no issue.
+        """
+
+        backlog = IssueBacklogGitHub(self.synthetic_items(), as_of=datetime(2018, 1, 1))
+
+        self.assertEqual(backlog.compute(), 0)
+        self.assertTrue(np.isnan(backlog.backlog([datetime(2018, 1, 1)])['mean_age'].iloc[0]))
+        self.assertTrue(backlog.time_series('M').empty)
+
+        backlog = IssueBacklogGitHub([], as_of=datetime(2018, 1, 1))
+        self.assertEqual(backlog.compute(), 0)
+
+    def test__get_params(self):
+        """
+        Test whether the _get_params method correctly returns
+        the expected parameters for plotting a timeseries plot
+        for the Open Issue Backlog metric.
+        """
+
+        backlog = IssueBacklogGitHub(self.items)
+        params = backlog._get_params()
+
+        expected_params = {
+            'x': None,
+            'y': 'open_issues',
+            'title': "Trends in Open Issue Backlog",
+            'use_index': True
+        }
+
+        self.assertEqual(expected_params, params)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -23,6 +23,7 @@ from datetime import datetime
 import unittest
 import json
 
+import pandas as pd
 from pandas.testing import assert_series_equal
 
 from implementations.code_df.issue_github import IssueGitHub
@@ -77,7 +78,7 @@ class TestIssueGitHub(unittest.TestCase):
                 'author': 'aswanipranjal',
                 'created_date': datetime(2018, 5, 28, 0, 0),
                 'current_status': "closed",
-                'events_data': [
+                'events': [
                             {'actor':
                                 {'avatar_url': 'https://avatars1.githubusercontent.com/u/9946566?v=4',
                                  'events_url': 'https://api.github.com/users/aswanipranjal/events{/privacy}',
@@ -224,22 +225,81 @@ class TestIssueGitHub(unittest.TestCase):
         flat_expected = []
         self.assertEqual(flat_item, flat_expected)
 
-    def test__add_item(self):
+    def test_events(self):
         """
-        Test whether _add_item creates a modified copy of a
-        passed item as expected.
+        Test whether the events of the issues are in a table of their
+        own, in order, linked to the issues by their id.
         """
 
         issue = IssueGitHub(self.items)
-        item = issue.df.iloc[0]
-        new_date = datetime.strptime("2018-05-01", "%Y-%m-%d")
-        new_item = issue._add_item(item, new_date, 'closed')
+
+        self.assertNotIn('events', issue.df.columns)
+        self.assertEqual(list(issue.events.columns),
+                         ['issue_id', 'event', 'actor', 'created_at'])
+        self.assertEqual(len(issue.events),
+                         sum(len(item['data']['events_data']) for item in self.items))
+        self.assertTrue(issue.events['issue_id'].is_monotonic_increasing)
+
+        first = issue.events[issue.events['issue_id'] == issue.df['issue_id'][0]]
+        self.assertEqual(list(first['event']),
+                         ['referenced', 'referenced', 'referenced', 'closed', 'referenced'])
+        self.assertEqual(first['actor'].iloc[3], 'acs')
+        self.assertEqual(first['created_at'].iloc[3], datetime(2018, 6, 27, 5, 18, 44))
+
+    def test_reopened_copies(self):
+        """
+        Test whether an issue reopened and closed again is copied,
+        with the day it was reopened and the status of the copy,
+        when reopened issues are counted as new ones.
+        """
+
+        issue = IssueGitHub(self.items)
+        reopened = IssueGitHub(self.items, reopen_as_new=True)
+        self.assertEqual(len(issue.df) + 1, len(reopened.df))
+
+        item = issue.df[issue.df['hash'] == 367406313].iloc[0]
+        original, copy = [row for _, row in reopened.df[reopened.df['hash'] == 367406313].iterrows()]
 
         expected_item = item.copy(deep=True)
-        expected_item['created_date'] = new_date
+        expected_item['created_date'] = datetime(2018, 10, 9)
         expected_item['current_status'] = 'closed'
 
-        assert_series_equal(expected_item, new_item)
+        assert_series_equal(item, original, check_names=False)
+        assert_series_equal(expected_item, copy, check_names=False)
+
+    def test__update_with_reopened_items(self):
+        """
+        Test whether items with reopen-close cycles are split into
+        their constituent items, in order, after the untouched ones.
+        """
+
+        issue = IssueGitHub(self.items)
+        df = issue.df.iloc[:3].reset_index(drop=True)
+        ids = df['issue_id']
+        events = pd.DataFrame([
+            (ids[1], 'closed', '2019-01-01'),
+            (ids[1], 'labeled', '2019-01-02'),
+            (ids[1], 'reopened', '2019-01-03'),
+            (ids[1], 'closed', '2019-01-04'),
+            (ids[1], 'reopened', '2019-01-05'),
+            (ids[2], 'closed', '2019-02-01'),
+            (ids[2], 'reopened', '2019-02-02'),
+            (ids[2], 'closed', '2019-02-03'),
+            # events of issues not in df are ignored
+            (ids.max() + 1, 'closed', '2019-03-01')
+        ], columns=['issue_id', 'event', 'created_at'])
+        events['created_at'] = pd.to_datetime(events['created_at'])
+
+        updated = issue._update_with_reopened_items(df, events)
+
+        self.assertEqual(list(updated['hash']),
+                         [df['hash'][0]] + [df['hash'][1]] * 3 + [df['hash'][2]] * 2)
+        self.assertEqual(list(updated['current_status']),
+                         [df['current_status'][0], 'closed', 'closed', 'open', 'closed', 'closed'])
+        self.assertEqual(list(updated['created_date']),
+                         [df['created_date'][0], df['created_date'][1],
+                          datetime(2019, 1, 3), datetime(2019, 1, 5),
+                          df['created_date'][2], datetime(2019, 2, 2)])
 
 
 if __name__ == '__main__':
@@ -25,6 +25,7 @@ import unittest
 from pandas.util.testing import assert_frame_equal
 
 from implementations.code_df.commit_git import CommitGit
+from implementations.code_df.utils import iter_items
 
 
 def read_file(path):
@@ -75,12 +76,85 @@ class TestMetric(unittest.TestCase):
                 return df
 
         temp = Temp(self.items)
-        expected_df = temp.df
-        expected_df = expected_df.set_index('created_date')
+        expected_df = temp.df.set_index('created_date')
+        expected_df = expected_df.sort_index(kind='mergesort')
         returned_df = temp.time_series('W')
 
         assert_frame_equal(expected_df, returned_df)
 
+    def test_time_series_memoized(self):
+        """
+        Test whether time_series is computed once per period, and
+        computed again when the DataFrame is replaced.
+        """
+
+        class Temp(CommitGit):
+            aggregated = 0
+
+            def _agg(self, df, period):
+                Temp.aggregated += 1
+                return df.resample(period)['category'].agg(['count'])
+
+        temp = Temp(self.items)
+        weekly = temp.time_series('W')
+        self.assertIs(weekly, temp.time_series('W'))
+        temp.time_series('M')
+        self.assertEqual(2, Temp.aggregated)
+
+        temp.df = temp.df[temp.df['merge']]
+        self.assertIsNot(weekly, temp.time_series('W'))
+        self.assertEqual(3, Temp.aggregated)
+        self.assertEqual(len(temp.df), temp.time_series('W')['count'].sum())
+
+    def test_init_chunked(self):
+        """
+        Test whether flattening a generator of items in small chunks
+        produces the same DataFrame as flattening a list at once.
+        """
+
+        class Temp(CommitGit):
+            chunk_size = 3
+
+        expected_df = CommitGit(self.items).df
+        temp = Temp(iter_items('data/test_commits_data.json'))
+
+        assert_frame_equal(expected_df, temp.df)
+
+    def test_init_empty(self):
+        """
+        Test whether an empty DataFrame is built when there are no items.
+        """
+
+        temp = CommitGit(iter([]))
+        self.assertTrue(temp.df.empty)
+
+    def test_merge(self):
+        """
+        Test whether merging the DataFrames of two sets of items
+        replaces the rows with the same hash by the newer ones.
+        """
+
+        temp = CommitGit(self.items)
+        base_frames = temp._flat_frame(self.items[:12])
+        new_items = self.items[10:]
+        new_items[0] = dict(new_items[0], data=dict(new_items[0]['data'], Author='Updated'))
+        new_frames = temp._flat_frame(new_items)
+
+        merged = temp._merge(base_frames, new_frames)
+        merged_df = merged['df']
+
+        self.assertEqual(len(self.items), len(merged_df))
+        self.assertEqual(list(temp.df['hash']), list(merged_df['hash']))
+        self.assertEqual('Updated', merged_df['author'][10])
+        self.assertTrue(merged_df['commit_id'].is_unique)
+        self.assertIs(base_frames, temp._merge(base_frames, temp._flat_frame([])))
+
+        # files follow the ids of their commits
+        files = merged['files'].merge(merged_df[['commit_id', 'hash']], on='commit_id')
+        expected_files = temp.files.merge(temp.df[['commit_id', 'hash']], on='commit_id')
+        assert_frame_equal(expected_files.drop(columns='commit_id'),
+                           files.drop(columns='commit_id'))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
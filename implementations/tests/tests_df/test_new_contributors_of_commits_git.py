@@ -21,9 +21,17 @@
 
 import unittest
 import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
 from pandas.testing import assert_frame_equal
 
+from implementations.code_df.contributor_registry import ContributorRegistry
+from implementations.code_df.identities import IdentityIndex
 from implementations.code_df.new_contributors_of_commits_git import NewContributorsOfCommitsGit
+from implementations.code_df.conditions import PostfixExclude
 
 
 def read_file(path):
@@ -83,6 +91,70 @@ class TestCodeChangesLinesGit(unittest.TestCase):
         new_committers.df = new_committers._agg(new_committers.df, 'W')
         assert_frame_equal(test_df, new_committers.df)
 
+    def test_registry(self):
+        """
+        Test whether new contributors found by updating a registry with
+        successive batches of commits are the ones found from all of them.
+        """
+
+        authors = ['alice', 'bob', 'alice', 'carol', 'bob', 'dave', 'erin']
+        for index, item in enumerate(self.items):
+            item['data']['Author'] = authors[index % len(authors)]
+        since = datetime(2015, 8, 19)
+
+        expected = NewContributorsOfCommitsGit(self.items, (since, None))
+
+        path = tempfile.mkdtemp()
+        try:
+            registry_path = os.path.join(path, 'contributors.json')
+            for batch in (self.items[:2], self.items[2:5], self.items[5:]):
+                registry = ContributorRegistry(registry_path)
+                new_committers = NewContributorsOfCommitsGit(batch, (since, None),
+                                                             registry=registry)
+                registry.save()
+
+            # the key differs when the conditions do
+            with self.assertRaises(ValueError):
+                NewContributorsOfCommitsGit(self.items[5:], (since, None),
+                                            is_code=[PostfixExclude(['.md'])],
+                                            registry=ContributorRegistry(registry_path))
+        finally:
+            shutil.rmtree(path)
+
+        self.assertEqual(new_committers.compute(), 3)
+        self.assertEqual(expected.compute(), new_committers.compute())
+
+        columns = ['author', 'created_date', 'hash']
+        assert_frame_equal(expected.df[columns].sort_values('created_date').reset_index(drop=True),
+                           new_committers.df[columns])
+
+    def test_identities(self):
+        """
+        Test whether authors with several names and emails count
+        as a single contributor when identities are resolved.
+        """
+
+        authors = ['Alice <alice@example.com>', 'Bob <bob@example.com>',
+                   'alice <ALICE@example.com>', 'Alice Liddell <alice@example.com>']
+        for index, item in enumerate(self.items):
+            item['data']['Author'] = authors[index % len(authors)]
+
+        self.assertEqual(NewContributorsOfCommitsGit(self.items).compute(), 4)
+
+        new_committers = NewContributorsOfCommitsGit(self.items, identities=IdentityIndex())
+        self.assertEqual(new_committers.compute(), 2)
+        self.assertEqual(list(new_committers.df['author']), authors[:2])
+
+        path = tempfile.mkdtemp()
+        try:
+            registry = ContributorRegistry(os.path.join(path, 'contributors.json'))
+            new_committers = NewContributorsOfCommitsGit(self.items, registry=registry,
+                                                         identities=IdentityIndex())
+        finally:
+            shutil.rmtree(path)
+
+        self.assertEqual(list(new_committers.df['author_id']), [0, 1])
+
     def test__get_params(self):
         """
         Test whether the _get_params method correctly returns
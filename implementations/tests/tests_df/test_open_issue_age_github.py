@@ -75,6 +75,37 @@ class TestOpenIssueAgeGitHub(unittest.TestCase):
 
         self.assertEqual(expected_mean, mean_age)
 
+    def test_compute_as_of(self):
+        """
+        Test whether the ages of open issues are measured at the
+        given reference time, for all of them.
+        """
+
+        as_of = datetime(2020, 1, 1, 12, 0)
+        open_issue_age = OpenIssueAgeGitHub(self.items, as_of=as_of)
+
+        expected_ages = [(as_of - str_to_date(item['data']['created_at'])).days
+                         for item in self.items
+                         if item['data']['state'] == 'open']
+
+        self.assertEqual(expected_ages, list(open_issue_age.df['open_issue_age']))
+        self.assertEqual(sum(expected_ages) / len(expected_ages), open_issue_age.compute())
+
+        later = OpenIssueAgeGitHub(self.items, as_of=datetime(2020, 1, 11))
+        self.assertEqual(open_issue_age.compute() + 10, later.compute())
+
+    def test_as_of_default(self):
+        """
+        Test whether the reference time defaults to a single timestamp,
+        taken when the object is created.
+        """
+
+        before = datetime.now()
+        open_issue_age = OpenIssueAgeGitHub(self.items)
+        after = datetime.now()
+
+        self.assertTrue(before <= open_issue_age.as_of <= after)
+
     def test__agg(self):
         """
         Test the _agg method of a OpenIssueAgeGitHub
@@ -75,7 +75,8 @@ class TestPullRequestGitHub(unittest.TestCase):
                 'author': 'anson0370',
                 'created_date': datetime.datetime(2014, 3, 6, 0, 0),
                 'current_status': "closed",
-                'merged': True
+                'merged': True,
+                'merged_date': datetime.datetime(2014, 3, 6, 0, 0)
              }
         ]
         self.assertEqual(flat_item, flat_expected)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 CHAOSS
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import math
+import unittest
+
+import numpy as np
+
+from implementations.code_df.quantile_sketch import QuantileSketch, update_sketches
+
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1]
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Draw values spanning several orders of magnitude
+        """
+
+        random = np.random.RandomState(42)
+        self.values = np.concatenate([random.lognormal(2, 2, 5000),
+                                      np.zeros(300),
+                                      -random.exponential(5, 700)])
+
+    def assertAccurate(self, sketch, values, accuracy):
+        """
+        Check that the quantiles of a sketch are within accuracy of the
+        values of the same rank.
+        """
+
+        ordered = np.sort(values)
+        for q in QUANTILES:
+            expected = ordered[int(math.floor(q * (len(values) - 1)))]
+            estimate = sketch.quantile(q)
+            self.assertLessEqual(abs(estimate - expected), accuracy * abs(expected) + 1e-12,
+                                 "quantile %s: %s is not close to %s" % (q, estimate, expected))
+
+    def test_quantile(self):
+        """
+        Test whether quantiles are within the relative accuracy.
+        """
+
+        for accuracy in (0.01, 0.05):
+            sketch = QuantileSketch(accuracy).update(self.values)
+            self.assertEqual(len(sketch), len(self.values))
+            self.assertAccurate(sketch, self.values, accuracy)
+
+    def test_add(self):
+        """
+        Test whether adding values one by one, or ignoring missing
+        values, gives the same sketch.
+        """
+
+        sketch = QuantileSketch()
+        for value in self.values[:500]:
+            sketch.add(value)
+
+        updated = QuantileSketch().update(np.append(self.values[:500], np.nan))
+
+        self.assertEqual(sketch.to_dict(), updated.to_dict())
+
+    def test_merge(self):
+        """
+        Test whether merged sketches are the sketch of all the values.
+        """
+
+        sketches = [QuantileSketch().update(part) for part in np.array_split(self.values, 3)]
+        merged = sketches[0].merge(sketches[1]).merge(sketches[2])
+
+        self.assertEqual(merged.to_dict(), QuantileSketch().update(self.values).to_dict())
+
+        with self.assertRaises(ValueError):
+            merged.merge(QuantileSketch(0.05))
+
+    def test_max_buckets(self):
+        """
+        Test whether the number of buckets is bounded, keeping the
+        accuracy of the highest quantiles.
+        """
+
+        values = np.abs(self.values) + 1
+        sketch = QuantileSketch(0.01, max_buckets=300).update(values)
+
+        self.assertEqual(len(sketch.positive), 300)
+        self.assertEqual(sketch.count, len(values))
+        ordered = np.sort(values)
+        for q in (0.9, 0.99, 1):
+            expected = ordered[int(math.floor(q * (len(values) - 1)))]
+            self.assertLessEqual(abs(sketch.quantile(q) - expected), 0.01 * expected)
+
+    def test_to_dict(self):
+        """
+        Test whether a sketch is stored as JSON and read back.
+        """
+
+        sketch = QuantileSketch().update(self.values)
+        description = json.loads(json.dumps(sketch.to_dict()))
+        read = QuantileSketch.from_dict(description)
+
+        self.assertEqual(read.quantiles(QUANTILES), sketch.quantiles(QUANTILES))
+        self.assertEqual(read.to_dict(), sketch.to_dict())
+
+    def test_update_sketches(self):
+        """
+        Test whether the sketches of groups updated at once are the
+        sketches of the values of every group.
+        """
+
+        random = np.random.RandomState(7)
+        keys = random.randint(0, 5, len(self.values))
+        values = self.values.copy()
+        values[::50] = np.nan
+
+        sketches = {3: QuantileSketch().update([1.0, 2.0])}
+        update_sketches(sketches, keys[:1000], values[:1000])
+        update_sketches(sketches, keys[1000:], values[1000:])
+
+        self.assertEqual(sorted(sketches), [0, 1, 2, 3, 4])
+        for key, sketch in sketches.items():
+            expected = QuantileSketch().update(values[keys == key])
+            if key == 3:
+                expected.update([1.0, 2.0])
+            self.assertEqual(sketch.to_dict(), expected.to_dict())
+
+        self.assertEqual(update_sketches({}, [], []), {})
+
+    def test_empty(self):
+        """
+        Test the quantiles of an empty sketch, and invalid parameters.
+        """
+
+        self.assertTrue(math.isnan(QuantileSketch().quantile(0.5)))
+
+        with self.assertRaises(ValueError):
+            QuantileSketch(0)
+        with self.assertRaises(ValueError):
+            QuantileSketch().quantile(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -24,6 +24,7 @@ import json
 
 from pandas.util.testing import assert_frame_equal
 
+from implementations.code_df.frame_store import FrameStore
 from implementations.code_df.reviews_duration_github import ReviewsDurationGitHub
 
 
@@ -85,6 +86,40 @@ class TestReviewsDurationGitHub(unittest.TestCase):
         print(test_df)
         assert_frame_equal(test_df, reviews_duration.df)
 
+    def test_sketch(self):
+        """
+        Test the quantiles of durations estimated in sketch mode,
+        and the merging of the sketches of two sets of reviews.
+        """
+
+        reviews_duration = ReviewsDurationGitHub(self.items, sketch=True)
+        durations = sorted(ReviewsDurationGitHub(self.items).df['duration'])
+
+        # reviews are only kept in sketches
+        self.assertTrue(reviews_duration.df.empty)
+
+        # the median is the lower middle duration, as durations
+        # are not interpolated
+        self.assertEqual(reviews_duration.compute(), 0)
+
+        p90 = reviews_duration.sketch().quantile(0.9)
+        self.assertAlmostEqual(p90, durations[int(0.9 * (len(durations) - 1))], delta=0.01 * p90)
+
+        ts = reviews_duration.time_series('W')
+        expected = ReviewsDurationGitHub(self.items).time_series('W')
+        self.assertEqual(list(ts.columns), ['median', 'p90', 'p99'])
+        self.assertEqual(list(ts.index), list(expected.index))
+
+        first = ReviewsDurationGitHub(self.items[:9], sketch=True)
+        second = ReviewsDurationGitHub(self.items[9:], sketch=True)
+        merged = first.sketch().merge(second.sketch())
+        self.assertEqual(merged.to_dict(), reviews_duration.sketch().to_dict())
+
+        # the sketches of reviews shared in a FrameStore are the same
+        stored = ReviewsDurationGitHub(FrameStore(self.items), sketch=True)
+        self.assertEqual(stored.sketch().to_dict(), reviews_duration.sketch().to_dict())
+        assert_frame_equal(stored.time_series('M'), reviews_duration.time_series('M'))
+
     def test__get_params(self):
         """
         Test whether the _get_params method correctly returns
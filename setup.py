@@ -32,6 +32,9 @@ setup(name="wg-evolution-implementations",
         'fpdf>=1.7.2',
         'matplotlib>=2.2.4'
       ],
+      extras_require={
+        'cache': ['pyarrow']
+      },
       setup_requires=[
           'wheel'
       ],